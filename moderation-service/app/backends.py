@@ -0,0 +1,76 @@
+import logging
+import re
+from pathlib import Path
+from typing import Any
+
+import torch
+from transformers import pipeline
+
+
+SUPPORTED_BACKENDS = ('torch', 'torch-int8', 'onnx')
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def resolve_backend(value: str | None) -> str:
+    backend = (value or 'torch').strip().lower()
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unsupported inference backend '{backend}', expected one of {', '.join(SUPPORTED_BACKENDS)}.")
+    return backend
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    # Only Linear layers are quantized; they carry nearly all weights of BERT/RoBERTa/ViT encoders.
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def build_pipeline(
+    task: str,
+    model_name: str,
+    backend: str,
+    device: int,
+    onnx_cache_dir: str | None = None,
+    **kwargs: Any,
+):
+    if backend == 'onnx':
+        return build_onnx_pipeline(task, model_name, onnx_cache_dir, **kwargs)
+
+    classifier = pipeline(task, model=model_name, device=device, **kwargs)
+
+    if backend == 'torch-int8':
+        if device != -1:
+            logger.warning('torch-int8 backend only applies on CPU; keeping fp32 weights for %s.', model_name)
+            return classifier
+        classifier.model = quantize_dynamic_int8(classifier.model)
+
+    return classifier
+
+
+def build_onnx_pipeline(task: str, model_name: str, onnx_cache_dir: str | None, **kwargs: Any):
+    try:
+        from optimum.onnxruntime import ORTModelForImageClassification, ORTModelForSequenceClassification
+    except ImportError as exc:
+        raise RuntimeError(
+            "MODERATION_INFERENCE_BACKEND=onnx requires the optional 'optimum[onnxruntime]' package."
+        ) from exc
+
+    model_cls = ORTModelForImageClassification if task == 'image-classification' else ORTModelForSequenceClassification
+    export_dir = Path(onnx_cache_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '__', model_name) if onnx_cache_dir else None
+
+    if export_dir is not None and (export_dir / 'model.onnx').exists():
+        model = model_cls.from_pretrained(export_dir)
+    else:
+        model = model_cls.from_pretrained(model_name, export=True)
+        if export_dir is not None:
+            model.save_pretrained(export_dir)
+
+    if task == 'image-classification':
+        from transformers import AutoImageProcessor
+
+        return pipeline(task, model=model, image_processor=AutoImageProcessor.from_pretrained(model_name), **kwargs)
+
+    from transformers import AutoTokenizer
+
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_name), **kwargs)
@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+_STOP = object()
+
+
+class MicroBatcher:
+    # Collects items until max_batch_size are waiting or max_wait_ms passed since the
+    # first one arrived; the handler must return one result per item, in order. With a
+    # submit function (e.g. InferencePool.submit) each batch runs there and the batcher
+    # goes back to collecting the next one; otherwise batches run on the batcher thread.
+
+    def __init__(
+        self,
+        handler: Callable[[list[Any]], list[Any]],
+        max_batch_size: int,
+        max_wait_ms: int,
+        name: str = 'batcher',
+        max_pending: int = 0,
+        submit: Callable[..., Future] | None = None,
+    ) -> None:
+        self.handler = handler
+        self.submit_batch = submit
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0, int(max_wait_ms)) / 1000.0
+        self.name = name
+        self.max_pending = max(0, int(max_pending))
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name=f'{self.name}-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, item: Any) -> Future:
+        return self.submit_many([item])[0]
+
+    def submit_many(self, items: list[Any]) -> list[Future]:
+        # Raises queue.Full without enqueueing anything when the items would exceed max_pending.
+        if self.max_pending and self._queue.qsize() + len(items) > self.max_pending:
+            raise queue.Full(f'{self.name} has {self._queue.qsize()} pending items.')
+
+        futures: list[Future] = []
+        for item in items:
+            future: Future = Future()
+            self._queue.put((item, future))
+            futures.append(future)
+        return futures
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            batches = self._batches
+            items = self._items
+            largest = self._largest_batch
+        return {
+            'running': self.running,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': int(self.max_wait_s * 1000),
+            'max_pending': self.max_pending,
+            'pending': self.pending(),
+            'batches': batches,
+            'items': items,
+            'avg_batch_size': round(items / batches, 2) if batches else 0.0,
+            'largest_batch': largest,
+        }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stop_after_batch = False
+            deadline = time.monotonic() + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop_after_batch = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stop_after_batch:
+                return
+
+    def _dispatch(self, batch: list[tuple[Any, Future]]) -> None:
+        active = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not active:
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(active)
+            self._largest_batch = max(self._largest_batch, len(active))
+
+        if self.submit_batch is None:
+            self._handle(active)
+            return
+
+        try:
+            self.submit_batch(self._handle, active)
+        except BaseException as exc:
+            for _, future in active:
+                future.set_exception(exc)
+
+    def _handle(self, active: list[tuple[Any, Future]]) -> None:
+        try:
+            results = self.handler([item for item, _ in active])
+            if len(results) != len(active):
+                raise RuntimeError(
+                    f'{self.name} handler returned {len(results)} results for {len(active)} items.'
+                )
+        except BaseException as exc:
+            for _, future in active:
+                future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(active, results):
+            future.set_result(result)
@@ -0,0 +1,98 @@
+import io
+import math
+
+from PIL import Image, ImageChops, ImageSequence, ImageStat, UnidentifiedImageError
+
+
+FRAME_STRATEGIES = ('uniform', 'keyframe', 'first')
+FRAME_AGGREGATES = ('max', 'p90', 'p75', 'mean')
+
+SIGNATURE_SIZE = (16, 16)
+KEYFRAME_MIN_DIFF = 12.0
+
+
+class FrameDecodeError(ValueError):
+    pass
+
+
+def uniform_indices(frame_count: int, max_frames: int) -> list[int]:
+    if frame_count <= 0:
+        return []
+    if max_frames <= 1 or frame_count == 1:
+        return [0]
+    if frame_count <= max_frames:
+        return list(range(frame_count))
+
+    step = (frame_count - 1) / (max_frames - 1)
+    return sorted({int(round(index * step)) for index in range(max_frames)})
+
+
+def prepare_frame(frame: Image.Image, target_size: int) -> Image.Image:
+    prepared = frame.convert('RGB')
+    prepared.thumbnail((target_size, target_size), Image.Resampling.BILINEAR)
+    return prepared
+
+
+def frame_signature(frame: Image.Image) -> Image.Image:
+    return frame.convert('L').resize(SIGNATURE_SIZE, Image.Resampling.BILINEAR)
+
+
+def extract_frames(raw: bytes, strategy: str, max_frames: int, target_size: int) -> tuple[list[tuple[int, Image.Image]], int]:
+    # Returns (frame_index, RGB frame) pairs plus the total number of frames in the source.
+    try:
+        image = Image.open(io.BytesIO(raw))
+        image.draft('RGB', (target_size, target_size))
+        frame_count = int(getattr(image, 'n_frames', 1) or 1)
+
+        if strategy == 'first' or frame_count == 1:
+            image.load()
+            return [(0, prepare_frame(image, target_size))], frame_count
+
+        if strategy == 'uniform':
+            frames = []
+            for index in uniform_indices(frame_count, max_frames):
+                image.seek(index)
+                frames.append((index, prepare_frame(image, target_size)))
+            return frames, frame_count
+
+        return keyframes(image, max_frames, target_size), frame_count
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError, EOFError, Image.DecompressionBombError) as exc:
+        raise FrameDecodeError(str(exc)) from exc
+
+
+def keyframes(image: Image.Image, max_frames: int, target_size: int) -> list[tuple[int, Image.Image]]:
+    # Scene changes: a frame is a candidate when its 16x16 grayscale signature moved far
+    # enough from the last candidate. Only candidate indices are kept while scanning; the
+    # uniformly thinned max_frames of them are then decoded again and prepared, so memory
+    # follows max_frames rather than the length of the upload.
+    candidates: list[int] = []
+    last_signature: Image.Image | None = None
+
+    for index, frame in enumerate(ImageSequence.Iterator(image)):
+        signature = frame_signature(frame)
+        if last_signature is not None:
+            difference = ImageStat.Stat(ImageChops.difference(signature, last_signature)).mean[0]
+            if difference < KEYFRAME_MIN_DIFF:
+                continue
+        last_signature = signature
+        candidates.append(index)
+
+    frames = []
+    for index in (candidates[position] for position in uniform_indices(len(candidates), max_frames)):
+        image.seek(index)
+        frames.append((index, prepare_frame(image, target_size)))
+    return frames
+
+
+def aggregate_scores(values: list[float], method: str) -> float:
+    if not values:
+        return 0.0
+    if method == 'max':
+        return max(values)
+    if method == 'mean':
+        return sum(values) / len(values)
+
+    percentile = int(method[1:])
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class InferenceSaturated(Exception):
+    def __init__(self, pool: str) -> None:
+        super().__init__(f'{pool} inference queue is full.')
+        self.pool = pool
+
+
+class InferencePool:
+    # One pool per model, so a burst of slow image requests can only fill the image
+    # queue. Capacity is workers + max_queue; anything beyond that is rejected at once
+    # instead of piling up behind the running forward passes.
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queue: int,
+        on_queue_wait: Callable[[float], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.on_queue_wait = on_queue_wait
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'{name}-inference')
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise InferenceSaturated(self.name)
+
+        with self._lock:
+            self._in_flight += 1
+
+        if self.on_queue_wait is not None:
+            fn = self._timed(fn, time.perf_counter())
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+
+        future.add_done_callback(self._release)
+        return future
+
+    def call(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+        return self.submit(fn, *args, **kwargs).result(timeout=timeout)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+        future = asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout=timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': in_flight,
+                'queued': max(0, in_flight - self.workers),
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed(self, fn: Callable[..., Any], enqueued_at: float) -> Callable[..., Any]:
+        def run(*args: Any, **kwargs: Any) -> Any:
+            self.on_queue_wait(time.perf_counter() - enqueued_at)
+            return fn(*args, **kwargs)
+
+        return run
+
+    def _release(self, _future: Future | None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if _future is not None:
+                self._completed += 1
+        self._slots.release()
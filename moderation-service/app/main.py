@@ -1,38 +1,145 @@
+import asyncio
 import base64
 import io
+import logging
 import os
-import re
+import queue
+import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
 from typing import Any
 
 import torch
-from fastapi import Depends, FastAPI, File, Header, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, File, Header, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse
 from PIL import Image, UnidentifiedImageError
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
 from pydantic import BaseModel, Field
-from transformers import pipeline
+
+from app import rules
+from app.backends import build_pipeline, resolve_backend
+from app.batching import MicroBatcher
+from app.frames import FRAME_AGGREGATES, FRAME_STRATEGIES, FrameDecodeError, aggregate_scores, extract_frames
+from app.inference_pool import InferencePool, InferenceSaturated
+from app.metrics import LATENCY_BUCKETS, gauge_callback
+from app.result_cache import ResultCache, bytes_digest, cache_key
 
 
 TEXT_MODEL_NAME = os.getenv('MODERATION_TEXT_MODEL', 'unitary/toxic-bert')
 HATE_MODEL_NAME = os.getenv('MODERATION_HATE_MODEL', 'cardiffnlp/twitter-roberta-base-hate-latest')
 ENABLE_HATE_MODEL = os.getenv('MODERATION_ENABLE_HATE_MODEL', 'true').lower() == 'true'
 IMAGE_MODEL_NAME = os.getenv('MODERATION_IMAGE_MODEL', 'Falconsai/nsfw_image_detection')
+LAZY_MODELS = {
+    item.strip().lower() for item in os.getenv('MODERATION_LAZY_MODELS', '').split(',') if item.strip()
+}
+RULES_PATH = os.getenv('MODERATION_RULES_PATH', '').strip() or str(Path(__file__).with_name('rules.json'))
+RULES_RELOAD_SECONDS = float(os.getenv('MODERATION_RULES_RELOAD_SECONDS', '5'))
+INFERENCE_BACKEND = resolve_backend(os.getenv('MODERATION_INFERENCE_BACKEND', 'torch'))
+ONNX_CACHE_DIR = os.getenv('MODERATION_ONNX_CACHE_DIR', '').strip() or None
 INTERNAL_TOKEN = os.getenv('MODERATION_INTERNAL_TOKEN', '')
 MAX_IMAGE_BYTES = int(os.getenv('MODERATION_IMAGE_MAX_BYTES', str(32 * 1024 * 1024)))
+IMAGE_DECODE_SIZE = max(64, int(os.getenv('MODERATION_IMAGE_DECODE_SIZE', '448')))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+IMAGE_FRAME_STRATEGY = os.getenv('MODERATION_IMAGE_FRAME_STRATEGY', 'uniform').strip().lower()
+IMAGE_FRAME_AGGREGATE = os.getenv('MODERATION_IMAGE_FRAME_AGGREGATE', 'max').strip().lower()
+IMAGE_MAX_FRAMES = max(1, int(os.getenv('MODERATION_IMAGE_MAX_FRAMES', '8')))
+IMAGE_MAX_SOURCES = max(1, int(os.getenv('MODERATION_IMAGE_MAX_SOURCES', '8')))
+IMAGE_MAX_BATCH_FRAMES = max(1, int(os.getenv('MODERATION_IMAGE_MAX_BATCH_FRAMES', '32')))
 
 TEXT_FLAG_THRESHOLD = float(os.getenv('MODERATION_TEXT_FLAG_THRESHOLD', '0.70'))
 TEXT_BLOCK_THRESHOLD = float(os.getenv('MODERATION_TEXT_BLOCK_THRESHOLD', '0.90'))
 IMAGE_FLAG_THRESHOLD = float(os.getenv('MODERATION_IMAGE_FLAG_THRESHOLD', '0.60'))
 IMAGE_BLOCK_THRESHOLD = float(os.getenv('MODERATION_IMAGE_BLOCK_THRESHOLD', '0.85'))
 
+TEXT_BATCH_MAX_SIZE = max(1, int(os.getenv('MODERATION_TEXT_BATCH_MAX_SIZE', '16')))
+TEXT_BATCH_MAX_WAIT_MS = max(0, int(os.getenv('MODERATION_TEXT_BATCH_MAX_WAIT_MS', '10')))
+TEXT_BATCH_MAX_ITEMS = max(1, int(os.getenv('MODERATION_TEXT_BATCH_MAX_ITEMS', '64')))
+
+CASCADE_ENABLED = os.getenv('MODERATION_CASCADE_ENABLED', 'true').lower() == 'true'
+CASCADE_MIN_CHARS = max(0, int(os.getenv('MODERATION_CASCADE_MIN_CHARS', '3')))
+CASCADE_HATE_BAND_LOW = float(os.getenv('MODERATION_CASCADE_HATE_BAND_LOW', '0.05'))
+CASCADE_HATE_BAND_HIGH = float(os.getenv('MODERATION_CASCADE_HATE_BAND_HIGH', str(TEXT_BLOCK_THRESHOLD)))
+CASCADE_SIGNAL_CATEGORIES = {
+    item.strip() for item in os.getenv('MODERATION_CASCADE_SIGNAL_CATEGORIES', 'hate_signal').split(',') if item.strip()
+}
+
+TORCH_THREADS = max(1, int(os.getenv('MODERATION_TORCH_THREADS') or torch.get_num_threads()))
+TEXT_INFERENCE_WORKERS = max(1, int(os.getenv('MODERATION_TEXT_WORKERS', str(max(1, (os.cpu_count() or 1) // TORCH_THREADS)))))
+IMAGE_INFERENCE_WORKERS = max(1, int(os.getenv('MODERATION_IMAGE_WORKERS', '1')))
+TEXT_QUEUE_MAX = max(0, int(os.getenv('MODERATION_TEXT_QUEUE_MAX', '256')))
+IMAGE_QUEUE_MAX = max(0, int(os.getenv('MODERATION_IMAGE_QUEUE_MAX', '16')))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv('MODERATION_INFERENCE_TIMEOUT_SECONDS', '30'))
+RETRY_AFTER_SECONDS = max(1, int(os.getenv('MODERATION_RETRY_AFTER_SECONDS', '2')))
+MODEL_RETRY_MIN_SECONDS = max(0.0, float(os.getenv('MODERATION_MODEL_RETRY_MIN_SECONDS', '5')))
+MODEL_RETRY_MAX_SECONDS = max(MODEL_RETRY_MIN_SECONDS, float(os.getenv('MODERATION_MODEL_RETRY_MAX_SECONDS', '300')))
+
+CACHE_MAX_ENTRIES = int(os.getenv('MODERATION_CACHE_MAX_ENTRIES', '20000'))
+CACHE_MAX_BYTES = int(os.getenv('MODERATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+CACHE_PATH = os.getenv('MODERATION_CACHE_PATH', '').strip() or None
+CACHE_DISK_MAX_ENTRIES = int(os.getenv('MODERATION_CACHE_DISK_MAX_ENTRIES', '200000'))
+
 DEVICE = 0 if torch.cuda.is_available() else -1
+torch.set_num_threads(TORCH_THREADS)
 
 app = FastAPI(title='astrokomunita-moderation', version='1.0.0')
+logger = logging.getLogger('uvicorn.error')
+
+metrics = CollectorRegistry()
+REQUEST_COUNT = Counter('moderation_requests_total', 'HTTP requests by route and status.', ('method', 'route', 'status'), registry=metrics)
+REQUEST_ERRORS = Counter('moderation_request_errors_total', 'Requests answered with 5xx or an unhandled exception.', ('route',), registry=metrics)
+REQUEST_LATENCY = Histogram('moderation_request_duration_seconds', 'End-to-end request latency.', ('route',), buckets=LATENCY_BUCKETS, registry=metrics)
+STAGE_LATENCY = Histogram('moderation_stage_duration_seconds', 'Latency of internal moderation stages.', ('stage',), buckets=LATENCY_BUCKETS, registry=metrics)
+QUEUE_WAIT = Histogram('moderation_queue_wait_seconds', 'Time spent waiting for an inference worker.', ('pool',), buckets=LATENCY_BUCKETS, registry=metrics)
 
 text_classifier = None
 hate_classifier = None
 image_classifier = None
+text_batchers: dict[str, MicroBatcher] = {}
+model_loader: ThreadPoolExecutor | None = None
+
+model_state: dict[str, dict[str, Any]] = {
+    key: {
+        'status': 'disabled' if key == 'hate' and not ENABLE_HATE_MODEL else ('lazy' if key in LAZY_MODELS else 'pending'),
+        'load_ms': None,
+        'error': None,
+        'failures': 0,
+    }
+    for key in ('text', 'hate', 'image')
+}
+model_locks = {key: threading.Lock() for key in model_state}
+
+rule_engine = rules.RuleEngine(Path(RULES_PATH), reload_interval=RULES_RELOAD_SECONDS)
+
+text_pool = InferencePool(
+    'text',
+    workers=TEXT_INFERENCE_WORKERS,
+    max_queue=TEXT_QUEUE_MAX,
+    on_queue_wait=lambda seconds: QUEUE_WAIT.labels('text').observe(seconds),
+)
+image_pool = InferencePool(
+    'image',
+    workers=IMAGE_INFERENCE_WORKERS,
+    max_queue=IMAGE_QUEUE_MAX,
+    on_queue_wait=lambda seconds: QUEUE_WAIT.labels('image').observe(seconds),
+)
+
+text_result_cache = ResultCache(
+    'text',
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    path=CACHE_PATH,
+    max_disk_entries=CACHE_DISK_MAX_ENTRIES,
+)
+image_result_cache = ResultCache(
+    'image',
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    path=CACHE_PATH,
+    max_disk_entries=CACHE_DISK_MAX_ENTRIES,
+)
 
 
 class TextModerationRequest(BaseModel):
@@ -40,6 +147,10 @@ class TextModerationRequest(BaseModel):
     lang: str | None = None
 
 
+class TextBatchModerationRequest(BaseModel):
+    items: list[TextModerationRequest] = Field(min_length=1, max_length=TEXT_BATCH_MAX_ITEMS)
+
+
 class ImageModerationRequest(BaseModel):
     image_base64: str = Field(min_length=10)
 
@@ -52,6 +163,14 @@ def decision_from_score(score: float, flag_threshold: float, block_threshold: fl
     return 'ok'
 
 
+def overloaded_error(model: str) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f'{model} moderation is saturated, retry later.',
+        headers={'Retry-After': str(RETRY_AFTER_SECONDS)},
+    )
+
+
 def ensure_internal_token(x_internal_token: str | None = Header(default=None, alias='X-Internal-Token')) -> None:
     if not INTERNAL_TOKEN:
         raise HTTPException(status_code=500, detail='MODERATION_INTERNAL_TOKEN is not configured.')
@@ -60,17 +179,47 @@ def ensure_internal_token(x_internal_token: str | None = Header(default=None, al
         raise HTTPException(status_code=401, detail='Unauthorized internal token.')
 
 
-def parse_image_bytes(raw: bytes) -> Image.Image:
+def parse_image_bytes(raw: bytes, target_size: int | None = None) -> Image.Image:
+    target_size = target_size or IMAGE_DECODE_SIZE
     if len(raw) > MAX_IMAGE_BYTES:
         raise HTTPException(status_code=413, detail='Image payload too large.')
 
+    # One decode pass: draft() lets JPEG scale in the DCT domain to about target_size, load()
+    # surfaces truncated or corrupted data, and the thumbnail caps every other format.
     try:
         image = Image.open(io.BytesIO(raw))
-        image.verify()
-    except (UnidentifiedImageError, OSError):
+        image.draft('RGB', (target_size, target_size))
+        image.load()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError, Image.DecompressionBombError):
         raise HTTPException(status_code=422, detail='Invalid or corrupted image file.')
 
-    return Image.open(io.BytesIO(raw)).convert('RGB')
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail((target_size, target_size), Image.Resampling.BILINEAR)
+    return image
+
+
+async def read_upload_limited(upload: UploadFile, max_bytes: int | None = None) -> bytes:
+    max_bytes = MAX_IMAGE_BYTES if max_bytes is None else max_bytes
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return bytes(buffer)
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise HTTPException(status_code=413, detail='Image payload too large.')
+
+
+def decode_base64_image(encoded: str) -> bytes:
+    # Reject before allocating the decoded payload; 4 base64 chars carry 3 bytes.
+    if len(encoded) // 4 * 3 > MAX_IMAGE_BYTES + 3:
+        raise HTTPException(status_code=413, detail='Image payload too large.')
+
+    try:
+        return base64.b64decode(encoded, validate=True)
+    except ValueError:
+        raise HTTPException(status_code=422, detail='Invalid base64 image payload.')
 
 
 def normalize_label(label: str) -> str:
@@ -101,40 +250,11 @@ def hate_from_labels(scores: dict[str, float]) -> float:
     return max([float(scores.get(key, 0.0)) for key in candidate_keys] + [0.0])
 
 def normalize_for_rules(text: str) -> str:
-    lowered = text.lower()
-    normalized = unicodedata.normalize('NFKD', lowered)
-    ascii_only = ''.join(ch for ch in normalized if not unicodedata.combining(ch))
-    return re.sub(r'\s+', ' ', ascii_only).strip()
+    return rules.normalize_for_rules(text)
 
 def rule_based_text_decision(text: str) -> tuple[str, str | None]:
-    normalized = normalize_for_rules(text)
-
-    threat_patterns = [
-        r'\bzabijem ta\b',
-        r'\bzabijem\b',
-        r'\bchcipni\b',
-        r'\bumri\b',
-        r'\bkill you\b',
-        r'\bi will kill you\b',
-    ]
-
-    insult_patterns = [
-        r'\bidiot\b',
-        r'\bdebil\b',
-        r'\bkreten\b',
-        r'\bkokot\b',
-        r'\bsvina\b',
-    ]
-
-    for pattern in threat_patterns:
-        if re.search(pattern, normalized):
-            return 'blocked', f'threat:{pattern}'
-
-    for pattern in insult_patterns:
-        if re.search(pattern, normalized):
-            return 'flagged', f'insult:{pattern}'
-
-    return 'ok', None
+    evaluation = rule_engine.evaluate(text)
+    return evaluation.decision, evaluation.label
 
 def combine_text_decisions(model_decision: str, rule_decision: str) -> str:
     if 'blocked' in (model_decision, rule_decision):
@@ -144,30 +264,579 @@ def combine_text_decisions(model_decision: str, rule_decision: str) -> str:
     return 'ok'
 
 
-@app.on_event('startup')
-def load_models() -> None:
+def classify_texts(classifier, texts: list[str]) -> list[dict[str, float]]:
+    # A single string yields [[...]] and a list yields one row per input; the pipeline pads each batch.
+    if len(texts) == 1:
+        rows = classifier(texts[0], truncation=True, max_length=512)
+    else:
+        rows = classifier(texts, truncation=True, max_length=512, batch_size=len(texts))
+
+    if len(rows) != len(texts):
+        raise RuntimeError(f'Classifier returned {len(rows)} rows for {len(texts)} texts.')
+
+    return [parse_text_scores(row) for row in rows]
+
+
+def stage_classifier(stage: str):
+    return text_classifier if stage == 'toxicity' else hate_classifier
+
+
+def stage_model_name(stage: str) -> str:
+    return TEXT_MODEL_NAME if stage == 'toxicity' else HATE_MODEL_NAME
+
+
+def score_stage(stage: str, texts: list[str]) -> list[dict[str, float]]:
+    return classify_texts(stage_classifier(stage), texts)
+
+
+def normalize_for_cache(text: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def text_cache_key(stage: str, text: str) -> str:
+    return cache_key('text', stage, normalize_for_cache(text), stage_model_name(stage), INFERENCE_BACKEND)
+
+
+def image_cache_key(raw: bytes) -> str:
+    return cache_key('image', bytes_digest(raw), IMAGE_MODEL_NAME, INFERENCE_BACKEND)
+
+
+def run_text_stage(stage: str, texts: list[str]) -> list[dict[str, float]]:
+    # Batches from the stage's micro-batcher and plain chunks both run on the text pool, so
+    # MODERATION_TEXT_WORKERS bounds concurrent forward passes either way.
+    batcher = text_batchers.get(stage)
+    batched = batcher is not None and batcher.running
+    try:
+        if batched:
+            futures = batcher.submit_many(texts)
+        else:
+            futures = [
+                text_pool.submit(score_stage, stage, texts[offset:offset + TEXT_BATCH_MAX_SIZE])
+                for offset in range(0, len(texts), TEXT_BATCH_MAX_SIZE)
+            ]
+    except (queue.Full, InferenceSaturated):
+        raise overloaded_error('text')
+
+    try:
+        results = [future.result(timeout=INFERENCE_TIMEOUT_SECONDS) for future in futures]
+    except InferenceSaturated:
+        raise overloaded_error('text')
+    except FutureTimeoutError:
+        for future in futures:
+            future.cancel()
+        raise overloaded_error('text')
+
+    if batched:
+        return results
+    return [scores for chunk in results for scores in chunk]
+
+
+def resolve_stage_scores(stage: str, texts: list[str]) -> list[dict[str, float]]:
+    # Thresholds and rules are applied after this step, so cached model scores stay valid when they change.
+    keys = [text_cache_key(stage, text) for text in texts]
+    resolved: dict[str, dict[str, float]] = {}
+    pending: dict[str, str] = {}
+
+    for key, text in zip(keys, texts):
+        if key in resolved or key in pending:
+            continue
+        cached = text_result_cache.get(key)
+        if cached is not None:
+            resolved[key] = cached
+        else:
+            pending[key] = text
+
+    if pending:
+        fresh = run_text_stage(stage, list(pending.values()))
+        for key, scores in zip(pending.keys(), fresh):
+            text_result_cache.set(key, scores)
+            resolved[key] = scores
+
+    return [resolved[key] for key in keys]
+
+
+def toxicity_skip_reason(text: str, evaluation: rules.RuleEvaluation) -> str | None:
+    if not CASCADE_ENABLED:
+        return None
+    if evaluation.decision == 'blocked':
+        return 'rule_blocked'
+    if not evaluation.matches and sum(ch.isalnum() for ch in text) < CASCADE_MIN_CHARS:
+        return 'trivial_text'
+    return None
+
+
+def hate_skip_reason(evaluation: rules.RuleEvaluation, toxicity_score: float | None, toxicity_skip: str | None) -> str | None:
+    if not ENABLE_HATE_MODEL:
+        return 'disabled'
+    if toxicity_skip is not None:
+        return toxicity_skip
+    if not CASCADE_ENABLED:
+        return None
+
+    signalled = evaluation.decision == 'flagged' or any(
+        rule.category in CASCADE_SIGNAL_CATEGORIES for rule in evaluation.matches
+    )
+    if signalled:
+        return None
+    if toxicity_score < CASCADE_HATE_BAND_LOW:
+        return 'confident_clean'
+    if toxicity_score >= CASCADE_HATE_BAND_HIGH:
+        return 'confident_toxic'
+    return None
+
+
+def moderate_texts(texts: list[str]) -> list[dict[str, Any]]:
+    # Rules first, then toxicity for whatever rules did not settle, then hate only for the uncertain band.
+    stage_latency: dict[str, float] = {}
+
+    started_at = time.perf_counter()
+    evaluations = [rule_engine.evaluate(text) for text in texts]
+    stage_latency['rules'] = round((time.perf_counter() - started_at) * 1000, 2)
+    STAGE_LATENCY.labels('rules').observe(stage_latency['rules'] / 1000)
+
+    toxicity_skips = [toxicity_skip_reason(text, evaluation) for text, evaluation in zip(texts, evaluations)]
+    toxicity_rows: list[dict[str, float] | None] = [None] * len(texts)
+    pending = [index for index, reason in enumerate(toxicity_skips) if reason is None]
+    if pending:
+        require_model('text')
+        started_at = time.perf_counter()
+        for index, scores in zip(pending, resolve_stage_scores('toxicity', [texts[index] for index in pending])):
+            toxicity_rows[index] = scores
+        stage_latency['toxicity'] = round((time.perf_counter() - started_at) * 1000, 2)
+        STAGE_LATENCY.labels('toxicity').observe(stage_latency['toxicity'] / 1000)
+
+    hate_skips = [
+        hate_skip_reason(evaluation, toxicity_from_labels(row) if row is not None else None, skip)
+        for evaluation, row, skip in zip(evaluations, toxicity_rows, toxicity_skips)
+    ]
+    hate_rows: list[dict[str, float] | None] = [None] * len(texts)
+    pending = [index for index, reason in enumerate(hate_skips) if reason is None]
+    if pending and not ensure_model('hate'):
+        # Serve with toxicity and rules alone while the hate model is still loading or failed.
+        for index in pending:
+            hate_skips[index] = 'model_unavailable'
+        pending = []
+    if pending:
+        started_at = time.perf_counter()
+        for index, scores in zip(pending, resolve_stage_scores('hate', [texts[index] for index in pending])):
+            hate_rows[index] = scores
+        stage_latency['hate'] = round((time.perf_counter() - started_at) * 1000, 2)
+        STAGE_LATENCY.labels('hate').observe(stage_latency['hate'] / 1000)
+
+    results = []
+    for evaluation, toxicity_row, hate_row, toxicity_skip, hate_skip in zip(
+        evaluations, toxicity_rows, hate_rows, toxicity_skips, hate_skips
+    ):
+        skipped = {'toxicity': toxicity_skip, 'hate': hate_skip}
+        ran = ['rules'] + [stage for stage in ('toxicity', 'hate') if skipped[stage] is None]
+        results.append(build_text_moderation_result(
+            evaluation,
+            toxicity_row,
+            hate_row,
+            stages={
+                'ran': ran,
+                'skipped': {stage: reason for stage, reason in skipped.items() if reason is not None},
+                'latency_ms': {stage: stage_latency[stage] for stage in ran},
+            },
+        ))
+
+    return results
+
+
+def build_text_moderation_result(
+    evaluation: rules.RuleEvaluation,
+    text_scores: dict[str, float] | None,
+    hate_scores: dict[str, float] | None,
+    stages: dict[str, Any],
+) -> dict[str, Any]:
+    toxicity_score = toxicity_from_labels(text_scores) if text_scores is not None else 0.0
+    hate_score = hate_from_labels(hate_scores) if hate_scores else 0.0
+
+    max_text_score = max(toxicity_score, hate_score)
+    model_decision = decision_from_score(max_text_score, TEXT_FLAG_THRESHOLD, TEXT_BLOCK_THRESHOLD)
+    decision = combine_text_decisions(model_decision, evaluation.decision)
+
+    if text_scores is None:
+        toxicity_label = 'skipped'
+    else:
+        toxicity_label = max(text_scores, key=text_scores.get, default='none')
+
+    if hate_scores is not None:
+        hate_label = max(hate_scores, key=hate_scores.get, default='none')
+    elif stages['skipped'].get('hate') == 'disabled':
+        hate_label = 'disabled'
+    else:
+        hate_label = 'skipped'
+
+    return {
+        'decision': decision,
+        'toxicity_score': toxicity_score,
+        'hate_score': hate_score,
+        'scores': {
+            'toxicity_labels': text_scores or {},
+            'hate_labels': hate_scores or {},
+        },
+        'labels': {
+            'toxicity': toxicity_label,
+            'hate': hate_label,
+            'rule_match': evaluation.label or 'none',
+        },
+        'rule_matches': [rule.label for rule in evaluation.matches],
+        'model_versions': {
+            'text': TEXT_MODEL_NAME,
+            'hate': HATE_MODEL_NAME if ENABLE_HATE_MODEL else None,
+        },
+        'stages': stages,
+    }
+
+
+def classify_image_bytes(raw: bytes) -> tuple[dict[str, float], dict[str, Any]]:
+    key = image_cache_key(raw)
+    cached = image_result_cache.get(key)
+    if cached is not None:
+        return cached, {'ran': ['cache'], 'latency_ms': {}}
+
+    require_model('image')
+    started_at = time.perf_counter()
+    decoded_image = parse_image_bytes(raw)
+    decode_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    STAGE_LATENCY.labels('image_decode').observe(decode_ms / 1000)
+
+    started_at = time.perf_counter()
+    result = image_classifier(decoded_image)
+    inference_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    STAGE_LATENCY.labels('image_inference').observe(inference_ms / 1000)
+
+    scores = {normalize_label(str(item.get('label', ''))): float(item.get('score', 0.0)) for item in result}
+    image_result_cache.set(key, scores)
+
+    return scores, {'ran': ['decode', 'inference'], 'latency_ms': {'decode': decode_ms, 'inference': inference_ms}}
+
+
+def nsfw_from_scores(scores: dict[str, float]) -> float:
+    return max(scores.get('nsfw', 0.0), scores.get('porn', 0.0), scores.get('sexy', 0.0), 0.0)
+
+
+def build_image_moderation_result(scores: dict[str, float], stages: dict[str, Any], latency_ms: int) -> dict[str, Any]:
+    nsfw_score = nsfw_from_scores(scores)
+    decision = decision_from_score(nsfw_score, IMAGE_FLAG_THRESHOLD, IMAGE_BLOCK_THRESHOLD)
+
+    return {
+        'decision': decision,
+        'nsfw_score': nsfw_score,
+        'scores': scores,
+        'labels': {
+            'top_label': max(scores, key=scores.get, default='none'),
+        },
+        'model_versions': {
+            'image': IMAGE_MODEL_NAME,
+        },
+        'stages': stages,
+        'latency_ms': latency_ms,
+    }
+
+
+def classify_frames(sources: list[bytes], strategy: str, max_frames: int, aggregate: str) -> dict[str, Any]:
+    # Frames from every source go through the image model as one batch; the per-source frame
+    # budget shrinks so the whole batch stays under IMAGE_MAX_BATCH_FRAMES.
+    require_model('image')
+    per_source = max(1, min(max_frames, IMAGE_MAX_BATCH_FRAMES // len(sources)))
+
+    started_at = time.perf_counter()
+    sampled: list[tuple[int, int, Image.Image]] = []
+    frame_counts: list[int] = []
+    for source_index, raw in enumerate(sources):
+        try:
+            frames, frame_count = extract_frames(raw, strategy, per_source, IMAGE_DECODE_SIZE)
+        except FrameDecodeError:
+            raise HTTPException(status_code=422, detail=f'Invalid or corrupted image file at index {source_index}.')
+        frame_counts.append(frame_count)
+        sampled.extend((source_index, frame_index, frame) for frame_index, frame in frames)
+    decode_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    STAGE_LATENCY.labels('frames_decode').observe(decode_ms / 1000)
+
+    started_at = time.perf_counter()
+    images = [frame for _, _, frame in sampled]
+    rows = image_classifier(images, batch_size=len(images))
+    if len(images) == 1 and rows and isinstance(rows[0], dict):
+        rows = [rows]
+    inference_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    STAGE_LATENCY.labels('frames_inference').observe(inference_ms / 1000)
+
+    frames_payload = []
+    for (source_index, frame_index, _), row in zip(sampled, rows):
+        scores = {normalize_label(str(item.get('label', ''))): float(item.get('score', 0.0)) for item in row}
+        frames_payload.append({
+            'source': source_index,
+            'frame': frame_index,
+            'nsfw_score': nsfw_from_scores(scores),
+            'scores': scores,
+        })
+
+    worst = max(frames_payload, key=lambda item: item['nsfw_score'])
+    nsfw_score = aggregate_scores([item['nsfw_score'] for item in frames_payload], aggregate)
+
+    return {
+        'decision': decision_from_score(nsfw_score, IMAGE_FLAG_THRESHOLD, IMAGE_BLOCK_THRESHOLD),
+        'nsfw_score': nsfw_score,
+        'aggregate': aggregate,
+        'strategy': strategy,
+        'scores': worst['scores'],
+        'labels': {
+            'top_label': max(worst['scores'], key=worst['scores'].get, default='none'),
+        },
+        'frames': frames_payload,
+        'sources': [
+            {'source': index, 'frame_count': count, 'sampled': sum(1 for item in sampled if item[0] == index)}
+            for index, count in enumerate(frame_counts)
+        ],
+        'model_versions': {
+            'image': IMAGE_MODEL_NAME,
+        },
+        'stages': {
+            'ran': ['decode', 'inference'],
+            'latency_ms': {'decode': decode_ms, 'inference': inference_ms},
+        },
+    }
+
+
+MODEL_KEYS = ('text', 'hate', 'image')
+
+
+def model_name(key: str) -> str:
+    return {'text': TEXT_MODEL_NAME, 'hate': HATE_MODEL_NAME, 'image': IMAGE_MODEL_NAME}[key]
+
+
+def model_enabled(key: str) -> bool:
+    return key != 'hate' or ENABLE_HATE_MODEL
+
+
+def get_classifier(key: str):
+    return {'text': text_classifier, 'hate': hate_classifier, 'image': image_classifier}[key]
+
+
+def set_classifier(key: str, classifier) -> None:
     global text_classifier, hate_classifier, image_classifier
 
-    text_classifier = pipeline(
-        'text-classification',
-        model=TEXT_MODEL_NAME,
-        return_all_scores=True,
-        device=DEVICE,
+    if key == 'text':
+        text_classifier = classifier
+    elif key == 'hate':
+        hate_classifier = classifier
+    else:
+        image_classifier = classifier
+
+
+def load_model(key: str) -> bool:
+    with model_locks[key]:
+        if get_classifier(key) is not None:
+            return True
+
+        state = model_state[key]
+        state.update({'status': 'loading', 'error': None})
+        started_at = time.perf_counter()
+        task = 'image-classification' if key == 'image' else 'text-classification'
+        options = {} if key == 'image' else {'return_all_scores': True}
+
+        try:
+            classifier = build_pipeline(
+                task,
+                model_name(key),
+                backend=INFERENCE_BACKEND,
+                device=DEVICE,
+                onnx_cache_dir=ONNX_CACHE_DIR,
+                **options,
+            )
+        except Exception as exc:
+            state.update({
+                'status': 'failed',
+                'error': str(exc),
+                'load_ms': int((time.perf_counter() - started_at) * 1000),
+                'failures': state.get('failures', 0) + 1,
+            })
+            logger.exception('Failed to load %s model %s.', key, model_name(key))
+            if key not in LAZY_MODELS:
+                schedule_model_retry(key)
+            return False
+
+        set_classifier(key, classifier)
+        state.update({'status': 'ready', 'load_ms': int((time.perf_counter() - started_at) * 1000), 'failures': 0})
+        logger.info('Loaded %s model %s in %d ms.', key, model_name(key), state['load_ms'])
+        return True
+
+
+def schedule_model_retry(key: str) -> None:
+    # Nothing else would ever load an eager model again, so a failed load (e.g. the hub
+    # being unreachable at boot) is retried in the background with exponential backoff.
+    failures = model_state[key].get('failures', 1)
+    delay = min(MODEL_RETRY_MAX_SECONDS, MODEL_RETRY_MIN_SECONDS * 2 ** (failures - 1))
+    model_state[key]['retry_in_seconds'] = delay
+    logger.warning('Retrying %s model load in %.0f s.', key, delay)
+    timer = threading.Timer(delay, load_model, args=(key,))
+    timer.daemon = True
+    timer.name = f'model-retry-{key}'
+    timer.start()
+
+
+def ensure_model(key: str) -> bool:
+    # Lazy models are loaded by the first request that needs them; eager ones are only waited for.
+    if get_classifier(key) is not None:
+        return True
+    if not model_enabled(key):
+        return False
+    if key in LAZY_MODELS and model_state[key]['status'] in ('lazy', 'failed'):
+        return load_model(key)
+    return False
+
+
+def require_model(key: str) -> None:
+    if ensure_model(key):
+        return
+
+    state = model_state[key]
+    if state['status'] == 'failed':
+        raise HTTPException(status_code=503, detail=f'{key} model failed to load: {state["error"]}')
+    raise HTTPException(
+        status_code=503,
+        detail=f'{key} model is still loading.',
+        headers={'Retry-After': str(RETRY_AFTER_SECONDS)},
     )
 
-    if ENABLE_HATE_MODEL:
-        hate_classifier = pipeline(
-            'text-classification',
-            model=HATE_MODEL_NAME,
-            return_all_scores=True,
-            device=DEVICE,
+
+def readiness(key: str) -> dict[str, Any]:
+    state = dict(model_state[key])
+    if get_classifier(key) is not None:
+        state['status'] = 'ready'
+    state['model'] = model_name(key) if model_enabled(key) else None
+    state['ready'] = state['status'] in ('ready', 'lazy', 'disabled')
+    return state
+
+
+def public_readiness(key: str) -> dict[str, Any]:
+    # /ready is unauthenticated; load errors can carry paths and hub URLs, so they are
+    # only reported by /health.
+    state = readiness(key)
+    return {field: state[field] for field in ('status', 'ready', 'model', 'load_ms')}
+
+
+@app.on_event('startup')
+def load_models() -> None:
+    global model_loader
+
+    model_loader = ThreadPoolExecutor(max_workers=len(MODEL_KEYS), thread_name_prefix='model-loader')
+    for key in MODEL_KEYS:
+        if not model_enabled(key) or key in LAZY_MODELS:
+            continue
+        model_loader.submit(load_model, key)
+    model_loader.shutdown(wait=False)
+
+
+@app.on_event('startup')
+def start_text_batchers() -> None:
+    if TEXT_BATCH_MAX_SIZE <= 1 or TEXT_BATCH_MAX_WAIT_MS <= 0:
+        return
+
+    stages = ['toxicity'] + (['hate'] if ENABLE_HATE_MODEL else [])
+    for stage in stages:
+        batcher = MicroBatcher(
+            lambda texts, stage=stage: score_stage(stage, texts),
+            max_batch_size=TEXT_BATCH_MAX_SIZE,
+            max_wait_ms=TEXT_BATCH_MAX_WAIT_MS,
+            name=f'{stage}-batcher',
+            max_pending=TEXT_QUEUE_MAX,
+            submit=text_pool.submit,
         )
+        batcher.start()
+        text_batchers[stage] = batcher
+
+
+@app.on_event('shutdown')
+def stop_text_batchers() -> None:
+    for batcher in text_batchers.values():
+        batcher.stop()
+    text_pool.shutdown()
+    image_pool.shutdown()
+    text_result_cache.close()
+    image_result_cache.close()
+
+
+gauge_callback(
+    metrics,
+    'moderation_model_load_seconds',
+    'Wall time it took to load each model.',
+    ('model',),
+    lambda: {(key,): state['load_ms'] / 1000 if state['load_ms'] is not None else None for key, state in model_state.items()},
+)
+gauge_callback(
+    metrics,
+    'moderation_model_ready',
+    'Whether a model is loaded and serving (1) or not (0).',
+    ('model',),
+    lambda: {(key,): 1.0 if get_classifier(key) is not None else 0.0 for key in MODEL_KEYS},
+)
+gauge_callback(
+    metrics,
+    'moderation_cache_lookups_total',
+    'Result cache lookups by outcome.',
+    ('cache', 'outcome'),
+    lambda: {
+        (cache.name, outcome): cache.stats()[field]
+        for cache in (text_result_cache, image_result_cache)
+        for outcome, field in (('hit', 'hits'), ('disk_hit', 'disk_hits'), ('miss', 'misses'))
+    },
+    kind='counter',
+)
+gauge_callback(
+    metrics,
+    'moderation_cache_hit_ratio',
+    'Share of result cache lookups served without inference.',
+    ('cache',),
+    lambda: {(cache.name,): cache.stats()['hit_ratio'] for cache in (text_result_cache, image_result_cache)},
+)
+gauge_callback(
+    metrics,
+    'moderation_queue_in_flight',
+    'Requests running or queued per inference pool.',
+    ('pool',),
+    lambda: {(pool.name,): pool.stats()['in_flight'] for pool in (text_pool, image_pool)},
+)
+gauge_callback(
+    metrics,
+    'moderation_rejected_total',
+    'Requests rejected because an inference queue was full.',
+    ('pool',),
+    lambda: {(pool.name,): pool.stats()['rejected'] for pool in (text_pool, image_pool)},
+    kind='counter',
+)
+
+
+def route_label(request: Request) -> str:
+    route = request.scope.get('route')
+    return getattr(route, 'path', 'unmatched')
+
+
+@app.middleware('http')
+async def record_request_metrics(request: Request, call_next):
+    started_at = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        route = route_label(request)
+        REQUEST_COUNT.labels(request.method, route, '500').inc()
+        REQUEST_ERRORS.labels(route).inc()
+        REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started_at)
+        raise
+
+    route = route_label(request)
+    REQUEST_COUNT.labels(request.method, route, str(response.status_code)).inc()
+    if response.status_code >= 500:
+        REQUEST_ERRORS.labels(route).inc()
+    REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started_at)
+    return response
 
-    image_classifier = pipeline(
-        'image-classification',
-        model=IMAGE_MODEL_NAME,
-        device=DEVICE,
-    )
+
+@app.get('/metrics')
+def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(generate_latest(metrics), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.exception_handler(HTTPException)
@@ -176,13 +845,18 @@ async def http_exception_handler(_, exc: HTTPException):
     code = 'http_error'
     if exc.status_code == 401:
         code = 'unauthorized'
+    elif exc.status_code == 404:
+        code = 'not_found'
     elif exc.status_code == 413:
         code = 'payload_too_large'
     elif exc.status_code == 422:
         code = 'validation_error'
+    elif exc.status_code == 503:
+        code = 'service_unavailable'
 
     return JSONResponse(
         status_code=exc.status_code,
+        headers=exc.headers,
         content={
             'error': {
                 'code': code,
@@ -197,54 +871,94 @@ def health(_: None = Depends(ensure_internal_token)) -> dict[str, Any]:
     return {
         'status': 'ok',
         'device': 'cuda' if DEVICE == 0 else 'cpu',
+        'backend': INFERENCE_BACKEND,
         'models': {
             'text': TEXT_MODEL_NAME,
             'hate': HATE_MODEL_NAME if ENABLE_HATE_MODEL else None,
             'image': IMAGE_MODEL_NAME,
         },
+        'model_loading': {key: readiness(key) for key in MODEL_KEYS},
+        'text_batching': {stage: batcher.stats() for stage, batcher in text_batchers.items()},
+        'cascade': {
+            'enabled': CASCADE_ENABLED,
+            'min_chars': CASCADE_MIN_CHARS,
+            'hate_band': [CASCADE_HATE_BAND_LOW, CASCADE_HATE_BAND_HIGH],
+            'signal_categories': sorted(CASCADE_SIGNAL_CATEGORIES),
+        },
+        'inference': {
+            'torch_threads': TORCH_THREADS,
+            'text': text_pool.stats(),
+            'image': image_pool.stats(),
+        },
+        'rules': rule_engine.stats(),
+        'cache': {
+            'text': text_result_cache.stats(),
+            'image': image_result_cache.stats(),
+        },
     }
 
 
+@app.get('/ready')
+def ready() -> JSONResponse:
+    models = {key: public_readiness(key) for key in MODEL_KEYS}
+    is_ready = all(item['ready'] for item in models.values())
+    return JSONResponse(status_code=200 if is_ready else 503, content={'ready': is_ready, 'models': models})
+
+
+@app.get('/ready/{model}')
+def ready_model(model: str) -> JSONResponse:
+    if model not in MODEL_KEYS:
+        raise HTTPException(status_code=404, detail=f'Unknown model {model}.')
+    state = public_readiness(model)
+    return JSONResponse(status_code=200 if state['ready'] else 503, content=state)
+
+
+@app.post('/rules/reload')
+def reload_rules(_: None = Depends(ensure_internal_token)) -> dict[str, Any]:
+    if not rule_engine.reload():
+        raise HTTPException(status_code=422, detail=str(rule_engine.last_error))
+    return rule_engine.stats()
+
+
+def text_response(result: dict[str, Any], latency_ms: int, include_stages: bool) -> dict[str, Any]:
+    # The cascade diagnostics (stages and every matched rule) are opt-in so the default body
+    # keeps the shape ModerationClient stores; single and batch items share this one shape.
+    if not include_stages:
+        result.pop('stages')
+        result.pop('rule_matches')
+    result['latency_ms'] = latency_ms
+    return result
+
+
 @app.post('/moderate/text')
-def moderate_text(payload: TextModerationRequest, _: None = Depends(ensure_internal_token)) -> dict[str, Any]:
+def moderate_text(
+    payload: TextModerationRequest,
+    _: None = Depends(ensure_internal_token),
+    include_stages: bool = False,
+) -> dict[str, Any]:
     started_at = time.perf_counter()
 
-    text_results = text_classifier(payload.text, truncation=True, max_length=512)[0]
-    text_scores = parse_text_scores(text_results)
-    toxicity_score = toxicity_from_labels(text_scores)
+    result = moderate_texts([payload.text])[0]
+    return text_response(result, int((time.perf_counter() - started_at) * 1000), include_stages)
 
-    hate_score = 0.0
-    hate_scores: dict[str, float] = {}
-    if ENABLE_HATE_MODEL and hate_classifier is not None:
-        hate_results = hate_classifier(payload.text, truncation=True, max_length=512)[0]
-        hate_scores = parse_text_scores(hate_results)
-        hate_score = hate_from_labels(hate_scores)
-
-    max_text_score = max(toxicity_score, hate_score)
-    model_decision = decision_from_score(max_text_score, TEXT_FLAG_THRESHOLD, TEXT_BLOCK_THRESHOLD)
-    rule_decision, rule_label = rule_based_text_decision(payload.text)
-    decision = combine_text_decisions(model_decision, rule_decision)
 
-    latency_ms = int((time.perf_counter() - started_at) * 1000)
+@app.post('/moderate/text/batch')
+def moderate_text_batch(
+    payload: TextBatchModerationRequest,
+    _: None = Depends(ensure_internal_token),
+    include_stages: bool = False,
+) -> dict[str, Any]:
+    started_at = time.perf_counter()
 
+    results = moderate_texts([item.text for item in payload.items])
+    # Items share each stage's batched call, so an item's latency is the time spent in the
+    # stages it went through; the wall time of the whole batch is reported once at the top.
     return {
-        'decision': decision,
-        'toxicity_score': toxicity_score,
-        'hate_score': hate_score,
-        'scores': {
-            'toxicity_labels': text_scores,
-            'hate_labels': hate_scores,
-        },
-        'labels': {
-            'toxicity': max(text_scores, key=text_scores.get, default='none'),
-            'hate': max(hate_scores, key=hate_scores.get, default='none') if hate_scores else 'disabled',
-            'rule_match': rule_label or 'none',
-        },
-        'model_versions': {
-            'text': TEXT_MODEL_NAME,
-            'hate': HATE_MODEL_NAME if ENABLE_HATE_MODEL else None,
-        },
-        'latency_ms': latency_ms,
+        'results': [
+            text_response(result, int(sum(result['stages']['latency_ms'].values())), include_stages)
+            for result in results
+        ],
+        'latency_ms': int((time.perf_counter() - started_at) * 1000),
     }
 
 
@@ -259,66 +973,71 @@ async def moderate_image(
     raw_bytes: bytes | None = None
 
     if image is not None:
-        raw_bytes = await image.read()
+        raw_bytes = await read_upload_limited(image)
 
     if raw_bytes is None and image_base64:
-        try:
-            raw_bytes = base64.b64decode(image_base64, validate=True)
-        except ValueError:
-            raise HTTPException(status_code=422, detail='Invalid base64 image payload.')
+        raw_bytes = decode_base64_image(image_base64)
 
     if not raw_bytes:
         raise HTTPException(status_code=422, detail='Missing image payload.')
 
-    decoded_image = parse_image_bytes(raw_bytes)
-    result = image_classifier(decoded_image)
-
-    scores = {normalize_label(str(item.get('label', ''))): float(item.get('score', 0.0)) for item in result}
-    nsfw_score = max(scores.get('nsfw', 0.0), scores.get('porn', 0.0), scores.get('sexy', 0.0), 0.0)
-    decision = decision_from_score(nsfw_score, IMAGE_FLAG_THRESHOLD, IMAGE_BLOCK_THRESHOLD)
-
+    try:
+        scores, stages = await image_pool.run(classify_image_bytes, raw_bytes, timeout=INFERENCE_TIMEOUT_SECONDS)
+    except (InferenceSaturated, asyncio.TimeoutError):
+        raise overloaded_error('image')
     latency_ms = int((time.perf_counter() - started_at) * 1000)
 
-    return {
-        'decision': decision,
-        'nsfw_score': nsfw_score,
-        'scores': scores,
-        'labels': {
-            'top_label': max(scores, key=scores.get, default='none'),
-        },
-        'model_versions': {
-            'image': IMAGE_MODEL_NAME,
-        },
-        'latency_ms': latency_ms,
-    }
+    return build_image_moderation_result(scores, stages, latency_ms)
 
 
 @app.post('/moderate/image/base64')
 def moderate_image_base64(payload: ImageModerationRequest, _: None = Depends(ensure_internal_token)) -> dict[str, Any]:
+    raw_bytes = decode_base64_image(payload.image_base64)
+
+    started_at = time.perf_counter()
     try:
-        raw_bytes = base64.b64decode(payload.image_base64, validate=True)
-    except ValueError:
-        raise HTTPException(status_code=422, detail='Invalid base64 image payload.')
+        scores, stages = image_pool.call(classify_image_bytes, raw_bytes, timeout=INFERENCE_TIMEOUT_SECONDS)
+    except (InferenceSaturated, FutureTimeoutError):
+        raise overloaded_error('image')
+    latency_ms = int((time.perf_counter() - started_at) * 1000)
+
+    return build_image_moderation_result(scores, stages, latency_ms)
+
 
-    decoded_image = parse_image_bytes(raw_bytes)
+@app.post('/moderate/image/frames')
+async def moderate_image_frames(
+    images: list[UploadFile] = File(...),
+    strategy: str | None = None,
+    max_frames: int | None = None,
+    aggregate: str | None = None,
+    _: None = Depends(ensure_internal_token),
+) -> dict[str, Any]:
     started_at = time.perf_counter()
-    result = image_classifier(decoded_image)
 
-    scores = {normalize_label(str(item.get('label', ''))): float(item.get('score', 0.0)) for item in result}
-    nsfw_score = max(scores.get('nsfw', 0.0), scores.get('porn', 0.0), scores.get('sexy', 0.0), 0.0)
-    decision = decision_from_score(nsfw_score, IMAGE_FLAG_THRESHOLD, IMAGE_BLOCK_THRESHOLD)
+    strategy = (strategy or IMAGE_FRAME_STRATEGY).strip().lower()
+    aggregate = (aggregate or IMAGE_FRAME_AGGREGATE).strip().lower()
+    if strategy not in FRAME_STRATEGIES:
+        raise HTTPException(status_code=422, detail=f"Unsupported frame strategy, expected one of {', '.join(FRAME_STRATEGIES)}.")
+    if aggregate not in FRAME_AGGREGATES:
+        raise HTTPException(status_code=422, detail=f"Unsupported aggregate, expected one of {', '.join(FRAME_AGGREGATES)}.")
+    if not images or len(images) > IMAGE_MAX_SOURCES:
+        raise HTTPException(status_code=422, detail=f'Expected between 1 and {IMAGE_MAX_SOURCES} images.')
+
+    sources = [await read_upload_limited(image) for image in images]
+    if not all(sources):
+        raise HTTPException(status_code=422, detail='Missing image payload.')
 
-    latency_ms = int((time.perf_counter() - started_at) * 1000)
+    try:
+        result = await image_pool.run(
+            classify_frames,
+            sources,
+            strategy,
+            max(1, min(max_frames or IMAGE_MAX_FRAMES, IMAGE_MAX_BATCH_FRAMES)),
+            aggregate,
+            timeout=INFERENCE_TIMEOUT_SECONDS,
+        )
+    except (InferenceSaturated, asyncio.TimeoutError):
+        raise overloaded_error('image')
 
-    return {
-        'decision': decision,
-        'nsfw_score': nsfw_score,
-        'scores': scores,
-        'labels': {
-            'top_label': max(scores, key=scores.get, default='none'),
-        },
-        'model_versions': {
-            'image': IMAGE_MODEL_NAME,
-        },
-        'latency_ms': latency_ms,
-    }
+    result['latency_ms'] = int((time.perf_counter() - started_at) * 1000)
+    return result
@@ -0,0 +1,181 @@
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from typing import Any
+
+from PIL import Image
+
+from app import main
+from app.backends import SUPPORTED_BACKENDS, build_pipeline
+
+
+# Fixed corpus so score deltas are comparable between runs and backends.
+PARITY_TEXTS = [
+    'Dnes je krasna jasna noc na pozorovanie Jupitera.',
+    'Today is a good day for stargazing.',
+    'Kto ide v sobotu na pozorovanie meteorickeho roja?',
+    'The Milky Way was clearly visible from the dark site.',
+    'Tvoj teleskop je uplne na nic, ty idiot.',
+    'You are an idiot and nobody wants your photos here.',
+    'Zabijem ta, ked ta stretnem.',
+    'I will kill you if you post that again.',
+    'All of those people should be thrown out of the country.',
+    'Shut up, nobody asked for your stupid opinion.',
+    'Kreten, zase si pokazil celu debatu.',
+    'Great shot of the Orion Nebula, what exposure did you use?',
+    'This is the worst astrophotography I have ever seen, delete it.',
+    'Go back where you came from.',
+    'Ďakujem za tip, Saturn bol nádherný!',
+    'lol',
+]
+
+PARITY_IMAGE_SIZE = 384
+
+
+def parity_images() -> list[Image.Image]:
+    size = (PARITY_IMAGE_SIZE, PARITY_IMAGE_SIZE)
+    gradient = Image.linear_gradient('L').resize(size)
+    radial = Image.radial_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 64)
+
+    return [
+        Image.merge('RGB', (gradient, radial, noise)),
+        Image.merge('RGB', (radial, radial, gradient)),
+        Image.merge('RGB', (noise, gradient, gradient)),
+        Image.new('RGB', size, (224, 172, 150)),
+        Image.new('RGB', size, (8, 10, 30)),
+        Image.merge('RGB', (gradient, gradient, gradient)).rotate(45),
+    ]
+
+
+def rss_mb() -> float:
+    try:
+        with open('/proc/self/status', encoding='utf-8') as handle:
+            for line in handle:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def load(task: str, model_name: str, backend: str, onnx_cache_dir: str | None) -> tuple[Any, dict[str, float]]:
+    gc.collect()
+    rss_before = rss_mb()
+    started_at = time.perf_counter()
+    kwargs = {'return_all_scores': True} if task == 'text-classification' else {}
+    classifier = build_pipeline(task, model_name, backend=backend, device=-1, onnx_cache_dir=onnx_cache_dir, **kwargs)
+    return classifier, {
+        'load_ms': round((time.perf_counter() - started_at) * 1000, 1),
+        'rss_delta_mb': round(rss_mb() - rss_before, 1),
+    }
+
+
+def score_corpus(task: str, classifier, inputs: list[Any], repeat: int) -> tuple[list[dict[str, float]], float]:
+    latencies: list[float] = []
+    rows: list[dict[str, float]] = []
+
+    for _ in range(max(1, repeat)):
+        rows = []
+        for item in inputs:
+            started_at = time.perf_counter()
+            if task == 'text-classification':
+                rows.append(main.parse_text_scores(classifier(item, truncation=True, max_length=512)[0]))
+            else:
+                rows.append(main.parse_text_scores(classifier(item)))
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    return rows, statistics.median(latencies)
+
+
+def positive_score(model_key: str, scores: dict[str, float]) -> float:
+    if model_key == 'text':
+        return main.toxicity_from_labels(scores)
+    if model_key == 'hate':
+        return main.hate_from_labels(scores)
+    return max(scores.get('nsfw', 0.0), scores.get('porn', 0.0), scores.get('sexy', 0.0), 0.0)
+
+
+def compare_rows(model_key: str, reference: list[dict[str, float]], candidate: list[dict[str, float]]) -> dict[str, Any]:
+    flag_threshold, block_threshold = (
+        (main.IMAGE_FLAG_THRESHOLD, main.IMAGE_BLOCK_THRESHOLD)
+        if model_key == 'image'
+        else (main.TEXT_FLAG_THRESHOLD, main.TEXT_BLOCK_THRESHOLD)
+    )
+
+    deltas: list[float] = []
+    flips = 0
+    for ref_scores, cand_scores in zip(reference, candidate):
+        for label in set(ref_scores) | set(cand_scores):
+            deltas.append(abs(ref_scores.get(label, 0.0) - cand_scores.get(label, 0.0)))
+
+        ref_decision = main.decision_from_score(positive_score(model_key, ref_scores), flag_threshold, block_threshold)
+        cand_decision = main.decision_from_score(positive_score(model_key, cand_scores), flag_threshold, block_threshold)
+        flips += int(ref_decision != cand_decision)
+
+    return {
+        'max_abs_delta': round(max(deltas, default=0.0), 6),
+        'mean_abs_delta': round(statistics.fmean(deltas) if deltas else 0.0, 6),
+        'decision_flips': flips,
+        'samples': len(reference),
+    }
+
+
+def run_parity(backend: str, models: list[str], repeat: int, onnx_cache_dir: str | None) -> dict[str, Any]:
+    targets = {
+        'text': ('text-classification', main.TEXT_MODEL_NAME, PARITY_TEXTS),
+        'hate': ('text-classification', main.HATE_MODEL_NAME, PARITY_TEXTS),
+        'image': ('image-classification', main.IMAGE_MODEL_NAME, parity_images()),
+    }
+    report: dict[str, Any] = {'backend': backend, 'reference': 'torch', 'models': {}}
+
+    for model_key in models:
+        task, model_name, inputs = targets[model_key]
+
+        reference, reference_load = load(task, model_name, 'torch', onnx_cache_dir)
+        reference_rows, reference_p50 = score_corpus(task, reference, inputs, repeat)
+        del reference
+
+        candidate, candidate_load = load(task, model_name, backend, onnx_cache_dir)
+        candidate_rows, candidate_p50 = score_corpus(task, candidate, inputs, repeat)
+        del candidate
+
+        report['models'][model_key] = {
+            'model': model_name,
+            'scores': compare_rows(model_key, reference_rows, candidate_rows),
+            'p50_ms': {'reference': round(reference_p50, 2), 'candidate': round(candidate_p50, 2)},
+            'speedup': round(reference_p50 / candidate_p50, 2) if candidate_p50 else None,
+            'load': {'reference': reference_load, 'candidate': candidate_load},
+        }
+
+    return report
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare moderation scores of an inference backend against fp32 torch.')
+    parser.add_argument('--backend', choices=[item for item in SUPPORTED_BACKENDS if item != 'torch'], default='torch-int8')
+    parser.add_argument('--models', default='text,hate,image')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--onnx-cache-dir', default=main.ONNX_CACHE_DIR)
+    parser.add_argument('--max-delta', type=float, default=None, help='Exit non-zero when any score delta exceeds this value.')
+    args = parser.parse_args(argv)
+
+    models = [item.strip() for item in args.models.split(',') if item.strip()]
+    report = run_parity(args.backend, models, args.repeat, args.onnx_cache_dir)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+    if args.max_delta is not None:
+        worst = max((item['scores']['max_abs_delta'] for item in report['models'].values()), default=0.0)
+        return 1 if worst > args.max_delta else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(cli())
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def cache_key(*parts: Any) -> str:
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def bytes_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ResultCache:
+    # Values are stored as JSON strings, so hits hand out fresh copies and the memory
+    # bound can be accounted by encoded size. An optional SQLite file keeps entries
+    # across restarts; memory misses fall through to it before counting as a miss.
+    # Disk writes are queued under the lock and flushed by a writer thread, one commit
+    # per batch, so request threads never wait on SQLite to store a result.
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        path: str | None = None,
+        max_disk_entries: int = 100_000,
+        flush_interval: float = 1.0,
+        flush_batch: int = 256,
+    ) -> None:
+        self.name = name
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_disk_entries = max(0, int(max_disk_entries))
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._writes_since_trim = 0
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.flush_batch = max(1, int(flush_batch))
+        self._pending: dict[str, tuple[str, float]] = {}
+        self._store_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = False
+        self._writer: threading.Thread | None = None
+        self._db: sqlite3.Connection | None = None
+
+        if path and self.enabled:
+            self._db = self._open_store(Path(path))
+            self._writer = threading.Thread(target=self._write_behind, name=f'{name}-cache-writer', daemon=True)
+            self._writer.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Any | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return json.loads(encoded)
+
+            queued = self._pending.get(key)
+            if queued is not None:
+                # Evicted from memory before the writer got to it.
+                self._hits += 1
+                self._remember(key, queued[0])
+                return json.loads(queued[0])
+
+        encoded = self._load_from_store(key)
+        with self._lock:
+            if encoded is None:
+                self._misses += 1
+                return None
+
+            self._disk_hits += 1
+            self._remember(key, encoded)
+        return json.loads(encoded)
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        encoded = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            self._remember(key, encoded)
+            if self._db is None:
+                return
+            self._pending[key] = (encoded, time.time())
+            full = len(self._pending) >= self.flush_batch
+
+        if full:
+            self._flush_requested.set()
+
+    def flush(self) -> None:
+        # Writes every queued entry in one transaction. Holding the store lock across the
+        # swap keeps a concurrent get() from missing an entry that is between queue and disk.
+        if self._db is None:
+            return
+
+        with self._store_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            self._db.executemany(
+                'INSERT OR REPLACE INTO results (cache, key, value, stored_at) VALUES (?, ?, ?, ?)',
+                [(self.name, key, encoded, stored_at) for key, (encoded, stored_at) in pending.items()],
+            )
+            self._writes_since_trim += len(pending)
+            if self._writes_since_trim >= 1000:
+                self._writes_since_trim = 0
+                self._db.execute(
+                    'DELETE FROM results WHERE cache = ? AND key NOT IN ('
+                    'SELECT key FROM results WHERE cache = ? ORDER BY stored_at DESC LIMIT ?)',
+                    (self.name, self.name, self.max_disk_entries),
+                )
+            self._db.commit()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._closed = True
+            self._flush_requested.set()
+            self._writer.join(5.0)
+            self._writer = None
+        self.flush()
+
+    def clear(self) -> None:
+        with self._store_lock:
+            with self._lock:
+                self._entries.clear()
+                self._pending.clear()
+                self._bytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM results WHERE cache = ?', (self.name,))
+                self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'persistent': self._db is not None,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'pending_writes': len(self._pending),
+                'hit_ratio': round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, encoded: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+
+        if len(encoded) > self.max_bytes:
+            return
+
+        self._entries[key] = encoded
+        self._bytes += len(encoded)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def _open_store(self, path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(path), check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'cache TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL, '
+            'PRIMARY KEY (cache, key))'
+        )
+        db.commit()
+        return db
+
+    def _load_from_store(self, key: str) -> str | None:
+        if self._db is None:
+            return None
+
+        with self._store_lock:
+            row = self._db.execute(
+                'SELECT value FROM results WHERE cache = ? AND key = ?',
+                (self.name, key),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write_behind(self) -> None:
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The queued batch is dropped; those results are recomputed on their next miss.
+                logger.exception('Failed to write %s cache entries to disk.', self.name)
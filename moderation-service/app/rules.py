@@ -0,0 +1,202 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+DECISION_RANK = {'ok': 0, 'flagged': 1, 'blocked': 2}
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class _FoldTable(dict):
+    # str.translate table that lowercases nothing but strips diacritics: every code point is
+    # folded through NFKD once, then served from the dict on later calls.
+
+    def __missing__(self, codepoint: int) -> str | None:
+        char = chr(codepoint)
+        if codepoint < 128:
+            folded: str | None = char
+        elif unicodedata.combining(char):
+            folded = None
+        else:
+            folded = ''.join(ch for ch in unicodedata.normalize('NFKD', char) if not unicodedata.combining(ch))
+        self[codepoint] = folded
+        return folded
+
+
+FOLD_TABLE = _FoldTable()
+
+
+def normalize_for_rules(text: str) -> str:
+    return ' '.join(text.lower().translate(FOLD_TABLE).split())
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    category: str
+    decision: str
+    order: int
+
+    @property
+    def label(self) -> str:
+        return f'{self.category}:{self.id}'
+
+
+@dataclass
+class RuleEvaluation:
+    decision: str
+    label: str | None
+    matches: list[Rule] = field(default_factory=list)
+
+
+class CompiledRules:
+    # Phrase rules live in a word-token trie walked once per token position. Regex rules are
+    # compiled one by one and each is searched on its own, so overlapping rules all report
+    # and a pattern's group numbering (backreferences) stays its own.
+
+    def __init__(self, rules: list[Rule], phrases: dict[int, str], patterns: dict[int, re.Pattern], version: str) -> None:
+        self.rules = rules
+        self.version = version
+        self._trie: dict[str, Any] = {}
+        self._max_depth = 0
+
+        for order, phrase in phrases.items():
+            tokens = TOKEN_PATTERN.findall(normalize_for_rules(phrase))
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault('', []).append(rules[order])
+            self._max_depth = max(self._max_depth, len(tokens))
+
+        self._patterns = [(rules[order], pattern) for order, pattern in patterns.items()]
+
+    def evaluate(self, text: str) -> RuleEvaluation:
+        normalized = normalize_for_rules(text)
+        matched: dict[int, Rule] = {}
+
+        tokens = TOKEN_PATTERN.findall(normalized)
+        for start in range(len(tokens)):
+            node = self._trie
+            for token in tokens[start:start + self._max_depth]:
+                node = node.get(token)
+                if node is None:
+                    break
+                for rule in node.get('', ()):
+                    matched.setdefault(rule.order, rule)
+
+        for rule, pattern in self._patterns:
+            if pattern.search(normalized) is not None:
+                matched.setdefault(rule.order, rule)
+
+        # Rules with decision "ok" only act as signals (e.g. for the moderation cascade) and never label the text.
+        matches = [matched[order] for order in sorted(matched)]
+        decisive = [rule for rule in matches if DECISION_RANK[rule.decision] > 0]
+        if not decisive:
+            return RuleEvaluation('ok', None, matches)
+
+        top = max(decisive, key=lambda rule: (DECISION_RANK[rule.decision], -rule.order))
+        return RuleEvaluation(top.decision, top.label, matches)
+
+
+def compile_rules(config: dict[str, Any], version: str) -> CompiledRules:
+    rules: list[Rule] = []
+    phrases: dict[int, str] = {}
+    patterns: dict[int, re.Pattern] = {}
+
+    for order, entry in enumerate(config.get('rules', [])):
+        category = str(entry.get('category') or 'rule').strip()
+        decision = str(entry.get('decision') or 'flagged').strip().lower()
+        if decision not in DECISION_RANK:
+            raise ValueError(f"Rule #{order} has unsupported decision '{decision}'.")
+
+        phrase = entry.get('phrase')
+        pattern = entry.get('pattern')
+        if bool(phrase) == bool(pattern):
+            raise ValueError(f"Rule #{order} needs exactly one of 'phrase' or 'pattern'.")
+
+        if pattern:
+            try:
+                patterns[order] = re.compile(pattern)
+            except re.error as exc:
+                raise ValueError(f"Rule #{order} has an invalid pattern: {exc}") from exc
+        else:
+            phrases[order] = str(phrase)
+
+        # Without an explicit id a phrase is named by the word-bounded pattern it matches, as the
+        # hard-coded rules reported it, so stored rule_match labels stay comparable.
+        rule_id = str(entry.get('id') or (rf'\b{phrase}\b' if phrase else pattern))
+        rules.append(Rule(id=rule_id, category=category, decision=decision, order=order))
+
+    return CompiledRules(rules, phrases, patterns, version)
+
+
+class RuleEngine:
+    # Holds the compiled rule set for a config file. The file's mtime is checked at most every
+    # reload_interval seconds and a changed file is recompiled and swapped in atomically; a
+    # broken edit keeps the previous rules and is reported through last_error.
+
+    def __init__(self, path: Path, reload_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.reload_interval = max(0.0, float(reload_interval))
+        self.last_error: str | None = None
+        self.loaded_at: float | None = None
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+        self._compiled = compile_rules({'rules': []}, version='empty')
+        self.reload()
+
+    @property
+    def compiled(self) -> CompiledRules:
+        if self.reload_interval and time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload_if_changed()
+        return self._compiled
+
+    def evaluate(self, text: str) -> RuleEvaluation:
+        return self.compiled.evaluate(text)
+
+    def reload_if_changed(self) -> bool:
+        self._checked_at = time.monotonic()
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError as exc:
+            self.last_error = f'rules_unreadable:{exc}'
+            return False
+        if mtime == self._mtime:
+            return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = self.path.stat().st_mtime
+                raw = self.path.read_bytes()
+                compiled = compile_rules(json.loads(raw), version=hashlib.sha256(raw).hexdigest()[:12])
+            except (OSError, ValueError, re.error) as exc:
+                self.last_error = f'rules_reload_failed:{exc}'
+                return False
+
+            self._compiled = compiled
+            self._mtime = mtime
+            self.loaded_at = time.time()
+            self.last_error = None
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        compiled = self._compiled
+        return {
+            'path': str(self.path),
+            'version': compiled.version,
+            'rules': len(compiled.rules),
+            'loaded_at': self.loaded_at,
+            'error': self.last_error,
+        }
@@ -0,0 +1,34 @@
+import pytest
+import torch
+
+from app import parity
+from app.backends import quantize_dynamic_int8, resolve_backend
+
+
+def test_resolve_backend_rejects_unknown_values():
+    assert resolve_backend(None) == 'torch'
+    assert resolve_backend(' Torch-INT8 ') == 'torch-int8'
+    with pytest.raises(ValueError):
+        resolve_backend('tensorrt')
+
+
+def test_int8_quantization_keeps_scores_close_to_fp32():
+    torch.manual_seed(7)
+    model = torch.nn.Sequential(torch.nn.Linear(32, 64), torch.nn.ReLU(), torch.nn.Linear(64, 2)).eval()
+    inputs = torch.randn(8, 32)
+
+    with torch.no_grad():
+        reference = torch.softmax(model(inputs), dim=-1)
+        quantized = torch.softmax(quantize_dynamic_int8(model)(inputs), dim=-1)
+
+    assert torch.max(torch.abs(reference - quantized)).item() < 0.05
+
+
+def test_parity_report_counts_decision_flips():
+    reference = [{'toxic': 0.10}, {'toxic': 0.95}]
+    candidate = [{'toxic': 0.12}, {'toxic': 0.85}]
+
+    report = parity.compare_rows('text', reference, candidate)
+
+    assert report['decision_flips'] == 1
+    assert report['max_abs_delta'] == pytest.approx(0.10)
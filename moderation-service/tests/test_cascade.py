@@ -0,0 +1,81 @@
+import pytest
+
+from app import main
+from app.result_cache import ResultCache
+
+
+class FixedScoreClassifier:
+    def __init__(self, label, score_by_keyword, default):
+        self.label = label
+        self.score_by_keyword = score_by_keyword
+        self.default = default
+        self.seen = []
+
+    def __call__(self, texts, **_kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        self.seen.extend(batch)
+        rows = []
+        for text in batch:
+            score = next((value for keyword, value in self.score_by_keyword.items() if keyword in text), self.default)
+            rows.append([{'label': self.label, 'score': score}])
+        return rows
+
+
+@pytest.fixture
+def cascade_models(monkeypatch):
+    toxicity = FixedScoreClassifier('toxic', {'rude': 0.40, 'awful': 0.97}, 0.01)
+    hate = FixedScoreClassifier('hate', {}, 0.80)
+    monkeypatch.setattr(main, 'text_classifier', toxicity)
+    monkeypatch.setattr(main, 'hate_classifier', hate)
+    monkeypatch.setattr(main, 'ENABLE_HATE_MODEL', True)
+    monkeypatch.setattr(main, 'CASCADE_ENABLED', True)
+    monkeypatch.setattr(main, 'text_batchers', {})
+    monkeypatch.setattr(main, 'text_result_cache', ResultCache('text', max_entries=0, max_bytes=0))
+    return toxicity, hate
+
+
+def test_rule_block_short_circuits_both_models(cascade_models):
+    toxicity, hate = cascade_models
+
+    result = main.moderate_texts(['Zabijem ta, ked ta stretnem.'])[0]
+
+    assert result['decision'] == 'blocked'
+    assert result['stages']['ran'] == ['rules']
+    assert result['stages']['skipped'] == {'toxicity': 'rule_blocked', 'hate': 'rule_blocked'}
+    assert result['labels']['toxicity'] == 'skipped'
+    assert toxicity.seen == [] and hate.seen == []
+
+
+def test_hate_model_runs_only_for_uncertain_band_or_signals(cascade_models):
+    toxicity, hate = cascade_models
+    texts = [
+        'Clear skies over Bratislava tonight.',
+        'That was a rude comment about the telescope.',
+        'An awful, awful comment.',
+        'Go back where you came from.',
+        ':)',
+    ]
+
+    clean, uncertain, confident, signalled, trivial = main.moderate_texts(texts)
+
+    assert hate.seen == [texts[1], texts[3]]
+    assert toxicity.seen == texts[:4]
+    assert clean['stages']['skipped'] == {'hate': 'confident_clean'}
+    assert uncertain['stages']['ran'] == ['rules', 'toxicity', 'hate']
+    assert uncertain['decision'] == 'flagged'
+    assert set(uncertain['stages']['latency_ms']) == {'rules', 'toxicity', 'hate'}
+    assert confident['stages']['skipped'] == {'hate': 'confident_toxic'}
+    assert signalled['rule_matches'] == [r'hate_signal:\bgo back where you came from\b']
+    assert signalled['labels']['rule_match'] == 'none'
+    assert trivial['stages']['skipped']['toxicity'] == 'trivial_text'
+
+
+def test_disabled_cascade_runs_every_stage(cascade_models, monkeypatch):
+    toxicity, hate = cascade_models
+    monkeypatch.setattr(main, 'CASCADE_ENABLED', False)
+
+    result = main.moderate_texts(['Clear skies over Bratislava tonight.'])[0]
+
+    assert result['stages']['ran'] == ['rules', 'toxicity', 'hate']
+    assert result['hate_score'] == pytest.approx(0.80)
+    assert result['decision'] == 'flagged'
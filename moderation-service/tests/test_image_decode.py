@@ -0,0 +1,84 @@
+import io
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app import main
+from app.result_cache import ResultCache
+
+
+def encode(image, fmt, **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+class DummyImageClassifier:
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, image):
+        self.sizes.append(image.size)
+        return [{'label': 'normal', 'score': 0.93}, {'label': 'nsfw', 'score': 0.07}]
+
+
+def test_large_jpeg_is_decoded_near_model_resolution():
+    raw = encode(Image.new('RGB', (4000, 3000), (20, 40, 60)), 'JPEG', quality=85)
+
+    image = main.parse_image_bytes(raw, target_size=448)
+
+    assert image.mode == 'RGB'
+    assert max(image.size) <= 448
+    assert image.size[0] > image.size[1]
+
+
+def test_transparent_png_is_converted_to_rgb():
+    raw = encode(Image.new('RGBA', (64, 32), (255, 0, 0, 0)), 'PNG')
+
+    assert main.parse_image_bytes(raw).mode == 'RGB'
+
+
+def test_truncated_image_is_rejected():
+    raw = encode(Image.effect_noise((256, 256), 50).convert('RGB'), 'JPEG')
+
+    with pytest.raises(HTTPException) as error:
+        main.parse_image_bytes(raw[: len(raw) // 2])
+
+    assert error.value.status_code == 422
+
+
+def test_moderate_image_reports_decode_and_inference_stages(monkeypatch):
+    classifier = DummyImageClassifier()
+    monkeypatch.setattr(main, 'image_classifier', classifier)
+    monkeypatch.setattr(main, 'image_result_cache', ResultCache('image', max_entries=0, max_bytes=0))
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+    raw = encode(Image.new('RGB', (2000, 1000), (10, 10, 10)), 'JPEG')
+
+    response = TestClient(main.app).post(
+        '/moderate/image',
+        files={'image': ('photo.jpg', raw, 'image/jpeg')},
+        headers={'X-Internal-Token': 'test-token'},
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload['decision'] == 'ok'
+    assert payload['stages']['ran'] == ['decode', 'inference']
+    assert set(payload['stages']['latency_ms']) == {'decode', 'inference'}
+    assert max(classifier.sizes[0]) <= main.IMAGE_DECODE_SIZE
+
+
+def test_oversized_upload_is_rejected_while_streaming(monkeypatch):
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+    monkeypatch.setattr(main, 'MAX_IMAGE_BYTES', 1024)
+
+    response = TestClient(main.app).post(
+        '/moderate/image',
+        files={'image': ('big.bin', b'\0' * 4096, 'application/octet-stream')},
+        headers={'X-Internal-Token': 'test-token'},
+    )
+
+    assert response.status_code == 413
+    assert response.json()['error']['code'] == 'payload_too_large'
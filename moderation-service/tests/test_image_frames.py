@@ -0,0 +1,99 @@
+import io
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app import main
+from app.frames import aggregate_scores, extract_frames, uniform_indices
+
+
+def animated_gif(colors):
+    frames = [Image.new('RGB', (320, 240), color) for color in colors]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:], duration=40, loop=0)
+    return buffer.getvalue()
+
+
+class BrightnessNsfwClassifier:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, images, **kwargs):
+        self.calls.append((len(images), kwargs))
+        rows = []
+        for image in images:
+            score = round(image.convert('L').getpixel((0, 0)) / 255, 2)
+            rows.append([{'label': 'nsfw', 'score': score}, {'label': 'normal', 'score': round(1 - score, 2)}])
+        return rows
+
+
+def test_uniform_indices_cover_first_and_last_frame():
+    assert uniform_indices(1, 8) == [0]
+    assert uniform_indices(5, 8) == [0, 1, 2, 3, 4]
+    assert uniform_indices(100, 4) == [0, 33, 66, 99]
+
+
+def test_keyframe_strategy_skips_repeated_frames():
+    # Pillow merges identical consecutive GIF frames, so neighbours differ by a few grey levels.
+    shades = [(value, value, value) for value in range(0, 10, 2)]
+    raw = animated_gif(shades + [(255 - r, 255 - g, 255 - b) for r, g, b in shades] + shades[::-1])
+
+    frames, frame_count = extract_frames(raw, 'keyframe', max_frames=8, target_size=224)
+
+    assert frame_count == 15
+    assert [index for index, _ in frames] == [0, 5, 10]
+
+
+def test_aggregate_scores_percentiles():
+    values = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    assert aggregate_scores(values, 'max') == 1.0
+    assert aggregate_scores(values, 'p90') == 0.9
+    assert aggregate_scores([], 'max') == 0.0
+
+
+def test_frames_endpoint_runs_one_batched_forward_pass(monkeypatch):
+    classifier = BrightnessNsfwClassifier()
+    monkeypatch.setattr(main, 'image_classifier', classifier)
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+    gif = animated_gif([(0, 0, 0), (2, 2, 2), (255, 255, 255), (4, 4, 4)])
+    still = io.BytesIO()
+    Image.new('RGB', (64, 64), (0, 0, 0)).save(still, format='PNG')
+
+    response = TestClient(main.app).post(
+        '/moderate/image/frames',
+        params={'strategy': 'uniform', 'max_frames': 4},
+        files=[
+            ('images', ('clip.gif', gif, 'image/gif')),
+            ('images', ('still.png', still.getvalue(), 'image/png')),
+        ],
+        headers={'X-Internal-Token': 'test-token'},
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert classifier.calls == [(5, {'batch_size': 5})]
+    assert payload['decision'] == 'blocked'
+    assert payload['nsfw_score'] == 1.0
+    assert [frame['frame'] for frame in payload['frames'] if frame['source'] == 0] == [0, 1, 2, 3]
+    assert payload['sources'][0]['frame_count'] == 4
+    assert set(payload['stages']['latency_ms']) == {'decode', 'inference'}
+
+
+def test_keyframe_strategy_prepares_only_selected_frames(monkeypatch):
+    import app.frames as frames_module
+
+    prepared = []
+    original = frames_module.prepare_frame
+
+    def counting_prepare(frame, target_size):
+        prepared.append(frame.tell())
+        return original(frame, target_size)
+
+    monkeypatch.setattr(frames_module, 'prepare_frame', counting_prepare)
+    colors = [(0, 0, 0) if index % 2 == 0 else (255, 255, 255) for index in range(40)]
+
+    frames, _ = extract_frames(animated_gif(colors), 'keyframe', max_frames=4, target_size=64)
+
+    assert [index for index, _ in frames] == [0, 13, 26, 39]
+    assert prepared == [0, 13, 26, 39]
+    assert [frame.getpixel((0, 0)) for _, frame in frames] == [(0, 0, 0), (255, 255, 255), (0, 0, 0), (255, 255, 255)]
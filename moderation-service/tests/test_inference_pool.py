@@ -0,0 +1,50 @@
+import base64
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.inference_pool import InferencePool, InferenceSaturated
+
+
+def test_pool_rejects_work_beyond_workers_and_queue():
+    release = threading.Event()
+    pool = InferencePool('test', workers=1, max_queue=1)
+    try:
+        running = pool.submit(release.wait, 2)
+        queued = pool.submit(lambda: 'queued')
+
+        with pytest.raises(InferenceSaturated):
+            pool.submit(lambda: 'rejected')
+
+        release.set()
+        assert running.result(timeout=2) is True
+        assert queued.result(timeout=2) == 'queued'
+        assert pool.stats()['rejected'] == 1
+        assert pool.submit(lambda: 'accepted again').result(timeout=2) == 'accepted again'
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_saturated_image_pool_returns_503_with_retry_after(monkeypatch):
+    release = threading.Event()
+    saturated = InferencePool('image', workers=1, max_queue=0)
+    saturated.submit(release.wait, 2)
+    monkeypatch.setattr(main, 'image_pool', saturated)
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+
+    try:
+        response = TestClient(main.app).post(
+            '/moderate/image/base64',
+            json={'image_base64': base64.b64encode(b'not really an image').decode()},
+            headers={'X-Internal-Token': 'test-token'},
+        )
+    finally:
+        release.set()
+        saturated.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(main.RETRY_AFTER_SECONDS)
+    assert response.json()['error']['code'] == 'service_unavailable'
@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, generate_latest
+
+from app import main
+from app.metrics import gauge_callback
+from app.result_cache import ResultCache
+
+
+class FakeTextClassifier:
+    def __call__(self, texts, **_kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        return [[{'label': 'toxic', 'score': 0.01}] for _ in batch]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, 'text_classifier', FakeTextClassifier())
+    monkeypatch.setattr(main, 'hate_classifier', None)
+    monkeypatch.setattr(main, 'ENABLE_HATE_MODEL', False)
+    monkeypatch.setattr(main, 'text_batchers', {})
+    monkeypatch.setattr(main, 'text_result_cache', ResultCache('text', max_entries=0, max_bytes=0))
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+    return TestClient(main.app)
+
+
+def test_callback_collector_reads_values_at_scrape_time():
+    registry = CollectorRegistry()
+    stats = {'hits': 0}
+    gauge_callback(registry, 'cache_lookups_total', 'Lookups.', ('outcome',), lambda: {('hit',): stats['hits'], ('miss',): None}, kind='counter')
+    gauge_callback(registry, 'broken', 'Raises.', (), lambda: 1 / 0)
+    stats['hits'] = 3
+
+    text = generate_latest(registry).decode()
+
+    assert '# TYPE cache_lookups_total counter' in text
+    assert 'cache_lookups_total{outcome="hit"} 3.0' in text
+    assert 'outcome="miss"' not in text
+    assert 'broken ' not in text
+
+
+def test_metrics_endpoint_reports_routes_and_stages(client):
+    headers = {'X-Internal-Token': 'test-token'}
+    response = client.post('/moderate/text', json={'text': 'nice picture of the moon'}, headers=headers)
+    assert response.status_code == 200
+    assert client.post('/moderate/text', json={'text': 'x'}).status_code == 401
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    body = response.text
+    assert 'moderation_requests_total{method="POST",route="/moderate/text",status="200"}' in body
+    assert 'moderation_requests_total{method="POST",route="/moderate/text",status="401"}' in body
+    assert 'moderation_request_duration_seconds_count{route="/moderate/text"}' in body
+    assert 'moderation_stage_duration_seconds_count{stage="toxicity"}' in body
+    assert 'moderation_cache_hit_ratio{cache="text"}' in body
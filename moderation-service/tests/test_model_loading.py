@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.result_cache import ResultCache
+
+
+class FakePipeline:
+    def __call__(self, texts, **_kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        return [[{'label': 'toxic', 'score': 0.01}] for _ in batch]
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def fresh_models(monkeypatch):
+    release_image = threading.Event()
+    loaded = []
+
+    def fake_build_pipeline(task, model_name, **_kwargs):
+        if task == 'image-classification':
+            release_image.wait(2.0)
+        loaded.append(model_name)
+        return FakePipeline()
+
+    for key in main.MODEL_KEYS:
+        monkeypatch.setattr(main, f'{key}_classifier', None)
+    monkeypatch.setattr(main, 'build_pipeline', fake_build_pipeline)
+    monkeypatch.setattr(main, 'ENABLE_HATE_MODEL', False)
+    monkeypatch.setattr(main, 'text_batchers', {})
+    monkeypatch.setattr(main, 'text_result_cache', ResultCache('text', max_entries=0, max_bytes=0))
+    monkeypatch.setattr(main, 'INTERNAL_TOKEN', 'test-token')
+    monkeypatch.setattr(main, 'model_locks', {key: threading.Lock() for key in main.MODEL_KEYS})
+    monkeypatch.setattr(main, 'model_state', {
+        'text': {'status': 'pending', 'load_ms': None, 'error': None, 'failures': 0},
+        'hate': {'status': 'disabled', 'load_ms': None, 'error': None, 'failures': 0},
+        'image': {'status': 'pending', 'load_ms': None, 'error': None, 'failures': 0},
+    })
+    yield release_image, loaded
+    release_image.set()
+
+
+def test_text_is_served_while_image_model_is_still_loading(fresh_models):
+    release_image, _ = fresh_models
+    client = TestClient(main.app)
+
+    main.load_models()
+    assert wait_for(lambda: main.text_classifier is not None)
+
+    assert client.get('/ready/text').status_code == 200
+    assert client.get('/ready/image').status_code == 503
+    assert client.get('/ready').json()['ready'] is False
+
+    response = client.post('/moderate/text', json={'text': 'Clear skies tonight.'}, headers={'X-Internal-Token': 'test-token'})
+    assert response.status_code == 200
+    assert response.json()['decision'] == 'ok'
+
+    release_image.set()
+    assert wait_for(lambda: main.image_classifier is not None)
+    ready = client.get('/ready')
+    assert ready.status_code == 200
+    assert isinstance(ready.json()['models']['image']['load_ms'], int)
+
+
+def test_text_request_gets_503_before_text_model_is_loaded(fresh_models):
+    response = TestClient(main.app).post(
+        '/moderate/text',
+        json={'text': 'Clear skies tonight.'},
+        headers={'X-Internal-Token': 'test-token'},
+    )
+
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+
+
+def test_lazy_model_is_loaded_on_first_use(fresh_models, monkeypatch):
+    release_image, loaded = fresh_models
+    release_image.set()
+    monkeypatch.setattr(main, 'LAZY_MODELS', {'image'})
+    main.model_state['image']['status'] = 'lazy'
+
+    main.load_models()
+    assert wait_for(lambda: main.text_classifier is not None)
+    assert main.image_classifier is None
+    assert main.readiness('image')['ready'] is True
+
+    assert main.ensure_model('image') is True
+    assert loaded.count(main.IMAGE_MODEL_NAME) == 1
+    assert main.model_state['image']['status'] == 'ready'
+
+
+def test_failed_eager_model_is_retried_in_the_background(fresh_models, monkeypatch):
+    release_image, loaded = fresh_models
+    release_image.set()
+    attempts = []
+
+    def flaky_build_pipeline(task, model_name, **_kwargs):
+        attempts.append(model_name)
+        if task == 'image-classification' and attempts.count(model_name) < 3:
+            raise OSError('hub unreachable: /root/.cache/huggingface')
+        return FakePipeline()
+
+    monkeypatch.setattr(main, 'build_pipeline', flaky_build_pipeline)
+    monkeypatch.setattr(main, 'MODEL_RETRY_MIN_SECONDS', 0.01)
+
+    main.load_models()
+
+    assert wait_for(lambda: main.image_classifier is not None)
+    assert attempts.count(main.IMAGE_MODEL_NAME) == 3
+    assert main.model_state['image']['status'] == 'ready'
+    assert main.model_state['image']['failures'] == 0
+
+
+def test_ready_does_not_expose_load_errors(fresh_models, monkeypatch):
+    monkeypatch.setattr(main, 'schedule_model_retry', lambda key: None)
+
+    def broken_build_pipeline(task, model_name, **_kwargs):
+        raise OSError('hub unreachable: /root/.cache/huggingface')
+
+    monkeypatch.setattr(main, 'build_pipeline', broken_build_pipeline)
+    assert main.load_model('text') is False
+    client = TestClient(main.app)
+
+    model = client.get('/ready/text')
+    assert model.status_code == 503
+    assert model.json()['status'] == 'failed'
+    assert 'error' not in model.json()
+    assert 'huggingface' not in client.get('/ready').text
+
+    health = client.get('/health', headers={'X-Internal-Token': 'test-token'}).json()
+    assert 'hub unreachable' in health['model_loading']['text']['error']
@@ -0,0 +1,94 @@
+import time
+
+from app import main
+from app.result_cache import ResultCache
+
+
+class CountingTextClassifier:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, texts, **_kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        self.seen.extend(batch)
+        return [[{'label': 'toxic', 'score': 0.10}] for _ in batch]
+
+
+def test_repeated_text_is_served_from_cache(monkeypatch):
+    classifier = CountingTextClassifier()
+    cache = ResultCache('text', max_entries=10, max_bytes=1024 * 1024)
+    monkeypatch.setattr(main, 'text_classifier', classifier)
+    monkeypatch.setattr(main, 'hate_classifier', None)
+    monkeypatch.setattr(main, 'text_batchers', {})
+    monkeypatch.setattr(main, 'text_result_cache', cache)
+
+    first = main.moderate_text(main.TextModerationRequest(text='Look at  Jupiter tonight'), None)
+    second = main.moderate_text(main.TextModerationRequest(text='Look at Jupiter tonight '), None)
+
+    assert classifier.seen == ['Look at  Jupiter tonight']
+    assert first['toxicity_score'] == second['toxicity_score']
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = ResultCache('text', max_entries=2, max_bytes=1024)
+    cache.set('a', {'score': 1})
+    cache.set('b', {'score': 2})
+    assert cache.get('a') == {'score': 1}
+
+    cache.set('c', {'score': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'score': 1}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_survives_restart_with_disk_store(tmp_path):
+    path = tmp_path / 'moderation-cache.sqlite3'
+    cache = ResultCache('image', max_entries=10, max_bytes=1024, path=str(path))
+    cache.set('k', {'nsfw': 0.2})
+    cache.close()
+
+    restarted = ResultCache('image', max_entries=10, max_bytes=1024, path=str(path))
+
+    assert restarted.get('k') == {'nsfw': 0.2}
+    assert restarted.stats()['disk_hits'] == 1
+    restarted.close()
+
+
+def test_disk_writes_are_queued_and_committed_in_one_batch(tmp_path):
+    path = tmp_path / 'moderation-cache.sqlite3'
+    cache = ResultCache('text', max_entries=1, max_bytes=1024, path=str(path), flush_interval=60)
+    commits = []
+    cache._db.set_trace_callback(lambda statement: commits.append(statement) if statement == 'COMMIT' else None)
+
+    for index in range(5):
+        cache.set(f'k{index}', {'score': index})
+
+    assert cache.stats()['pending_writes'] == 5
+    assert commits == []
+    # Evicted from memory but not yet on disk: still served from the write queue.
+    assert cache.get('k0') == {'score': 0}
+
+    cache.flush()
+
+    assert commits == ['COMMIT']
+    assert cache.stats()['pending_writes'] == 0
+    assert cache.get('k1') == {'score': 1}
+    assert cache.stats()['disk_hits'] == 1
+    cache.close()
+
+
+def test_writer_thread_flushes_a_full_batch(tmp_path):
+    path = tmp_path / 'moderation-cache.sqlite3'
+    cache = ResultCache('text', max_entries=10, max_bytes=1024, path=str(path), flush_interval=60, flush_batch=2)
+
+    cache.set('a', {'score': 1})
+    cache.set('b', {'score': 2})
+
+    deadline = time.monotonic() + 2
+    while cache.stats()['pending_writes'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()['pending_writes'] == 0
+    cache.close()
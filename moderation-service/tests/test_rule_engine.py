@@ -0,0 +1,80 @@
+import json
+import os
+
+from app import main
+from app.rules import RuleEngine, normalize_for_rules
+
+
+def write_rules(path, rules):
+    path.write_text(json.dumps({'rules': rules}), encoding='utf-8')
+
+
+def test_normalize_for_rules_strips_diacritics_and_whitespace():
+    assert normalize_for_rules('  Chcípni,\t  ŠVÍNA!  ') == 'chcipni, svina!'
+
+
+def test_bundled_rules_keep_threat_priority_and_report_all_matches():
+    evaluation = main.rule_engine.evaluate('Zabijem ťa, ty debil.')
+
+    assert evaluation.decision == 'blocked'
+    assert evaluation.label == r'threat:\bzabijem ta\b'
+    assert [rule.label for rule in evaluation.matches] == [
+        r'threat:\bzabijem ta\b',
+        r'threat:\bzabijem\b',
+        r'insult:\bdebil\b',
+    ]
+
+
+def test_phrase_rules_respect_word_boundaries():
+    assert main.rule_based_text_decision('Idiotsky dlhy expozicny cas.') == ('ok', None)
+
+
+def test_regex_rules_and_hot_reload(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, [{'category': 'spam', 'decision': 'flagged', 'pattern': r'\bfree\s+crypto\b', 'id': 'crypto'}])
+    engine = RuleEngine(path, reload_interval=0)
+
+    assert engine.evaluate('Get FREE   crypto now').label == 'spam:crypto'
+
+    write_rules(path, [{'category': 'threat', 'decision': 'blocked', 'phrase': 'free crypto'}])
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert engine.reload_if_changed() is True
+    assert engine.evaluate('Get free crypto now').decision == 'blocked'
+
+
+def test_broken_rules_file_keeps_previous_rules(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, [{'category': 'insult', 'decision': 'flagged', 'phrase': 'troll'}])
+    engine = RuleEngine(path, reload_interval=0)
+
+    path.write_text('{not json', encoding='utf-8')
+
+    assert engine.reload() is False
+    assert engine.last_error.startswith('rules_reload_failed:')
+    assert engine.evaluate('you troll').decision == 'flagged'
+
+
+def test_overlapping_regex_rules_all_report(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, [
+        {'category': 'spam', 'decision': 'flagged', 'pattern': r'free\s+\w+', 'id': 'free'},
+        {'category': 'spam', 'decision': 'blocked', 'pattern': r'free\s+crypto', 'id': 'crypto'},
+    ])
+    evaluation = RuleEngine(path, reload_interval=0).evaluate('get free crypto now')
+
+    assert evaluation.decision == 'blocked'
+    assert [rule.label for rule in evaluation.matches] == ['spam:free', 'spam:crypto']
+
+
+def test_pattern_with_backreference_compiles_alongside_others(tmp_path):
+    path = tmp_path / 'rules.json'
+    write_rules(path, [
+        {'category': 'spam', 'decision': 'flagged', 'pattern': r'(\w)\1{4,}', 'id': 'repeat'},
+        {'category': 'spam', 'decision': 'flagged', 'pattern': r'(a)\1', 'id': 'double-a'},
+    ])
+    engine = RuleEngine(path, reload_interval=0)
+
+    assert engine.last_error is None
+    assert [rule.id for rule in engine.evaluate('buyyyyy naan').matches] == ['repeat', 'double-a']
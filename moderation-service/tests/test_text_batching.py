@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from app import main
+from app.batching import MicroBatcher
+from app.inference_pool import InferencePool
+from app.result_cache import ResultCache
+
+
+class EchoScoreTextClassifier:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls.append((texts, kwargs))
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        return [
+            [
+                {'label': 'toxic', 'score': 0.95 if 'toxic' in text else 0.05},
+                {'label': 'insult', 'score': 0.01},
+            ]
+            for text in batch
+        ]
+
+
+@pytest.fixture
+def echo_classifier(monkeypatch):
+    classifier = EchoScoreTextClassifier()
+    monkeypatch.setattr(main, 'text_classifier', classifier)
+    monkeypatch.setattr(main, 'hate_classifier', None)
+    monkeypatch.setattr(main, 'text_batchers', {})
+    monkeypatch.setattr(main, 'text_result_cache', ResultCache('text', max_entries=0, max_bytes=0))
+    return classifier
+
+
+def test_moderate_text_batch_matches_single_item_shape(echo_classifier):
+    single = main.moderate_text(main.TextModerationRequest(text='A clear night sky.'), None)
+
+    payload = main.TextBatchModerationRequest(items=[
+        {'text': 'A clear night sky.'},
+        {'text': 'You are toxic garbage.'},
+    ])
+    result = main.moderate_text_batch(payload, None)
+
+    assert len(result['results']) == 2
+    first, second = result['results']
+    assert set(first) == set(single) == {
+        'decision', 'toxicity_score', 'hate_score', 'scores', 'labels', 'model_versions', 'latency_ms',
+    }
+    assert set(first['labels']) == set(single['labels'])
+    assert first['labels']['rule_match'] == single['labels']['rule_match'] == 'none'
+    assert first['decision'] == 'ok'
+    assert second['decision'] == 'blocked'
+    assert first['toxicity_score'] == single['toxicity_score']
+
+    batched_call = echo_classifier.calls[-1]
+    assert batched_call[0] == ['A clear night sky.', 'You are toxic garbage.']
+    assert batched_call[1]['batch_size'] == 2
+
+
+def test_batch_items_report_their_own_latency(echo_classifier):
+    payload = main.TextBatchModerationRequest(items=[{'text': 'Zabijem ta.'}, {'text': 'A clear night sky.'}])
+
+    blocked, clean = main.moderate_text_batch(payload, None, include_stages=True)['results']
+
+    assert blocked['stages']['ran'] == ['rules']
+    assert blocked['latency_ms'] == int(sum(blocked['stages']['latency_ms'].values()))
+    assert clean['latency_ms'] == int(sum(clean['stages']['latency_ms'].values()))
+    assert blocked['rule_matches'] == [r'threat:\bzabijem ta\b', r'threat:\bzabijem\b']
+
+
+def test_micro_batcher_coalesces_concurrent_submissions():
+    release = threading.Event()
+    seen_batches = []
+
+    def handler(items):
+        release.wait(1.0)
+        seen_batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, max_wait_ms=200, name='test-batcher')
+    batcher.start()
+    try:
+        futures = batcher.submit_many([1, 2, 3])
+        release.set()
+        assert [future.result(timeout=2) for future in futures] == [2, 4, 6]
+    finally:
+        batcher.stop()
+
+    assert seen_batches == [[1, 2, 3]]
+    assert batcher.stats()['largest_batch'] == 3
+
+
+def test_micro_batcher_runs_batches_on_the_submit_pool():
+    pool = InferencePool('test', workers=2, max_queue=0)
+    both_running = threading.Barrier(2, timeout=2)
+    threads = []
+
+    def handler(items):
+        threads.append(threading.current_thread().name)
+        both_running.wait()
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=1, max_wait_ms=0, name='pooled-batcher', submit=pool.submit)
+    batcher.start()
+    try:
+        futures = batcher.submit_many(['a', 'b'])
+        assert [future.result(timeout=2) for future in futures] == ['a', 'b']
+    finally:
+        batcher.stop()
+        pool.shutdown()
+
+    assert len(threads) == 2
+    assert all(name.startswith('test-inference') for name in threads)
+
+
+def test_micro_batcher_propagates_handler_errors():
+    def handler(_items):
+        raise ValueError('model failed')
+
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=1, name='failing-batcher')
+    batcher.start()
+    try:
+        future = batcher.submit('text')
+        with pytest.raises(ValueError):
+            future.result(timeout=2)
+    finally:
+        batcher.stop()
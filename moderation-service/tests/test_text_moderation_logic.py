@@ -37,7 +37,7 @@ def test_moderate_text_blocks_text_with_threat_rule(mocked_text_classifier):
     result = main.moderate_text(payload, None)
 
     assert result['decision'] == 'blocked'
-    assert result['labels']['rule_match'].startswith('threat:')
+    assert result['labels']['rule_match'] == r'threat:\bzabijem ta\b'
 
 
 def test_decision_from_score_threshold_boundaries():
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from skyfield.searchlib import EPSILON
+
+# skyfield's find_discrete() runs one search per window. find_discrete_many() runs the
+# same sampling and bracket refinement for many windows at once: every round stacks the
+# sample times of all unfinished windows into a single Time array, so one ephemeris
+# evaluation serves every location. Brackets are refined exactly as skyfield does, so
+# the event times match a per-window find_discrete() call.
+
+
+def share_nutation(t) -> None:
+    # Stacked batches repeat the same instants for every location that shares a date and
+    # timezone. IAU 2000A nutation dominates the cost of .at(), so evaluate it once per
+    # distinct instant and hand the expanded angles to the Time array.
+    _, first, inverse = np.unique(t.tt, return_index=True, return_inverse=True)
+    if len(first) == len(inverse):
+        return
+    dpsi, deps = t[first]._nutation_angles_radians
+    t._nutation_angles_radians = (dpsi[inverse], deps[inverse])
+
+
+def find_discrete_many(
+    ts,
+    jd_starts: list[float],
+    jd_ends: list[float],
+    f: Callable[[object, np.ndarray], np.ndarray],
+    step_days: float,
+    epsilon: float = EPSILON,
+    num: int = 12,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    # f(t, owners) evaluates the discrete function at t, where owners[i] is the window
+    # index each time belongs to. Returns (tt_jd of events, values) per window.
+    end_mask = np.linspace(0.0, 1.0, num)
+    start_mask = end_mask[::-1]
+
+    grids = [
+        np.linspace(jd0, jd1, int((jd1 - jd0) / step_days) + 2)
+        for jd0, jd1 in zip(jd_starts, jd_ends)
+    ]
+    results: list[tuple[np.ndarray, np.ndarray]] = [(np.empty(0), np.empty(0, dtype=bool))] * len(grids)
+    active = list(range(len(grids)))
+
+    while active:
+        lengths = [len(grids[index]) for index in active]
+        owners = np.repeat(np.asarray(active, dtype=int), lengths)
+        values = np.asarray(f(ts.tt_jd(np.concatenate([grids[index] for index in active])), owners))
+
+        still_active = []
+        offset = 0
+        for index, length in zip(active, lengths):
+            jd = grids[index]
+            y = values[offset:offset + length]
+            offset += length
+
+            changes = np.flatnonzero(np.diff(y))
+            if not len(changes):
+                results[index] = (jd[changes], y[changes])
+                continue
+
+            starts = jd[changes]
+            ends = jd[changes + 1]
+            if (ends - starts).max() <= epsilon:
+                results[index] = (ends, y[changes + 1])
+                continue
+
+            grids[index] = np.multiply.outer(starts, start_mask).flatten() + np.multiply.outer(ends, end_mask).flatten()
+            still_active.append(index)
+
+        active = still_active
+
+    return results
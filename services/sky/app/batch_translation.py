@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+
+# Argos translates one text at a time: it re-splits the text into sentences and hands
+# them to CTranslate2 as a single small batch. translate_sentences() skips that and feeds
+# many already-split sentences to the package's CTranslate2 model in one translate_batch()
+# call, with the same tokenizer, target prefix and decoding options Argos uses. Anything
+# that is not an Argos package translation falls back to translate() per sentence.
+
+_model_lock = threading.Lock()
+
+
+def package_translation(translator):
+    # Installed Argos languages hand out CachedTranslation wrappers; the wrapped package
+    # translation (.underlying) owns the tokenizer and the CTranslate2 model.
+    for candidate in (translator, getattr(translator, "underlying", None)):
+        if getattr(getattr(candidate, "pkg", None), "tokenizer", None) is not None:
+            return candidate
+    return None
+
+
+def ctranslate2_model(packaged, inter_threads: int = 1, intra_threads: int = 0):
+    # Argos loads the model lazily into .translator on the first translation; load it the
+    # same way so Argos' own translate() and the batched path share one model. The thread
+    # counts only apply when the model is loaded here.
+    if getattr(packaged, "translator", None) is not None:
+        return packaged.translator
+
+    with _model_lock:
+        if getattr(packaged, "translator", None) is None:
+            try:
+                import ctranslate2
+                from argostranslate import settings
+            except ImportError:
+                return None
+            packaged.translator = ctranslate2.Translator(
+                str(packaged.pkg.package_path / "model"),
+                device=settings.device,
+                inter_threads=inter_threads,
+                intra_threads=intra_threads,
+            )
+    return packaged.translator
+
+
+def translate_sentences(
+    translator,
+    sentences: list[str],
+    batch_size: int,
+    beam_size: int,
+    inter_threads: int = 1,
+    intra_threads: int = 0,
+) -> list[str]:
+    if not sentences:
+        return []
+
+    packaged = package_translation(translator)
+    model = ctranslate2_model(packaged, inter_threads, intra_threads) if packaged is not None else None
+    if model is None:
+        return [translator.translate(sentence) for sentence in sentences]
+
+    tokenizer = packaged.pkg.tokenizer
+    prefix = getattr(packaged.pkg, "target_prefix", "") or ""
+    tokenized = [tokenizer.encode(sentence) for sentence in sentences]
+    results = model.translate_batch(
+        tokenized,
+        target_prefix=[[prefix]] * len(tokenized) if prefix else None,
+        replace_unknowns=True,
+        max_batch_size=batch_size,
+        beam_size=beam_size,
+        num_hypotheses=1,
+        length_penalty=0.2,
+    )
+    return [decode_hypothesis(tokenizer, result.hypotheses[0], prefix) for result in results]
+
+
+def decode_hypothesis(tokenizer, tokens: list[str], prefix: str) -> str:
+    # Hypotheses start with the forced target prefix token; SentencePiece decoding leaves
+    # a leading space from the first word marker.
+    if prefix and tokens[:1] == [prefix]:
+        tokens = tokens[1:]
+    value = tokenizer.decode(tokens)
+    return value[1:] if value.startswith(" ") else value
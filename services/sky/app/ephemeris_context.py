@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Per-request memo for one observer. observer.at(t) evaluates the Earth's SPK segments
+# plus the WGS84 offset; every body observed at the same times can start from that one
+# barycentric state, and an apparent position asked for twice (the Sun for both its own
+# altitude and planet elongations) is only computed once. Keys are the Time values, so
+# separately built Time arrays over the same instants share work too.
+
+
+def time_key(t) -> tuple:
+    return (t.shape, np.asarray(t.whole).tobytes(), np.asarray(t.tt_fraction).tobytes())
+
+
+class EphemerisContext:
+    def __init__(self, observer) -> None:
+        self.observer = observer
+        self._positions: dict[tuple, object] = {}
+        self._apparent: dict[tuple, object] = {}
+
+    def at(self, t):
+        key = time_key(t)
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = self.observer.at(t)
+        return position
+
+    def apparent(self, body, t):
+        # Bodies are the module-level ephemeris segments, alive for the whole process.
+        key = (time_key(t), id(body))
+        apparent = self._apparent.get(key)
+        if apparent is None:
+            apparent = self._apparent[key] = self.at(t).observe(body).apparent()
+        return apparent
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class FeedResponse(NamedTuple):
+    status: int
+    # None when the server answered 304 Not Modified.
+    body: str | None
+    etag: str | None
+    last_modified: str | None
+
+
+def conditional_get(
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    timeout: float = 10.0,
+    user_agent: str = "astrokomunita-sky/1.1",
+) -> FeedResponse:
+    headers = {"User-Agent": user_agent}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    request = urllib_request.Request(url, headers=headers, method="GET")
+    try:
+        with urllib_request.urlopen(request, timeout=timeout) as response:
+            body = response.read().decode("utf-8", errors="replace")
+            return FeedResponse(response.status, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    except HTTPError as exc:
+        if exc.code != 304:
+            raise
+        return FeedResponse(304, None, exc.headers.get("ETag") or etag, exc.headers.get("Last-Modified") or last_modified)
+
+
+class BackgroundRefresher:
+    # Runs refresh() on a daemon thread, at most one at a time. Triggers while a refresh
+    # is in flight are dropped, and after a failure further triggers are ignored until
+    # an exponential backoff (min_backoff_seconds doubling up to max_backoff_seconds)
+    # has passed.
+
+    def __init__(
+        self,
+        name: str,
+        refresh: Callable[[], None],
+        min_backoff_seconds: float = 60.0,
+        max_backoff_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.refresh = refresh
+        self.min_backoff_seconds = max(0.0, float(min_backoff_seconds))
+        self.max_backoff_seconds = max(self.min_backoff_seconds, float(max_backoff_seconds))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._running = False
+        self._failures = 0
+        self._next_attempt_at = 0.0
+        self._last_error: str | None = None
+        self._last_duration_ms: float | None = None
+        self._attempts = 0
+
+    @property
+    def running(self) -> bool:
+        with self._lock:
+            return self._running
+
+    @property
+    def failures(self) -> int:
+        with self._lock:
+            return self._failures
+
+    def trigger(self) -> bool:
+        with self._lock:
+            if self._running or self.clock() < self._next_attempt_at:
+                return False
+            self._running = True
+            self._attempts += 1
+            self._idle.clear()
+
+        threading.Thread(target=self._run, name=f"{self.name}-refresh", daemon=True).start()
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "attempts": self._attempts,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": round(max(0.0, self._next_attempt_at - self.clock()), 1) if self._failures else 0.0,
+                "last_error": self._last_error,
+                "last_duration_ms": self._last_duration_ms,
+            }
+
+    def _run(self) -> None:
+        started_at = time.perf_counter()
+        error: Exception | None = None
+        try:
+            self.refresh()
+        except Exception as exc:
+            error = exc
+
+        delay = 0.0
+        with self._lock:
+            self._last_duration_ms = round((time.perf_counter() - started_at) * 1000, 2)
+            if error is None:
+                self._failures = 0
+                self._next_attempt_at = 0.0
+                self._last_error = None
+            else:
+                self._failures += 1
+                delay = min(self.max_backoff_seconds, self.min_backoff_seconds * 2 ** (self._failures - 1))
+                self._next_attempt_at = self.clock() + delay
+                self._last_error = str(error)
+            failures = self._failures
+            self._running = False
+            self._idle.set()
+
+        if error is not None:
+            logger.warning(
+                "Background refresh failed.",
+                extra={"refresher": self.name, "failures": failures, "retry_in_seconds": delay},
+                exc_info=error,
+            )
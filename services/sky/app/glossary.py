@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+logger = logging.getLogger("uvicorn.error")
+
+# Argos copies this shape through translation unchanged far more reliably than the term
+# it stands for; restore() also accepts the spaces SentencePiece sometimes inserts.
+PLACEHOLDER = "ZXQ{index}QXZ"
+PLACEHOLDER_PATTERN = re.compile(r"ZXQ\s*(\d+)\s*QXZ", re.IGNORECASE)
+
+
+class GlossaryEntry(NamedTuple):
+    source: str
+    target: str
+    # Only match the source exactly as written, e.g. "Curiosity" the rover but not the noun.
+    case_sensitive: bool = False
+    # Swap the term for a placeholder before translation and put the target in afterwards.
+    # Meant for names that do not inflect; inflected terms are left to the translator and
+    # only fixed up by apply().
+    protect: bool = False
+
+
+def parse_glossary_entries(payload: bytes) -> list[GlossaryEntry]:
+    raw = json.loads(payload.decode("utf-8"))
+    entries = []
+    for item in raw.get("terms", []):
+        source = str(item["source"]).strip()
+        if not source:
+            continue
+        entries.append(
+            GlossaryEntry(
+                source=source,
+                target=str(item["target"]),
+                case_sensitive=bool(item.get("case_sensitive", False)),
+                protect=bool(item.get("protect", False)),
+            )
+        )
+    return entries
+
+
+def trie_pattern(terms: list[str]) -> str:
+    # Alternation compiled from a character trie: shared prefixes are matched once and
+    # every optional continuation is tried before stopping, so the regex finds the
+    # longest term at each position in a single pass however large the glossary is.
+    trie: dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+
+def compile_terms(terms: list[str]) -> re.Pattern | None:
+    if not terms:
+        return None
+    return re.compile(r"(?<!\w)" + trie_pattern(sorted({term.lower() for term in terms})) + r"(?!\w)", re.IGNORECASE)
+
+
+def cased_target(matched: str, entry: GlossaryEntry) -> str:
+    # The glossary spells both sides canonically. Text that capitalises a lowercase term,
+    # typically at a sentence start, or shouts it in capitals gets the target the same way.
+    target = entry.target
+    if matched.isupper() and sum(char.isalpha() for char in matched) > 1 and not entry.source.isupper():
+        return target.upper()
+    if matched[:1].isupper() and entry.source[:1].islower():
+        return target[:1].upper() + target[1:]
+    return target
+
+
+class Glossary:
+    def __init__(self, entries: list[GlossaryEntry], version: str) -> None:
+        self.version = version
+        self.entries: dict[str, GlossaryEntry] = {}
+        for entry in entries:
+            self.entries.setdefault(entry.source.lower(), entry)
+        self.protected_count = sum(1 for entry in self.entries.values() if entry.protect)
+        self._pattern = compile_terms([entry.source for entry in self.entries.values()])
+        self._protect_pattern = compile_terms([entry.source for entry in self.entries.values() if entry.protect])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def apply(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replacement, text)
+
+    def protect(self, text: str) -> tuple[str, list[str]]:
+        # Returns the text with protected terms swapped for numbered placeholders and the
+        # target each placeholder stands for.
+        if self._protect_pattern is None:
+            return text, []
+        targets: list[str] = []
+
+        def swap(match: re.Match) -> str:
+            matched = match.group(0)
+            entry = self.entries[matched.lower()]
+            if entry.case_sensitive and matched != entry.source:
+                return matched
+            targets.append(cased_target(matched, entry))
+            return PLACEHOLDER.format(index=len(targets) - 1)
+
+        return self._protect_pattern.sub(swap, text), targets
+
+    def restore(self, text: str, targets: list[str]) -> str | None:
+        # None when the translator dropped, duplicated or invented a placeholder.
+        seen: list[int] = []
+
+        def put_back(match: re.Match) -> str:
+            index = int(match.group(1))
+            seen.append(index)
+            return targets[index] if index < len(targets) else match.group(0)
+
+        restored = PLACEHOLDER_PATTERN.sub(put_back, text)
+        if sorted(seen) != list(range(len(targets))):
+            return None
+        return restored
+
+    def _replacement(self, match: re.Match) -> str:
+        matched = match.group(0)
+        entry = self.entries[matched.lower()]
+        if entry.case_sensitive and matched != entry.source:
+            return matched
+        return cased_target(matched, entry)
+
+
+class GlossaryStore:
+    # Holds the compiled glossary for a JSON file and recompiles it when the file
+    # changes. current() looks at the file's mtime at most every check_interval_seconds;
+    # a file that fails to load keeps the previous glossary in service.
+
+    def __init__(
+        self,
+        path: Path,
+        check_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.check_interval_seconds = max(0.0, float(check_interval_seconds))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._glossary = Glossary([], version="empty")
+        self._signature: tuple[int, int] | None = None
+        self._checked_at: float | None = None
+        self._loaded_at: str | None = None
+        self._reloads = 0
+        self._error: str | None = None
+        self.reload()
+
+    def current(self) -> Glossary:
+        now = self.clock()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval_seconds:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= self.check_interval_seconds:
+                    self._checked_at = now
+                    self._load(force=False)
+        return self._glossary
+
+    def reload(self) -> bool:
+        with self._lock:
+            self._checked_at = self.clock()
+            return self._load(force=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "version": self._glossary.version,
+                "terms": len(self._glossary),
+                "protected_terms": self._glossary.protected_count,
+                "loaded_at": self._loaded_at,
+                "reloads": self._reloads,
+                "error": self._error,
+            }
+
+    def _load(self, force: bool) -> bool:
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if not force and signature == self._signature:
+                return False
+            payload = self.path.read_bytes()
+            entries = parse_glossary_entries(payload)
+        except Exception as exc:
+            if self._error != str(exc):
+                logger.warning("Glossary load failed.", extra={"path": str(self.path), "error": str(exc)})
+            self._error = str(exc)
+            return False
+
+        self._glossary = Glossary(entries, version=hashlib.sha256(payload).hexdigest()[:12])
+        self._signature = signature
+        self._loaded_at = datetime.now(timezone.utc).isoformat()
+        self._reloads += 1
+        self._error = None
+        return True
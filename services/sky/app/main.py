@@ -1,21 +1,51 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import math
 import os
 import re
 import time
 from datetime import date as date_cls
 from datetime import datetime, time as time_cls, timedelta, timezone
 from pathlib import Path
-from urllib import request as urllib_request
 from zoneinfo import ZoneInfo
 
 import numpy as np
-from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
 from pydantic import BaseModel, Field
 from skyfield import almanac
 from skyfield.api import EarthSatellite, Loader, wgs84
+from skyfield.nutationlib import iau2000b_radians
+
+from app.batch_ephemeris import find_discrete_many, share_nutation
+from app.batch_translation import translate_sentences
+from app.ephemeris_context import EphemerisContext
+from app.feed_refresh import BackgroundRefresher, conditional_get
+from app.metrics import LATENCY_BUCKETS, gauge_callback
+from app.satellites import (
+    Observer,
+    PassGrid,
+    SatelliteCatalog,
+    describe_passes,
+    find_passes,
+    parse_tle_catalog,
+    propagate_track,
+    track_passes,
+)
+from app.glossary import GlossaryStore
+from app.sky_cache import TTLCache, distance_km, snap_location
+from app.sky_tiles import TileStore, TileWarmer, load_tile_locations
+from app.translation_executor import (
+    PRIORITIES,
+    TranslationExecutor,
+    TranslationQueueFull,
+    TranslationQueueTimeout,
+)
+from app.translation_memory import TranslationMemory, normalize_segment
 
 try:
     from argostranslate import translate as argos_translate
@@ -25,12 +55,42 @@ except Exception as exc:  # pragma: no cover
 else:
     ARGOS_IMPORT_ERROR = None
 
+# Reference point for the cold-start to first-translation time.
+PROCESS_STARTED_AT = time.monotonic()
 APP_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = APP_ROOT / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 ISS_TLE_CACHE_PATH = DATA_DIR / "iss_tle.json"
 ISS_TLE_URL = os.getenv("ISS_TLE_URL", "https://celestrak.org/NORAD/elements/stations.txt")
 ISS_TLE_REFRESH_HOURS = max(1, int(os.getenv("ISS_TLE_REFRESH_HOURS", "12")))
+ISS_STREAM_MAX_SECONDS = max(1, int(os.getenv("ISS_STREAM_MAX_SECONDS", "900")))
+ISS_TLE_RETRY_MIN_SECONDS = max(1.0, float(os.getenv("ISS_TLE_RETRY_MIN_SECONDS", "60")))
+ISS_TLE_RETRY_MAX_SECONDS = max(ISS_TLE_RETRY_MIN_SECONDS, float(os.getenv("ISS_TLE_RETRY_MAX_SECONDS", "3600")))
+ISS_PASS_CACHE_MAX_ENTRIES = max(0, int(os.getenv("ISS_PASS_CACHE_MAX_ENTRIES", "4096")))
+ISS_TRACK_STEP_SECONDS = max(1, int(os.getenv("ISS_TRACK_STEP_SECONDS", "30")))
+ISS_PASS_MIN_ALTITUDE_DEG = 10.0
+SATELLITE_CATALOG_CACHE_PATH = DATA_DIR / "satellite_catalog.json"
+SATELLITE_TLE_URL = os.getenv("SATELLITE_TLE_URL", "https://celestrak.org/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle")
+SATELLITE_TLE_GROUPS = [group.strip() for group in os.getenv("SATELLITE_TLE_GROUPS", "stations,visual,starlink").split(",") if group.strip()]
+SATELLITE_TLE_REFRESH_HOURS = max(1, int(os.getenv("SATELLITE_TLE_REFRESH_HOURS", "12")))
+SATELLITE_TLE_RETRY_MIN_SECONDS = max(1.0, float(os.getenv("SATELLITE_TLE_RETRY_MIN_SECONDS", "60")))
+SATELLITE_TLE_RETRY_MAX_SECONDS = max(SATELLITE_TLE_RETRY_MIN_SECONDS, float(os.getenv("SATELLITE_TLE_RETRY_MAX_SECONDS", "3600")))
+# Passes are reported at the fine step; the coarse step only bounds the screening work.
+SATELLITE_FINE_STEP_SECONDS = max(1, int(os.getenv("SATELLITE_FINE_STEP_SECONDS", "30")))
+SATELLITE_COARSE_STEP_SECONDS = max(SATELLITE_FINE_STEP_SECONDS, int(os.getenv("SATELLITE_COARSE_STEP_SECONDS", "300")))
+SATELLITE_PASSES_MAX_HOURS = max(1, int(os.getenv("SATELLITE_PASSES_MAX_HOURS", "24")))
+SKY_CACHE_MAX_ENTRIES = max(0, int(os.getenv("SKY_CACHE_MAX_ENTRIES", "4096")))
+SKY_CACHE_TTL_SECONDS = max(0.0, float(os.getenv("SKY_CACHE_TTL_SECONDS", "21600")))
+# 0.05 deg is ~5.6 km of latitude, i.e. at most ~3.9 km from the cell centre; 0 disables snapping.
+SKY_CACHE_GRID_DEG = max(0.0, float(os.getenv("SKY_CACHE_GRID_DEG", "0.05")))
+SKY_BATCH_MAX_LOCATIONS = max(1, int(os.getenv("SKY_BATCH_MAX_LOCATIONS", "500")))
+ISS_BATCH_MAX_LOCATIONS = max(1, int(os.getenv("ISS_BATCH_MAX_LOCATIONS", "50")))
+SKY_FORECAST_MAX_DAYS = max(1, int(os.getenv("SKY_FORECAST_MAX_DAYS", "30")))
+SKY_TILES_ENABLED = os.getenv("SKY_TILES_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+SKY_TILES_PATH = Path(os.getenv("SKY_TILES_PATH", str(DATA_DIR / "sky_tiles.sqlite3")))
+SKY_TILE_LOCATIONS_PATH = Path(os.getenv("SKY_TILE_LOCATIONS_PATH", str(APP_ROOT / "app" / "sky_tile_locations.json")))
+SKY_TILE_WORKERS = max(1, int(os.getenv("SKY_TILE_WORKERS", "2")))
+SKY_TILE_DELAY_SECONDS = max(0.0, float(os.getenv("SKY_TILE_DELAY_SECONDS", "300")))
 
 loader = Loader(str(DATA_DIR))
 ts = loader.timescale()
@@ -50,28 +110,89 @@ PLANETS = [
 
 DIRECTIONS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
 
+# Defaults of almanac.risings_and_settings(), mirrored by the batched rise/set search.
+MOON_HORIZON_DEG = -34.0 / 60.0
+RISE_SET_STEP_DAYS = 0.25
+
 SERVICE_VERSION = "1.1.0"
 INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
 MAX_TRANSLATE_CHARS = int(os.getenv("TRANSLATION_CHUNK_MAX_CHARS", "4000"))
-
-ASTRONOMY_TERMS = {
-    "meteor shower": "meteorick\u00FD roj",
-    "lunar eclipse": "zatmenie Mesiaca",
-    "solar eclipse": "zatmenie Slnka",
-    "International Space Station": "Medzin\u00E1rodn\u00E1 vesm\u00EDrna stanica",
-    "Milky Way": "Mlie\u010Dna cesta",
-    "black hole": "\u010Dierna diera",
-    "supernova": "supernova",
-    "exoplanet": "exoplan\u00E9ta",
-    "deep space": "hlbok\u00FD vesm\u00EDr",
-    "space telescope": "vesm\u00EDrny teleskop",
-    "nebula": "hmlovina",
-    "rocket launch": "\u0161tart rakety",
-}
+TRANSLATION_MEMORY_MAX_ENTRIES = max(0, int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "20000")))
+# Optional SQLite file that keeps the memory across restarts, e.g. data/translation_memory.sqlite3.
+TRANSLATION_MEMORY_PATH = os.getenv("TRANSLATION_MEMORY_PATH", "").strip()
+TRANSLATION_MEMORY_DISK_MAX_ENTRIES = max(1, int(os.getenv("TRANSLATION_MEMORY_DISK_MAX_ENTRIES", "200000")))
+# Sentences handed to CTranslate2 per translate_batch() step, and its beam width. Argos'
+# own defaults are 32 and 4; a beam of 1 or 2 is markedly faster at some quality cost.
+TRANSLATION_BATCH_SIZE = max(1, int(os.getenv("TRANSLATION_BATCH_SIZE", "32")))
+TRANSLATION_BEAM_SIZE = max(1, int(os.getenv("TRANSLATION_BEAM_SIZE", "4")))
+TRANSLATION_BATCH_MAX_TEXTS = max(1, int(os.getenv("TRANSLATION_BATCH_MAX_TEXTS", "200")))
+# Translation runs on TRANSLATION_INTER_THREADS executor workers, each driving one
+# CTranslate2 replica with TRANSLATION_INTRA_THREADS threads; the default splits the
+# cores between them instead of letting every request spin up its own.
+TRANSLATION_INTER_THREADS = max(1, int(os.getenv("TRANSLATION_INTER_THREADS", "1")))
+TRANSLATION_INTRA_THREADS = max(
+    1, int(os.getenv("TRANSLATION_INTRA_THREADS", str(max(1, (os.cpu_count() or 1) // TRANSLATION_INTER_THREADS))))
+)
+TRANSLATION_QUEUE_MAX = max(1, int(os.getenv("TRANSLATION_QUEUE_MAX", "32")))
+TRANSLATION_QUEUE_TIMEOUT_SECONDS = max(0.1, float(os.getenv("TRANSLATION_QUEUE_TIMEOUT_SECONDS", "10")))
+TRANSLATOR_RETRY_MIN_SECONDS = max(1.0, float(os.getenv("TRANSLATOR_RETRY_MIN_SECONDS", "30")))
+TRANSLATOR_RETRY_MAX_SECONDS = max(TRANSLATOR_RETRY_MIN_SECONDS, float(os.getenv("TRANSLATOR_RETRY_MAX_SECONDS", "900")))
+TRANSLATOR_WARMUP_TEXT = "Clear skies are expected tonight."
+
+# What the translator receives and the translation memory stores. "chunk" (the default)
+# sends every split_text_preserving_format() chunk through translator.translate() as it
+# is, so Argos keeps the whole chunk as context. "sentence" cuts chunks at SENTENCE_BREAK,
+# memoizes each sentence on its own and decodes the misses with batched CTranslate2
+# calls: more memory hits and throughput, but every sentence is translated without its
+# neighbours, which can change the wording.
+TRANSLATION_UNIT = os.getenv("TRANSLATION_UNIT", "chunk").strip().lower()
+if TRANSLATION_UNIT not in {"chunk", "sentence"}:
+    TRANSLATION_UNIT = "chunk"
+
+# Sentence boundaries as split_long_segment() cuts them, plus line breaks; the captured
+# whitespace is copied to the output verbatim.
+SENTENCE_BREAK = re.compile(r"(\s*\n\s*|(?<=[.!?])\s+)")
+
+# Terminology for the astronomy domain: a JSON glossary compiled into one single-pass
+# matcher and recompiled when the file changes.
+ASTRONOMY_GLOSSARY_PATH = Path(os.getenv("ASTRONOMY_GLOSSARY_PATH", str(APP_ROOT / "app" / "astronomy_glossary.json")))
+ASTRONOMY_GLOSSARY_CHECK_SECONDS = max(0.0, float(os.getenv("ASTRONOMY_GLOSSARY_CHECK_SECONDS", "5")))
 
 app = FastAPI(title="Sky Summary Service", version=SERVICE_VERSION)
 logger = logging.getLogger("uvicorn.error")
 
+metrics = CollectorRegistry()
+REQUEST_COUNT = Counter("sky_requests_total", "HTTP requests by route and status.", ("method", "route", "status"), registry=metrics)
+REQUEST_ERRORS = Counter("sky_request_errors_total", "Requests answered with 5xx or an unhandled exception.", ("route",), registry=metrics)
+REQUEST_LATENCY = Histogram("sky_request_duration_seconds", "End-to-end request latency.", ("route",), buckets=LATENCY_BUCKETS, registry=metrics)
+STAGE_LATENCY = Histogram("sky_stage_duration_seconds", "Latency of internal computation stages.", ("stage",), buckets=LATENCY_BUCKETS, registry=metrics)
+TRANSLATION_QUEUE_WAIT = Histogram(
+    "sky_translation_queue_wait_seconds",
+    "Time translation jobs waited for an executor worker.",
+    ("priority",),
+    buckets=LATENCY_BUCKETS,
+    registry=metrics,
+)
+GLOSSARY_PLACEHOLDER_FALLBACKS = Counter(
+    "sky_glossary_placeholder_fallbacks_total",
+    "Sentences translated again without glossary placeholders because the translator mangled one.",
+    registry=metrics,
+)
+SNAP_ERROR = Histogram(
+    "sky_cache_snap_error_km",
+    "Distance between the requested location and the grid cell it was served from.",
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 25.0),
+    registry=metrics,
+)
+
+sky_cache = TTLCache("sky_summary", max_entries=SKY_CACHE_MAX_ENTRIES, ttl_seconds=SKY_CACHE_TTL_SECONDS)
+# Keys carry the TLE epoch, so a refreshed TLE never serves passes from the old one, and
+# the engine: find_events() and the shared-track grid can differ by a few seconds.
+iss_pass_cache = TTLCache("iss_passes", max_entries=ISS_PASS_CACHE_MAX_ENTRIES, ttl_seconds=SKY_CACHE_TTL_SECONDS)
+# Opened by start_tile_warmer(), so importing the app never creates the SQLite file.
+tile_store: TileStore | None = None
+tile_warmer: TileWarmer | None = None
+
 translation_state: dict[str, object] = {
     "error": None,
     "installed_languages": [],
@@ -79,13 +200,59 @@ translation_state: dict[str, object] = {
     "has_sk": False,
     "has_en_sk_pair": False,
     "translator": None,
+    "model_id": None,
+    "loaded_at": None,
+    "load_ms": None,
+    "warmup_ms": None,
+    "cold_start_ms": None,
 }
+# The only place that scans Argos packages: runs on its own thread, once at startup and
+# again, with backoff, while no translator is loaded.
+translator_loader = BackgroundRefresher(
+    "translator",
+    lambda: load_translator(),
+    min_backoff_seconds=TRANSLATOR_RETRY_MIN_SECONDS,
+    max_backoff_seconds=TRANSLATOR_RETRY_MAX_SECONDS,
+)
+translation_memory = TranslationMemory(
+    TRANSLATION_MEMORY_MAX_ENTRIES,
+    Path(TRANSLATION_MEMORY_PATH) if TRANSLATION_MEMORY_PATH else None,
+    max_disk_entries=TRANSLATION_MEMORY_DISK_MAX_ENTRIES,
+)
+glossary_store = GlossaryStore(ASTRONOMY_GLOSSARY_PATH, ASTRONOMY_GLOSSARY_CHECK_SECONDS)
+translation_executor = TranslationExecutor(
+    TRANSLATION_INTER_THREADS,
+    TRANSLATION_QUEUE_MAX,
+    TRANSLATION_QUEUE_TIMEOUT_SECONDS,
+    on_start=lambda priority, wait_seconds: TRANSLATION_QUEUE_WAIT.labels(priority).observe(wait_seconds),
+)
 iss_state: dict[str, object] = {
     "satellite": None,
     "source": None,
     "fetched_at": None,
     "error": None,
 }
+# Next-orbit ground tracks start on a multiple of their step, so every poller within one
+# step shares the same track.
+iss_track_cache = TTLCache("iss_ground_track", max_entries=32, ttl_seconds=3600)
+iss_refresher = BackgroundRefresher(
+    "iss_tle",
+    lambda: refresh_iss_tle_cache(),
+    min_backoff_seconds=ISS_TLE_RETRY_MIN_SECONDS,
+    max_backoff_seconds=ISS_TLE_RETRY_MAX_SECONDS,
+)
+satellite_state: dict[str, object] = {
+    "catalog": None,
+    "source": None,
+    "fetched_at": None,
+    "error": None,
+}
+satellite_refresher = BackgroundRefresher(
+    "satellite_catalog",
+    lambda: refresh_satellite_catalog(),
+    min_backoff_seconds=SATELLITE_TLE_RETRY_MIN_SECONDS,
+    max_backoff_seconds=SATELLITE_TLE_RETRY_MAX_SECONDS,
+)
 
 
 class TranslateRequest(BaseModel):
@@ -93,12 +260,46 @@ class TranslateRequest(BaseModel):
     from_lang: str = Field(default="en", alias="from")
     to_lang: str = Field(default="sk", alias="to")
     domain: str | None = "astronomy"
+    priority: str = Field(default="interactive", pattern=r"^(interactive|background)$")
+
+    model_config = {
+        "populate_by_name": True,
+    }
+
+
+class TranslateBatchRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=TRANSLATION_BATCH_MAX_TEXTS)
+    from_lang: str = Field(default="en", alias="from")
+    to_lang: str = Field(default="sk", alias="to")
+    domain: str | None = "astronomy"
+    priority: str = Field(default="background", pattern=r"^(interactive|background)$")
 
     model_config = {
         "populate_by_name": True,
     }
 
 
+class SkySummaryLocation(BaseModel):
+    lat: float = Field(..., ge=-90.0, le=90.0)
+    lon: float = Field(..., ge=-180.0, le=180.0)
+    tz: str = Field(..., min_length=1)
+    date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
+
+
+class SkySummaryBatchRequest(BaseModel):
+    locations: list[SkySummaryLocation] = Field(..., min_length=1, max_length=SKY_BATCH_MAX_LOCATIONS)
+
+
+class IssPreviewLocation(BaseModel):
+    lat: float = Field(..., ge=-90.0, le=90.0)
+    lon: float = Field(..., ge=-180.0, le=180.0)
+    tz: str = Field(..., min_length=1)
+
+
+class IssPreviewBatchRequest(BaseModel):
+    locations: list[IssPreviewLocation] = Field(..., min_length=1, max_length=ISS_BATCH_MAX_LOCATIONS)
+
+
 def ensure_internal_token(x_internal_token: str | None = Header(default=None, alias="X-Internal-Token")) -> None:
     if not INTERNAL_TOKEN:
         raise HTTPException(status_code=500, detail="INTERNAL_TOKEN is not configured.")
@@ -107,38 +308,276 @@ def ensure_internal_token(x_internal_token: str | None = Header(default=None, al
         raise HTTPException(status_code=401, detail="Unauthorized internal token.")
 
 
+def iss_tle_age_seconds() -> float | None:
+    return fetched_age_seconds(iss_state)
+
+
+def satellite_catalog_age_seconds() -> float | None:
+    return fetched_age_seconds(satellite_state)
+
+
+def fetched_age_seconds(state: dict[str, object]) -> float | None:
+    fetched_at = state.get("fetched_at")
+    if not fetched_at:
+        return None
+    try:
+        fetched = datetime.fromisoformat(str(fetched_at))
+    except ValueError:
+        return None
+    if fetched.tzinfo is None:
+        fetched = fetched.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - fetched).total_seconds())
+
+
+gauge_callback(
+    metrics,
+    "sky_cache_lookups_total",
+    "Sky summary cache lookups by outcome.",
+    ("outcome",),
+    lambda: {("hit",): sky_cache.stats()["hits"], ("miss",): sky_cache.stats()["misses"]},
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_cache_hit_ratio",
+    "Share of sky summary requests served from the cache.",
+    (),
+    lambda: {(): sky_cache.stats()["hit_ratio"]},
+)
+gauge_callback(
+    metrics,
+    "sky_tile_lookups_total",
+    "Precomputed tile lookups after a sky summary cache miss, by outcome.",
+    ("outcome",),
+    lambda: {("hit",): tile_store.stats()["hits"], ("miss",): tile_store.stats()["misses"]} if tile_store else {},
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_tile_warmup_duration_seconds",
+    "Duration of the last tile warm-up run.",
+    (),
+    lambda: {(): last_tile_run("duration_ms", 1000)},
+)
+gauge_callback(
+    metrics,
+    "sky_tile_coverage_ratio",
+    "Share of today's and tomorrow's configured tiles present after the last warm-up.",
+    (),
+    lambda: {(): last_tile_run("coverage")},
+)
+gauge_callback(
+    metrics,
+    "sky_translation_memory_lookups_total",
+    "Sentence-level translation memory lookups by outcome.",
+    ("outcome",),
+    lambda: {("hit",): translation_memory.stats()["hits"], ("miss",): translation_memory.stats()["misses"]},
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_translation_memory_saved_seconds_total",
+    "Translator time avoided by translation memory hits.",
+    (),
+    lambda: {(): translation_memory.stats()["saved_ms"] / 1000},
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_translation_queue_depth",
+    "Translation jobs waiting for an executor worker, by priority.",
+    ("priority",),
+    lambda: {(priority,): count for priority, count in translation_executor.stats()["depth"].items()},
+)
+gauge_callback(
+    metrics,
+    "sky_translation_jobs_running",
+    "Translation jobs currently running on executor workers.",
+    (),
+    lambda: {(): translation_executor.stats()["running"]},
+)
+gauge_callback(
+    metrics,
+    "sky_translation_queue_rejections_total",
+    "Translation jobs answered with 503 instead of running, by priority and reason.",
+    ("priority", "reason"),
+    lambda: translation_queue_rejections(),
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_glossary_terms",
+    "Terms in the loaded astronomy glossary.",
+    (),
+    lambda: {(): float(glossary_store.stats()["terms"])},
+)
+gauge_callback(
+    metrics,
+    "sky_translator_cold_start_seconds",
+    "Time from process start to the first completed translation (the warm-up).",
+    (),
+    lambda: {(): translation_state["cold_start_ms"] / 1000} if translation_state.get("cold_start_ms") is not None else {},
+)
+gauge_callback(
+    metrics,
+    "sky_translator_load_failures",
+    "Consecutive failed translator load attempts.",
+    (),
+    lambda: {(): float(translator_loader.failures)},
+)
+gauge_callback(
+    metrics,
+    "sky_translator_ready",
+    "Whether the en->sk translator is loaded (1) or not (0).",
+    (),
+    lambda: {(): 1.0 if translation_state.get("translator") is not None else 0.0},
+)
+gauge_callback(
+    metrics,
+    "sky_iss_tle_age_seconds",
+    "Age of the ISS TLE currently in use.",
+    (),
+    lambda: {(): iss_tle_age_seconds()},
+)
+gauge_callback(
+    metrics,
+    "sky_iss_tle_refresh_failures",
+    "Consecutive failed ISS TLE refresh attempts.",
+    (),
+    lambda: {(): float(iss_refresher.failures)},
+)
+gauge_callback(
+    metrics,
+    "sky_iss_pass_cache_lookups_total",
+    "ISS pass cache lookups by outcome.",
+    ("outcome",),
+    lambda: {("hit",): iss_pass_cache.stats()["hits"], ("miss",): iss_pass_cache.stats()["misses"]},
+    kind="counter",
+)
+gauge_callback(
+    metrics,
+    "sky_satellite_catalog_size",
+    "Satellites in the loaded TLE catalog.",
+    (),
+    lambda: {(): float(len(satellite_state["catalog"])) if satellite_state.get("catalog") is not None else None},
+)
+gauge_callback(
+    metrics,
+    "sky_satellite_catalog_age_seconds",
+    "Age of the satellite TLE catalog currently in use.",
+    (),
+    lambda: {(): satellite_catalog_age_seconds()},
+)
+gauge_callback(
+    metrics,
+    "sky_satellite_catalog_refresh_failures",
+    "Consecutive failed satellite catalog refresh attempts.",
+    (),
+    lambda: {(): float(satellite_refresher.failures)},
+)
+
+
+def last_tile_run(field: str, divisor: float = 1.0) -> float | None:
+    if tile_warmer is None:
+        return None
+    last_run = tile_warmer.stats()["last_run"] or {}
+    value = last_run.get(field)
+    return value / divisor if value is not None else None
+
+
+def route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started_at = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        route = route_label(request)
+        REQUEST_COUNT.labels(request.method, route, "500").inc()
+        REQUEST_ERRORS.labels(route).inc()
+        REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started_at)
+        raise
+
+    route = route_label(request)
+    REQUEST_COUNT.labels(request.method, route, str(response.status_code)).inc()
+    if response.status_code >= 500:
+        REQUEST_ERRORS.labels(route).inc()
+    REQUEST_LATENCY.labels(route).observe(time.perf_counter() - started_at)
+    return response
+
+
 @app.on_event("startup")
 def startup_check() -> None:
-    refresh_translation_state()
-    refresh_iss_tle_cache()
+    translator_loader.trigger()
+    ensure_iss_satellite()
+    ensure_satellite_catalog()
+    start_tile_warmer()
+
+
+@app.on_event("shutdown")
+def shutdown_workers() -> None:
+    if tile_warmer is not None:
+        tile_warmer.stop()
+
+
+def start_tile_warmer() -> None:
+    global tile_store, tile_warmer
+
+    if not SKY_TILES_ENABLED:
+        return
+
+    try:
+        if tile_store is None:
+            tile_store = TileStore(SKY_TILES_PATH)
+    except Exception:
+        logger.exception("Sky tile store could not be opened.", extra={"path": str(SKY_TILES_PATH)})
+        return
+
+    try:
+        locations = load_tile_locations(SKY_TILE_LOCATIONS_PATH)
+    except Exception:
+        logger.exception("Sky tile locations could not be loaded.", extra={"path": str(SKY_TILE_LOCATIONS_PATH)})
+        return
+
+    tile_warmer = TileWarmer(
+        store=tile_store,
+        locations=locations,
+        compute=build_sky_payloads_many,
+        grid_deg=SKY_CACHE_GRID_DEG,
+        workers=SKY_TILE_WORKERS,
+        delay_seconds=SKY_TILE_DELAY_SECONDS,
+    )
+    tile_warmer.start()
 
 
-def refresh_translation_state() -> None:
-    state = {
+def scan_translation_state() -> dict[str, object]:
+    state: dict[str, object] = {
         "error": None,
         "installed_languages": [],
         "has_en": False,
         "has_sk": False,
         "has_en_sk_pair": False,
         "translator": None,
+        "model_id": None,
     }
 
     if ARGOS_IMPORT_ERROR:
         state["error"] = f"argostranslate import failed: {ARGOS_IMPORT_ERROR}"
-        translation_state.update(state)
-        return
+        return state
 
     if argos_translate is None:
         state["error"] = "argostranslate is unavailable."
-        translation_state.update(state)
-        return
+        return state
 
     try:
         installed = argos_translate.get_installed_languages()
     except Exception as exc:  # pragma: no cover
         state["error"] = f"failed_to_list_languages:{exc}"
-        translation_state.update(state)
-        return
+        return state
 
     codes = sorted({lang.code for lang in installed if getattr(lang, "code", None)})
     state["installed_languages"] = codes
@@ -147,41 +586,102 @@ def refresh_translation_state() -> None:
 
     if not (state["has_en"] and state["has_sk"]):
         state["error"] = "Missing installed language packages for en and/or sk."
-        translation_state.update(state)
-        return
+        return state
 
     from_lang = next((lang for lang in installed if lang.code == "en"), None)
     to_lang = next((lang for lang in installed if lang.code == "sk"), None)
 
     if from_lang is None or to_lang is None:
         state["error"] = "Missing en or sk language object."
-        translation_state.update(state)
-        return
+        return state
 
     try:
         translator = from_lang.get_translation(to_lang)
     except Exception as exc:
         state["error"] = f"Missing en->sk translation model: {exc}"
-        translation_state.update(state)
-        return
+        return state
 
     state["has_en_sk_pair"] = True
     state["translator"] = translator
+    state["model_id"] = translator_model_id(translator)
+    return state
+
+
+def load_translator() -> None:
+    # Scans the installed Argos packages and warms the en->sk translation up with one
+    # sentence, which also loads the CTranslate2 model, before publishing it; requests
+    # never wait for either. Raising lets translator_loader back off and retry.
+    started = time.perf_counter()
+    state = scan_translation_state()
+    translator = state["translator"]
+
+    if translator is not None:
+        load_ms = round((time.perf_counter() - started) * 1000, 2)
+        warmup_started = time.perf_counter()
+        try:
+            run_translator(translator, [TRANSLATOR_WARMUP_TEXT], TRANSLATION_UNIT == "sentence")
+        except Exception as exc:
+            state.update({"translator": None, "has_en_sk_pair": False, "error": f"warmup_failed:{exc}"})
+        else:
+            state.update(
+                {
+                    "loaded_at": datetime.now(timezone.utc).isoformat(),
+                    "load_ms": load_ms,
+                    "warmup_ms": round((time.perf_counter() - warmup_started) * 1000, 2),
+                }
+            )
+            if translation_state.get("cold_start_ms") is None:
+                state["cold_start_ms"] = round((time.monotonic() - PROCESS_STARTED_AT) * 1000, 2)
+
+    if state["translator"] is None:
+        # Never replace a working translator with a failed scan.
+        if translation_state.get("translator") is None:
+            translation_state.update(state)
+        raise RuntimeError(str(state["error"]))
+
     translation_state.update(state)
+    logger.info(
+        "Translator ready.",
+        extra={
+            "model_id": state["model_id"],
+            "load_ms": state["load_ms"],
+            "warmup_ms": state["warmup_ms"],
+            "cold_start_ms": translation_state.get("cold_start_ms"),
+        },
+    )
+
+
+def translator_model_id(translator) -> str:
+    # Argos package translations carry their package, cached wrappers expose the wrapped
+    # translation as .underlying. A new model version therefore starts a fresh memory.
+    for candidate in (translator, getattr(translator, "underlying", None)):
+        package = getattr(candidate, "pkg", None)
+        if package is not None:
+            return f"argos:{package.from_code}->{package.to_code}:{getattr(package, 'package_version', '')}"
+    return f"argos:en->sk:{type(translator).__name__}"
 
 
 @app.get("/health")
 def health() -> dict[str, object]:
     return {
         "ok": bool(translation_state.get("has_en_sk_pair")),
+        "translator_loading": translator_loader.running,
         "version": SERVICE_VERSION,
         "iss_tle_ready": iss_state.get("satellite") is not None,
     }
 
 
+@app.get("/metrics")
+def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(generate_latest(metrics), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/diagnostics")
 def diagnostics(_: None = Depends(ensure_internal_token)) -> dict[str, object]:
-    refresh_translation_state()
+    # A snapshot of what the loader last published; a missing translator only nudges the
+    # background loader, which honours its backoff.
+    if translation_state.get("translator") is None:
+        translator_loader.trigger()
     return {
         "version": SERVICE_VERSION,
         "engine": "argos",
@@ -190,11 +690,41 @@ def diagnostics(_: None = Depends(ensure_internal_token)) -> dict[str, object]:
         "has_en_sk_pair": bool(translation_state.get("has_en_sk_pair")),
         "installed_languages": translation_state.get("installed_languages", []),
         "error": translation_state.get("error"),
+        "translator": {
+            "model_id": translation_state.get("model_id"),
+            "loaded_at": translation_state.get("loaded_at"),
+            "load_ms": translation_state.get("load_ms"),
+            "warmup_ms": translation_state.get("warmup_ms"),
+            "cold_start_ms": translation_state.get("cold_start_ms"),
+            "loader": translator_loader.stats(),
+        },
+        "sky_cache": sky_cache_stats(),
+        "iss_pass_cache": iss_pass_cache.stats(),
+        "translation_memory": translation_memory.stats(),
+        "translation_executor": translation_executor.stats(),
+        "glossary": glossary_store.stats(),
+        "iss_tle": {
+            "source": iss_state.get("source"),
+            "fetched_at": iss_state.get("fetched_at"),
+            "error": iss_state.get("error"),
+            "refresh": iss_refresher.stats(),
+        },
+        "sky_tiles": {
+            "store": tile_store.stats() if tile_store is not None else None,
+            "warmer": tile_warmer.stats() if tile_warmer is not None else None,
+        },
+        "satellites": {
+            "loaded": len(satellite_state["catalog"]) if satellite_state.get("catalog") is not None else 0,
+            "source": satellite_state.get("source"),
+            "fetched_at": satellite_state.get("fetched_at"),
+            "error": satellite_state.get("error"),
+            "refresh": satellite_refresher.stats(),
+        },
     }
 
 
 @app.post("/translate")
-def translate(payload: TranslateRequest, _: None = Depends(ensure_internal_token)) -> dict[str, object]:
+async def translate(payload: TranslateRequest, _: None = Depends(ensure_internal_token)) -> dict[str, object]:
     text = payload.text or ""
     if text.strip() == "":
         return {
@@ -208,32 +738,18 @@ def translate(payload: TranslateRequest, _: None = Depends(ensure_internal_token
         }
 
     started = time.perf_counter()
+    ensure_supported_pair(payload.from_lang, payload.to_lang)
+    domain = (payload.domain or "").strip().lower()
+    memory_meta = {"segments": 0, "hits": 0, "saved_ms": 0.0, "translated": 0}
 
-    if payload.from_lang != "en" or payload.to_lang != "sk":
-        raise HTTPException(status_code=422, detail="Only en->sk translation is supported.")
+    def work() -> str:
+        translator = resolve_translator()
+        model_id = str(translation_state.get("model_id") or translator_model_id(translator))
+        return translate_documents(translator, [text], model_id, domain, memory_meta)[0]
 
-    if not bool(translation_state.get("has_en_sk_pair")):
-        refresh_translation_state()
+    translated = await run_translation_job(work, payload.priority)
 
-    translator = translation_state.get("translator")
-    if translator is None:
-        raise HTTPException(
-            status_code=503,
-            detail=str(translation_state.get("error") or "en->sk translation model is unavailable."),
-        )
-
-    chunks = split_text_preserving_format(text, MAX_TRANSLATE_CHARS)
-    translated_chunks: list[str] = []
-
-    for chunk in chunks:
-        if chunk == "" or chunk.isspace():
-            translated_chunks.append(chunk)
-            continue
-        translated_chunks.append(translator.translate(chunk))
-
-    translated = "".join(translated_chunks)
-
-    if (payload.domain or "").strip().lower() == "astronomy":
+    if domain == "astronomy":
         translated = apply_astronomy_terminology(translated)
 
     took_ms = int((time.perf_counter() - started) * 1000)
@@ -245,10 +761,275 @@ def translate(payload: TranslateRequest, _: None = Depends(ensure_internal_token
             "from": payload.from_lang,
             "to": payload.to_lang,
             "took_ms": took_ms,
+            "memory": memory_summary(memory_meta),
         },
     }
 
 
+@app.post("/translate/batch")
+async def translate_batch(payload: TranslateBatchRequest, _: None = Depends(ensure_internal_token)) -> dict[str, object]:
+    started = time.perf_counter()
+    ensure_supported_pair(payload.from_lang, payload.to_lang)
+    domain = (payload.domain or "").strip().lower()
+    memory_meta = {"segments": 0, "hits": 0, "saved_ms": 0.0, "translated": 0}
+
+    def work() -> list[str]:
+        translator = resolve_translator()
+        model_id = str(translation_state.get("model_id") or translator_model_id(translator))
+        with STAGE_LATENCY.labels("translate_batch").time():
+            return translate_documents(translator, payload.texts, model_id, domain, memory_meta)
+
+    translations = await run_translation_job(work, payload.priority)
+
+    if domain == "astronomy":
+        translations = [apply_astronomy_terminology(item) for item in translations]
+
+    unique_segments = memory_meta["hits"] + memory_meta["translated"]
+    return {
+        "translations": translations,
+        "meta": {
+            "engine": "argos",
+            "from": payload.from_lang,
+            "to": payload.to_lang,
+            "took_ms": int((time.perf_counter() - started) * 1000),
+            "texts": len(payload.texts),
+            "unique_segments": unique_segments,
+            "translated_segments": memory_meta["translated"],
+            "batch_size": TRANSLATION_BATCH_SIZE,
+            "beam_size": TRANSLATION_BEAM_SIZE,
+            "memory": memory_summary(memory_meta),
+        },
+    }
+
+
+@app.post("/translate/stream")
+async def translate_stream(
+    payload: TranslateRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern=r"^(ndjson|sse)$"),
+    _: None = Depends(ensure_internal_token),
+) -> StreamingResponse:
+    text = payload.text or ""
+    ensure_supported_pair(payload.from_lang, payload.to_lang)
+    # Resolved before the response starts, so a missing model is still an HTTP 503 rather
+    # than an error event. Only the per-chunk translations take executor slots.
+    translator = resolve_translator() if text.strip() else None
+
+    return StreamingResponse(
+        translation_events(payload, translator, stream_format),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def translation_events(payload: TranslateRequest, translator, stream_format: str):
+    # One "chunk" event per split_text_preserving_format() chunk, in order and with the
+    # terminology already applied, then a "summary" event. Every chunk is its own
+    # executor job, so a long article holds one chunk at a time and shares the workers
+    # with other requests; a client that disconnects stops further chunks.
+    started = time.perf_counter()
+    domain = (payload.domain or "").strip().lower()
+    memory_meta = {"segments": 0, "hits": 0, "saved_ms": 0.0, "translated": 0}
+    model_id = str(translation_state.get("model_id") or translator_model_id(translator)) if translator is not None else ""
+    chunks = split_text_preserving_format(payload.text or "", MAX_TRANSLATE_CHARS)
+
+    for index, chunk in enumerate(chunks):
+        chunk_started = time.perf_counter()
+        translated = chunk
+        if chunk.strip():
+            try:
+                translated = await run_translation_job(
+                    lambda chunk=chunk: translate_segments(translator, [chunk], model_id, domain, memory_meta)[0],
+                    payload.priority,
+                )
+            except HTTPException as exc:
+                yield stream_event(stream_format, "error", {"index": index, "status": exc.status_code, "detail": exc.detail})
+                return
+            except Exception:
+                logger.exception("Streaming translation failed.", extra={"chunk": index})
+                yield stream_event(stream_format, "error", {"index": index, "status": 500, "detail": "Translation failed."})
+                return
+            if domain == "astronomy":
+                translated = apply_astronomy_terminology(translated)
+
+        yield stream_event(
+            stream_format,
+            "chunk",
+            {"index": index, "translated": translated, "took_ms": int((time.perf_counter() - chunk_started) * 1000)},
+        )
+
+    yield stream_event(
+        stream_format,
+        "summary",
+        {
+            "engine": "argos",
+            "from": payload.from_lang,
+            "to": payload.to_lang,
+            "chunks": len(chunks),
+            "took_ms": int((time.perf_counter() - started) * 1000),
+            "memory": memory_summary(memory_meta),
+        },
+    )
+
+
+def stream_event(stream_format: str, event: str, data: dict[str, object]) -> str:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return json.dumps({"type": event, **data}, ensure_ascii=False) + "\n"
+
+
+async def run_translation_job(work, priority: str):
+    # Translation never runs on the request threadpool: jobs wait on the executor and a
+    # saturated queue answers 503 so callers can back off.
+    retry_after = {"Retry-After": str(math.ceil(translation_executor.queue_timeout_seconds))}
+    try:
+        return await translation_executor.run(work, priority)
+    except TranslationQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers=retry_after) from exc
+    except TranslationQueueTimeout as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers=retry_after) from exc
+
+
+def translation_queue_rejections() -> dict[tuple[str, ...], float]:
+    stats = translation_executor.stats()
+    samples: dict[tuple[str, ...], float] = {}
+    for priority in PRIORITIES:
+        samples[(priority, "queue_full")] = stats["rejected"][priority]
+        samples[(priority, "queue_timeout")] = stats["timed_out"][priority]
+    return samples
+
+
+def ensure_supported_pair(from_lang: str, to_lang: str) -> None:
+    if from_lang != "en" or to_lang != "sk":
+        raise HTTPException(status_code=422, detail="Only en->sk translation is supported.")
+
+
+def resolve_translator():
+    translator = translation_state.get("translator")
+    if translator is None:
+        translator_loader.trigger()
+        retry_after = max(5, math.ceil(translator_loader.stats()["retry_in_seconds"]))
+        raise HTTPException(
+            status_code=503,
+            detail=str(translation_state.get("error") or "en->sk translation model is unavailable."),
+            headers={"Retry-After": str(retry_after)},
+        )
+    return translator
+
+
+def memory_summary(memory_meta: dict[str, float]) -> dict[str, object]:
+    return {
+        "segments": memory_meta["segments"],
+        "hits": memory_meta["hits"],
+        "hit_rate": round(memory_meta["hits"] / memory_meta["segments"], 4) if memory_meta["segments"] else 0.0,
+        "saved_ms": round(memory_meta["saved_ms"], 2),
+    }
+
+
+def translate_documents(translator, texts: list[str], model_id: str, domain: str, memory_meta: dict[str, float]) -> list[str]:
+    # Every text is chunked as before, then the chunks of all texts go through
+    # translate_segments() together so they share one memory pass and one batch.
+    chunked = [split_text_preserving_format(text, MAX_TRANSLATE_CHARS) for text in texts]
+    flat = translate_segments(translator, [chunk for chunks in chunked for chunk in chunks], model_id, domain, memory_meta)
+
+    documents = []
+    offset = 0
+    for chunks in chunked:
+        documents.append("".join(flat[offset : offset + len(chunks)]))
+        offset += len(chunks)
+    return documents
+
+
+def translate_segments(translator, chunks: list[str], model_id: str, domain: str, memory_meta: dict[str, float]) -> list[str]:
+    # Only TRANSLATION_UNIT units missing from the translation memory reach the
+    # translator, each distinct unit once however often it repeats across the chunks.
+    # Astronomy units go in with protected glossary terms swapped for placeholders; the
+    # glossary version is part of their memory key.
+    sentences = TRANSLATION_UNIT == "sentence"
+    glossary = glossary_store.current() if domain == "astronomy" else None
+    if glossary is not None:
+        domain = f"{domain}@{glossary.version}"
+    if sentences:
+        domain = f"{domain}/sentence"
+    split_chunks = [SENTENCE_BREAK.split(chunk) if sentences else [chunk] for chunk in chunks]
+    translations: dict[str, str] = {}
+    pending: dict[str, str] = {}
+
+    for parts in split_chunks:
+        for index in range(0, len(parts), 2):
+            core = unit_core(parts[index])
+            if not core:
+                continue
+            memory_meta["segments"] += 1
+            normalized = normalize_segment(core) if sentences else core
+            if normalized in translations or normalized in pending:
+                continue
+            entry = translation_memory.get((model_id, domain, normalized))
+            if entry is None:
+                pending[normalized] = core
+                continue
+            translations[normalized] = entry[0]
+            memory_meta["hits"] += 1
+            memory_meta["saved_ms"] += entry[1]
+
+    if pending:
+        sources = list(pending.values())
+        protected = [glossary.protect(core) for core in sources] if glossary is not None else [(core, []) for core in sources]
+        started_at = time.perf_counter()
+        with STAGE_LATENCY.labels("translator.translate").time():
+            translated = run_translator(translator, [text for text, _ in protected], sentences)
+            if glossary is not None:
+                translated = [
+                    glossary.restore(text, targets) if targets else text for text, (_, targets) in zip(translated, protected)
+                ]
+                # A dropped or rewritten placeholder would lose the term, so those sentences
+                # are translated again as written and left to the terminology pass.
+                retry = [index for index, text in enumerate(translated) if text is None]
+                if retry:
+                    GLOSSARY_PLACEHOLDER_FALLBACKS.inc(len(retry))
+                    for index, text in zip(retry, run_translator(translator, [sources[index] for index in retry], sentences)):
+                        translated[index] = text
+        # The batch is timed as a whole; each unit is credited an equal share.
+        took_ms = (time.perf_counter() - started_at) * 1000 / len(pending)
+        translations.update(zip(pending, translated))
+        translation_memory.set_many([((model_id, domain, normalized), translations[normalized], took_ms) for normalized in pending])
+        memory_meta["translated"] += len(pending)
+
+    output = []
+    for parts in split_chunks:
+        pieces = []
+        for index, part in enumerate(parts):
+            core = unit_core(part)
+            if index % 2 == 1 or not core:
+                pieces.append(part)
+                continue
+            leading = part[: part.index(core)]
+            trailing = part[len(leading) + len(core) :]
+            pieces.append(leading + translations[normalize_segment(core) if sentences else core] + trailing)
+        output.append("".join(pieces))
+    return output
+
+
+def unit_core(part: str) -> str:
+    # Sentences are translated without their surrounding whitespace; whole chunks go to
+    # the translator exactly as they were cut, as they always have.
+    if not part.strip():
+        return ""
+    return part.strip() if TRANSLATION_UNIT == "sentence" else part
+
+
+def run_translator(translator, texts: list[str], sentences: bool) -> list[str]:
+    if not sentences:
+        return [translator.translate(text) for text in texts]
+    return translate_sentences(
+        translator,
+        texts,
+        TRANSLATION_BATCH_SIZE,
+        TRANSLATION_BEAM_SIZE,
+        TRANSLATION_INTER_THREADS,
+        TRANSLATION_INTRA_THREADS,
+    )
+
+
 def split_text_preserving_format(text: str, max_chars: int) -> list[str]:
     if len(text) <= max_chars:
         return [text]
@@ -302,10 +1083,7 @@ def split_long_segment(segment: str, max_chars: int) -> list[str]:
 
 
 def apply_astronomy_terminology(text: str) -> str:
-    translated = text
-    for source, target in ASTRONOMY_TERMS.items():
-        translated = re.sub(re.escape(source), target, translated, flags=re.IGNORECASE)
-    return translated
+    return glossary_store.current().apply(text)
 
 
 @app.get("/sky-summary")
@@ -331,8 +1109,7 @@ def sky_summary(
     sample_t = ts.from_datetime(sample_local.astimezone(timezone.utc))
     sample_sun_alt, _, _ = observer.at(sample_t).observe(SUN).apparent().altaz()
 
-    moon_payload = build_moon_payload(observer=observer, location=location, local_date=local_date, local_tz=local_tz)
-    planets_payload = build_planets_payload(observer=observer, local_date=local_date, local_tz=local_tz)
+    moon_payload, planets_payload = cached_sky_payloads(lat=lat, lon=lon, tz=tz, local_date=local_date, local_tz=local_tz)
 
     return {
         "moon": moon_payload,
@@ -342,6 +1119,95 @@ def sky_summary(
     }
 
 
+@app.post("/sky-summary/batch")
+def sky_summary_batch(payload: SkySummaryBatchRequest, _: None = Depends(ensure_internal_token)) -> dict[str, object]:
+    results: list[dict | None] = [None] * len(payload.locations)
+    requests = []
+
+    for index, item in enumerate(payload.locations):
+        try:
+            local_tz = ZoneInfo(item.tz)
+        except Exception:
+            results[index] = {"error": f"Invalid timezone: {item.tz}"}
+            continue
+        try:
+            local_date = date_cls.fromisoformat(item.date)
+        except ValueError:
+            results[index] = {"error": "Invalid date format. Expected YYYY-MM-DD"}
+            continue
+        requests.append((index, item.lat, item.lon, item.tz, local_date, local_tz))
+
+    if requests:
+        with STAGE_LATENCY.labels("sky_summary_batch").time():
+            payloads = cached_sky_payloads_many([request[1:] for request in requests])
+            sample_locals, sun_alt_deg = sample_sun_altitudes(
+                lats=np.array([request[1] for request in requests]),
+                lons=np.array([request[2] for request in requests]),
+                zones=[request[5] for request in requests],
+            )
+
+        for position, request in enumerate(requests):
+            moon_payload, planets_payload = payloads[position]
+            results[request[0]] = {
+                "moon": moon_payload,
+                "sample_at": isoformat_with_timezone(sample_locals[position]),
+                "sun_altitude_deg": round(float(sun_alt_deg[position]), 1),
+                "planets": planets_payload,
+            }
+
+    return {"results": results}
+
+
+@app.get("/sky-forecast")
+def sky_forecast(
+    lat: float = Query(..., ge=-90.0, le=90.0),
+    lon: float = Query(..., ge=-180.0, le=180.0),
+    tz: str = Query(..., min_length=1),
+    start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    days: int = Query(default=7, ge=1, le=SKY_FORECAST_MAX_DAYS),
+) -> StreamingResponse:
+    try:
+        local_tz = ZoneInfo(tz)
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(status_code=422, detail=f"Invalid timezone: {tz}") from exc
+
+    try:
+        start_date = date_cls.fromisoformat(start) if start else datetime.now(local_tz).date()
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="Invalid date format. Expected YYYY-MM-DD") from exc
+
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    return StreamingResponse(forecast_lines(lat, lon, tz, local_tz, dates), media_type="application/x-ndjson")
+
+
+def forecast_lines(lat: float, lon: float, tz: str, local_tz: ZoneInfo, dates: list[date_cls]):
+    # One NDJSON line per night. Days already in the sky-summary cache (from earlier
+    # forecasts or /sky-summary calls) go out immediately; the rest are computed in a
+    # single stacked pass, so a window that slides by a day only computes the new day.
+    cell_lat, cell_lon = snap_location(lat, lon, SKY_CACHE_GRID_DEG)
+    cached = [lookup_sky_payloads((cell_lat, cell_lon, tz, local_date.isoformat())) for local_date in dates]
+
+    position = 0
+    while position < len(dates) and cached[position] is not None:
+        yield forecast_line(dates[position], cached[position])
+        position += 1
+
+    missing = [local_date for local_date, payloads in zip(dates[position:], cached[position:]) if payloads is None]
+    if missing:
+        with STAGE_LATENCY.labels("sky_forecast").time():
+            computed = dict(zip(missing, build_sky_payloads_many([(cell_lat, cell_lon, local_date, local_tz) for local_date in missing])))
+        for local_date, payloads in computed.items():
+            sky_cache.set((cell_lat, cell_lon, tz, local_date.isoformat()), payloads)
+
+    for local_date, payloads in zip(dates[position:], cached[position:]):
+        yield forecast_line(local_date, payloads if payloads is not None else computed[local_date])
+
+
+def forecast_line(local_date: date_cls, payloads: tuple[dict, list[dict]]) -> str:
+    moon_payload, planets_payload = payloads
+    return json.dumps({"date": local_date.isoformat(), "moon": moon_payload, "planets": planets_payload}) + "\n"
+
+
 @app.get("/iss-preview")
 def iss_preview(
     lat: float = Query(..., ge=-90.0, le=90.0),
@@ -359,51 +1225,63 @@ def iss_preview(
         return {"available": False}
 
     local_now = datetime.now(local_tz)
-    local_start = datetime.combine(local_now.date(), time_cls(0, 0), tzinfo=local_tz)
-    local_end = local_start + timedelta(days=1)
-
-    location = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
-    observer = EARTH + location
-
-    t0 = ts.from_datetime(local_start.astimezone(timezone.utc))
-    t1 = ts.from_datetime(local_end.astimezone(timezone.utc))
 
     try:
-        events_t, events = satellite.find_events(location, t0, t1, altitude_degrees=10.0)
+        passes = cached_iss_passes(satellite, lat, lon, tz, local_now.date(), local_tz)
     except Exception as exc:  # pragma: no cover
         logger.exception("ISS preview event calculation failed.", extra={"lat": lat, "lon": lon, "tz": tz})
         iss_state["error"] = f"event_calc_failed:{exc}"
         return {"available": False}
 
-    passes = build_iss_passes(
-        satellite=satellite,
-        observer=observer,
-        location=location,
-        event_times=events_t,
-        event_codes=events,
-        local_tz=local_tz,
-    )
+    result = iss_preview_result(passes, local_now)
+    current_position = iss_current_position(satellite)
+    if current_position is not None:
+        result["current_position"] = current_position
+    return result
 
-    next_visible = next((item for item in passes if item["is_visible"] and item["set_at"] >= local_now), None)
-    if next_visible is None:
-        result: dict[str, object] = {"available": False}
+
+@app.post("/iss-preview/batch")
+def iss_preview_batch(payload: IssPreviewBatchRequest, _: None = Depends(ensure_internal_token)) -> dict[str, object]:
+    satellite = ensure_iss_satellite()
+    if satellite is None:
+        logger.warning("ISS preview unavailable: no TLE data ready.", extra={"iss_error": iss_state.get("error")})
+        return {"available": False, "results": [{"available": False} for _ in payload.locations]}
+
+    results: list[dict | None] = [None] * len(payload.locations)
+    requests = []
+
+    for index, item in enumerate(payload.locations):
         try:
-            t_now = ts.now()
-            geocentric = satellite.at(t_now)
-            subpoint = wgs84.subpoint(geocentric)
-            result["current_position"] = {
-                "lat": round(float(subpoint.latitude.degrees), 6),
-                "lon": round(float(subpoint.longitude.degrees), 6),
-                "sample_at": datetime.now(timezone.utc).isoformat(),
-                "source": "tle",
-            }
+            local_tz = ZoneInfo(item.tz)
         except Exception:
-            pass
-        return result
+            results[index] = {"error": f"Invalid timezone: {item.tz}"}
+            continue
+        requests.append((index, item.lat, item.lon, item.tz, datetime.now(local_tz)))
+
+    if requests:
+        with STAGE_LATENCY.labels("iss_preview_batch").time():
+            passes = cached_iss_passes_many(
+                satellite,
+                [(lat, lon, tz, local_now.date(), local_now.tzinfo) for _, lat, lon, tz, local_now in requests],
+            )
+        for position, (index, _, _, _, local_now) in enumerate(requests):
+            results[index] = iss_preview_result(passes[position], local_now)
+
+    response: dict[str, object] = {"available": True, "results": results}
+    current_position = iss_current_position(satellite)
+    if current_position is not None:
+        response["current_position"] = current_position
+    return response
+
+
+def iss_preview_result(passes: list[dict[str, object]], local_now: datetime) -> dict[str, object]:
+    next_visible = next((item for item in passes if item["is_visible"] and item["set_at"] >= local_now), None)
+    if next_visible is None:
+        return {"available": False}
 
     duration_sec = max(0, int(round((next_visible["set_at"] - next_visible["rise_at"]).total_seconds())))
 
-    result: dict[str, object] = {
+    return {
         "available": True,
         "next_pass_at": next_visible["rise_at"].isoformat(),
         "duration_sec": duration_sec,
@@ -414,33 +1292,522 @@ def iss_preview(
         "direction_end": next_visible["direction_end"],
     }
 
+
+def iss_current_position(satellite: EarthSatellite) -> dict[str, object] | None:
     try:
-        t_now = ts.now()
-        geocentric = satellite.at(t_now)
-        subpoint = wgs84.subpoint(geocentric)
-        result["current_position"] = {
-            "lat": round(float(subpoint.latitude.degrees), 6),
-            "lon": round(float(subpoint.longitude.degrees), 6),
-            "sample_at": datetime.now(timezone.utc).isoformat(),
-            "source": "tle",
-        }
+        position = iss_positions(satellite, [datetime.now(timezone.utc)])[0]
     except Exception:
-        pass
+        return None
+    return {key: position[key] for key in ("lat", "lon", "sample_at", "source")}
+
+
+@app.get("/iss-position")
+def iss_position(
+    track: bool = Query(False),
+    track_step: int = Query(60, ge=10, le=600),
+) -> dict[str, object]:
+    satellite = ensure_iss_satellite()
+    if satellite is None:
+        return {"available": False}
 
+    with STAGE_LATENCY.labels("iss_position").time():
+        result: dict[str, object] = {
+            "available": True,
+            "position": iss_positions(satellite, [datetime.now(timezone.utc)])[0],
+            "tle_epoch": satellite.epoch.utc_datetime().isoformat(),
+        }
+        if track:
+            result["track"] = iss_next_orbit_track(satellite, track_step)
     return result
 
 
-def build_moon_payload(observer, location, local_date: date_cls, local_tz: ZoneInfo) -> dict:
-    local_noon = datetime.combine(local_date, time_cls(12, 0), tzinfo=local_tz)
-    noon_utc = local_noon.astimezone(timezone.utc)
-    t_noon = ts.from_datetime(noon_utc)
+@app.get("/iss-position/stream")
+def iss_position_stream(
+    interval: float = Query(5.0, ge=0.5, le=60.0),
+    limit: int | None = Query(None, ge=1, le=3600),
+) -> StreamingResponse:
+    return StreamingResponse(
+        iss_position_events(interval, limit),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def iss_position_events(interval: float, limit: int | None):
+    # Server-Sent Events, one "position" event per interval. Streams end after limit
+    # events or ISS_STREAM_MAX_SECONDS so idle clients do not pin connections forever.
+    deadline = time.monotonic() + ISS_STREAM_MAX_SECONDS
+    sent = 0
+    while limit is None or sent < limit:
+        # The TLE lookup and the propagation are synchronous; on the event loop they would
+        # stall every other request once per tick of every open stream.
+        position = await asyncio.to_thread(iss_position_now)
+        if position is None:
+            yield "event: unavailable\ndata: {}\n\n"
+        else:
+            yield f"event: position\ndata: {json.dumps(position)}\n\n"
+        sent += 1
+        if time.monotonic() + interval > deadline:
+            break
+        if limit is None or sent < limit:
+            await asyncio.sleep(interval)
+
+
+def iss_position_now() -> dict[str, object] | None:
+    satellite = ensure_iss_satellite()
+    if satellite is None:
+        return None
+    return iss_positions(satellite, [datetime.now(timezone.utc)])[0]
+
+
+def iss_positions(satellite: EarthSatellite, moments: list[datetime]) -> list[dict[str, object]]:
+    # Subpoint, height and inertial speed for any number of UTC instants in one
+    # vectorized propagation. IAU 2000B nutation, as in the pass grid, keeps a single
+    # sample well under a millisecond.
+    t = ts.from_datetimes(moments)
+    t._nutation_angles_radians = iau2000b_radians(t)
+    geocentric = satellite.at(t)
+    lat, lon = wgs84.latlon_of(geocentric)
+    height_km = wgs84.height_of(geocentric).km
+    speed_kms = np.linalg.norm(geocentric.velocity.km_per_s, axis=0)
+
+    return [
+        {
+            "lat": round(float(lat.degrees[index]), 6),
+            "lon": round(float(lon.degrees[index]), 6),
+            "altitude_km": round(float(height_km[index]), 2),
+            "velocity_kms": round(float(speed_kms[index]), 3),
+            "sample_at": moment.isoformat(),
+            "source": "tle",
+        }
+        for index, moment in enumerate(moments)
+    ]
+
+
+def iss_next_orbit_track(satellite: EarthSatellite, step_seconds: int) -> dict[str, object]:
+    now = datetime.now(timezone.utc)
+    start = datetime.fromtimestamp(int(now.timestamp()) // step_seconds * step_seconds, tz=timezone.utc)
+    key = (iss_tle_epoch_key(satellite), start.isoformat(), step_seconds)
+    cached = iss_track_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # no_kozai is the mean motion in radians per minute.
+    period_minutes = 2.0 * np.pi / satellite.model.no_kozai
+    steps = int(np.ceil(period_minutes * 60.0 / step_seconds))
+    moments = [start + timedelta(seconds=index * step_seconds) for index in range(steps + 1)]
+    track = {
+        "step_sec": step_seconds,
+        "period_min": round(float(period_minutes), 2),
+        "points": [
+            {key: point[key] for key in ("lat", "lon", "altitude_km", "sample_at")}
+            for point in iss_positions(satellite, moments)
+        ],
+    }
+    iss_track_cache.set(key, track)
+    return track
+
+
+def iss_tle_epoch_key(satellite: EarthSatellite) -> str:
+    model = satellite.model
+    return f"{model.satnum}:{model.jdsatepoch + model.jdsatepochF:.8f}"
+
+
+def cached_iss_passes(
+    satellite: EarthSatellite,
+    lat: float,
+    lon: float,
+    tz: str,
+    local_date: date_cls,
+    local_tz: ZoneInfo,
+) -> list[dict[str, object]]:
+    # Passes for one local day, computed for the location's grid cell like the sky
+    # summary. Cached lists are shared between requests and must not be mutated.
+    cell_lat, cell_lon = snap_location(lat, lon, SKY_CACHE_GRID_DEG)
+    SNAP_ERROR.observe(distance_km(lat, lon, cell_lat, cell_lon))
+
+    key = ("find_events", iss_tle_epoch_key(satellite), cell_lat, cell_lon, tz, local_date.isoformat())
+    cached = iss_pass_cache.get(key)
+    if cached is not None:
+        return cached
+
+    location = wgs84.latlon(latitude_degrees=cell_lat, longitude_degrees=cell_lon)
+    local_start, local_end = local_day_bounds(local_date, local_tz)
+    t0 = ts.from_datetime(local_start.astimezone(timezone.utc))
+    t1 = ts.from_datetime(local_end.astimezone(timezone.utc))
+
+    with STAGE_LATENCY.labels("find_events").time():
+        events_t, events = satellite.find_events(location, t0, t1, altitude_degrees=ISS_PASS_MIN_ALTITUDE_DEG)
+
+    passes = build_iss_passes(
+        satellite=satellite,
+        observer=EARTH + location,
+        location=location,
+        event_times=events_t,
+        event_codes=events,
+        local_tz=local_tz,
+    )
+    iss_pass_cache.set(key, passes)
+    return passes
+
+
+def cached_iss_passes_many(satellite: EarthSatellite, requests: list[tuple]) -> list[list[dict[str, object]]]:
+    # Batch counterpart of cached_iss_passes(): requests are (lat, lon, tz, local_date,
+    # local_tz). Missing cells share one propagated track over the union of their days.
+    epoch_key = iss_tle_epoch_key(satellite)
+    keys = []
+    found: dict[tuple, list[dict[str, object]]] = {}
+    pending: dict[tuple, tuple] = {}
+
+    for lat, lon, tz, local_date, local_tz in requests:
+        cell_lat, cell_lon = snap_location(lat, lon, SKY_CACHE_GRID_DEG)
+        SNAP_ERROR.observe(distance_km(lat, lon, cell_lat, cell_lon))
+        key = ("grid", epoch_key, cell_lat, cell_lon, tz, local_date.isoformat())
+        keys.append(key)
+        if key in found or key in pending:
+            continue
+
+        cached = iss_pass_cache.get(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            pending[key] = (cell_lat, cell_lon, local_date, local_tz)
+
+    if pending:
+        for key, passes in zip(pending, build_iss_passes_many(satellite, list(pending.values()))):
+            iss_pass_cache.set(key, passes)
+            found[key] = passes
+
+    return [found[key] for key in keys]
+
+
+def build_iss_passes_many(satellite: EarthSatellite, cells: list[tuple]) -> list[list[dict[str, object]]]:
+    # Propagates the satellite once on a shared grid spanning every requested local day,
+    # then finds each observer's passes on its own slice of that geocentric track.
+    bounds = [local_day_bounds(local_date, local_tz) for _, _, local_date, local_tz in cells]
+    grid_start = min(start for start, _ in bounds).astimezone(timezone.utc)
+    grid_end = max(end for _, end in bounds).astimezone(timezone.utc)
+    grid = PassGrid(
+        ts,
+        EARTH,
+        SUN,
+        grid_start,
+        (grid_end - grid_start).total_seconds() / 3600.0,
+        ISS_TRACK_STEP_SECONDS,
+        ISS_TRACK_STEP_SECONDS,
+    )
+    r_itrs, valid = propagate_track(satellite.model, grid)
+
+    results = []
+    for (cell_lat, cell_lon, _, local_tz), (local_start, local_end) in zip(cells, bounds):
+        first = int((local_start - grid_start).total_seconds()) // ISS_TRACK_STEP_SECONDS
+        last = min(len(grid) - 1, -(-int((local_end - grid_start).total_seconds()) // ISS_TRACK_STEP_SECONDS))
+        observer = Observer(wgs84.latlon(latitude_degrees=cell_lat, longitude_degrees=cell_lon))
+        found = track_passes(
+            np.arange(first, last + 1),
+            r_itrs[first:last + 1],
+            valid[first:last + 1],
+            observer,
+            ISS_PASS_MIN_ALTITUDE_DEG,
+            (first, last),
+        )
+        results.append(
+            [
+                {
+                    "rise_at": item["rise_at"].astimezone(local_tz),
+                    "set_at": item["set_at"].astimezone(local_tz),
+                    "max_altitude_deg": float(item["max_altitude_deg"]),
+                    "direction_start": az_to_direction(float(item["rise_azimuth_deg"])),
+                    "direction_end": az_to_direction(float(item["set_azimuth_deg"])),
+                    "is_visible": bool(item["sunlit"]) and float(item["sun_altitude_deg"]) < -4.0,
+                }
+                for item in describe_passes(grid, observer, found)
+            ]
+        )
+
+    return results
+
+
+@app.get("/satellite-passes")
+def satellite_passes(
+    lat: float = Query(..., ge=-90.0, le=90.0),
+    lon: float = Query(..., ge=-180.0, le=180.0),
+    tz: str = Query(..., min_length=1),
+    hours: int = Query(12, ge=1, le=SATELLITE_PASSES_MAX_HOURS),
+    min_altitude: float = Query(10.0, ge=0.0, le=80.0),
+    visible_only: bool = Query(True),
+    name: str | None = Query(None, min_length=1, max_length=64),
+    limit: int = Query(50, ge=1, le=500),
+) -> dict[str, object]:
+    try:
+        local_tz = ZoneInfo(tz)
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(status_code=422, detail=f"Invalid timezone: {tz}") from exc
+
+    catalog = ensure_satellite_catalog()
+    if catalog is None:
+        logger.warning("Satellite passes unavailable: no TLE catalog ready.", extra={"satellite_error": satellite_state.get("error")})
+        return {"available": False}
+
+    if name:
+        catalog = catalog.matching(name)
+
+    local_start = datetime.now(local_tz).replace(microsecond=0)
+    location = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+
+    passes: list[dict[str, object]] = []
+    if len(catalog):
+        with STAGE_LATENCY.labels("satellite_passes").time():
+            grid = PassGrid(ts, EARTH, SUN, local_start, hours, SATELLITE_FINE_STEP_SECONDS, SATELLITE_COARSE_STEP_SECONDS)
+            passes = find_passes(catalog, grid, Observer(location), min_altitude_deg=min_altitude)
+
+    items = [format_satellite_pass(item, local_tz) for item in passes]
+    if visible_only:
+        items = [item for item in items if item["is_visible"]]
+
+    return {
+        "available": True,
+        "satellites": len(catalog),
+        "from": local_start.isoformat(),
+        "to": (local_start + timedelta(hours=hours)).isoformat(),
+        "step_sec": SATELLITE_FINE_STEP_SECONDS,
+        "total": len(items),
+        "passes": items[:limit],
+    }
+
+
+def format_satellite_pass(item: dict[str, object], local_tz: ZoneInfo) -> dict[str, object]:
+    rise_at = item["rise_at"].astimezone(local_tz)
+    set_at = item["set_at"].astimezone(local_tz)
+    return {
+        "name": item["name"],
+        "norad_id": item["norad_id"],
+        "rise_at": rise_at.isoformat(),
+        "culmination_at": item["culmination_at"].astimezone(local_tz).isoformat(),
+        "set_at": set_at.isoformat(),
+        "duration_sec": max(0, int(round((set_at - rise_at).total_seconds()))),
+        "max_altitude_deg": round(float(item["max_altitude_deg"]), 1),
+        "direction_start": az_to_direction(float(item["rise_azimuth_deg"])),
+        "direction_end": az_to_direction(float(item["set_azimuth_deg"])),
+        "is_visible": bool(item["sunlit"]) and float(item["sun_altitude_deg"]) < -4.0,
+    }
+
+
+def cached_sky_payloads(lat: float, lon: float, tz: str, local_date: date_cls, local_tz: ZoneInfo) -> tuple[dict, list[dict]]:
+    # Moon and planet payloads only depend on the location and the local date, so nearby
+    # requests share the result computed for their grid cell. Cached payloads are shared
+    # between requests and must not be mutated by callers.
+    cell_lat, cell_lon = snap_location(lat, lon, SKY_CACHE_GRID_DEG)
+    SNAP_ERROR.observe(distance_km(lat, lon, cell_lat, cell_lon))
+
+    key = (cell_lat, cell_lon, tz, local_date.isoformat())
+    cached = lookup_sky_payloads(key)
+    if cached is not None:
+        return cached
+
+    location = wgs84.latlon(latitude_degrees=cell_lat, longitude_degrees=cell_lon)
+    observer = EARTH + location
+    context = EphemerisContext(observer)
+
+    with STAGE_LATENCY.labels("build_moon_payload").time():
+        moon_payload = build_moon_payload(
+            observer=observer,
+            location=location,
+            local_date=local_date,
+            local_tz=local_tz,
+            context=context,
+        )
+    with STAGE_LATENCY.labels("build_planets_payload").time():
+        planets_payload = build_planets_payload(observer=observer, local_date=local_date, local_tz=local_tz, context=context)
+
+    sky_cache.set(key, (moon_payload, planets_payload))
+    return moon_payload, planets_payload
+
+
+def lookup_sky_payloads(key: tuple) -> tuple[dict, list[dict]] | None:
+    # Memory first, then tiles precomputed by the nightly warm-up.
+    cached = sky_cache.get(key)
+    if cached is not None or tile_store is None:
+        return cached
+
+    tile = tile_store.get(key)
+    if tile is not None:
+        sky_cache.set(key, tile)
+    return tile
+
+
+def cached_sky_payloads_many(requests: list[tuple]) -> list[tuple[dict, list[dict]]]:
+    # Batch counterpart of cached_sky_payloads(): requests are (lat, lon, tz, local_date,
+    # local_tz). Cells missing from the cache are computed together, once per cell.
+    keys = []
+    found: dict[tuple, tuple[dict, list[dict]]] = {}
+    pending: dict[tuple, tuple] = {}
+
+    for lat, lon, tz, local_date, local_tz in requests:
+        cell_lat, cell_lon = snap_location(lat, lon, SKY_CACHE_GRID_DEG)
+        SNAP_ERROR.observe(distance_km(lat, lon, cell_lat, cell_lon))
+        key = (cell_lat, cell_lon, tz, local_date.isoformat())
+        keys.append(key)
+        if key in found or key in pending:
+            continue
+
+        cached = lookup_sky_payloads(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            pending[key] = (cell_lat, cell_lon, local_date, local_tz)
+
+    if pending:
+        for key, payloads in zip(pending, build_sky_payloads_many(list(pending.values()))):
+            sky_cache.set(key, payloads)
+            found[key] = payloads
+
+    return [found[key] for key in keys]
+
+
+def build_sky_payloads_many(cells: list[tuple]) -> list[tuple[dict, list[dict]]]:
+    # Same payloads as build_moon_payload/build_planets_payload for every
+    # (lat, lon, local_date, local_tz) cell, but each body is evaluated once over a
+    # stacked time array whose n-th element belongs to the observer at lats/lons[n].
+    lats = np.array([cell[0] for cell in cells], dtype=float)
+    lons = np.array([cell[1] for cell in cells], dtype=float)
+    days = [(cell[2], cell[3]) for cell in cells]
+
+    t_noon = ts.from_datetimes([local_noon(local_date, local_tz).astimezone(timezone.utc) for local_date, local_tz in days])
+    phase_deg = np.atleast_1d(almanac.moon_phase(eph, t_noon).degrees % 360.0)
+    illumination = np.atleast_1d(almanac.fraction_illuminated(eph, "moon", t_noon) * 100.0)
+
+    rise_set = moon_rise_set_times_many(lats, lons, days)
+
+    hourly_times = [moon_hourly_local_times(local_date, local_tz) for local_date, local_tz in days]
+    position, offsets = stacked_observer_at(lats, lons, hourly_times)
+    moon_alt, _, _ = position.observe(MOON).apparent().altaz()
+    moon_alt_rows = np.split(np.asarray(moon_alt.degrees), offsets)
+
+    planet_times = [planet_sample_local_times(local_date, local_tz) for local_date, local_tz in days]
+    position, offsets = stacked_observer_at(lats, lons, planet_times)
+    sun_apparent = position.observe(SUN).apparent()
+    sun_alt, _, _ = sun_apparent.altaz()
+    sun_alt_rows = np.split(np.asarray(sun_alt.degrees), offsets)
+
+    planet_rows = []
+    for key, name, body in PLANETS:
+        planet_apparent = position.observe(body).apparent()
+        alt, az, _ = planet_apparent.altaz()
+        planet_rows.append(
+            (
+                key,
+                name,
+                np.split(np.asarray(alt.degrees), offsets),
+                np.split(np.asarray(az.degrees), offsets),
+                np.split(np.asarray(planet_apparent.separation_from(sun_apparent).degrees), offsets),
+            )
+        )
+
+    payloads = []
+    for index, (_, local_tz) in enumerate(days):
+        rise_local, set_local = rise_set[index]
+        moon_payload = format_moon_payload(
+            float(phase_deg[index]),
+            float(illumination[index]),
+            rise_local,
+            set_local,
+            format_altitude_hourly(hourly_times[index], moon_alt_rows[index]),
+        )
+
+        visible = []
+        for key, name, alt_rows, az_rows, elongation_rows in planet_rows:
+            entry = planet_visibility(
+                key=key,
+                name=name,
+                local_times=planet_times[index],
+                alt_deg=alt_rows[index],
+                az_deg=az_rows[index],
+                elongation_deg=elongation_rows[index],
+                sun_alt_deg=sun_alt_rows[index],
+            )
+            if entry is not None:
+                visible.append(entry)
+
+        payloads.append((moon_payload, best_visible_planets(visible)))
+
+    return payloads
+
+
+def stacked_observer_at(lats: np.ndarray, lons: np.ndarray, local_times: list[list[datetime]]):
+    # One observer position array for all locations; returns it with the split offsets
+    # that cut the flat results back into per-location rows.
+    counts = [len(times) for times in local_times]
+    t = ts.from_datetimes([dt.astimezone(timezone.utc) for times in local_times for dt in times])
+    share_nutation(t)
+    location = wgs84.latlon(
+        latitude_degrees=np.repeat(lats, counts),
+        longitude_degrees=np.repeat(lons, counts),
+    )
+    return (EARTH + location).at(t), np.cumsum(counts)[:-1]
+
+
+def moon_rise_set_times_many(lats: np.ndarray, lons: np.ndarray, days: list[tuple]) -> list[tuple[str | None, str | None]]:
+    bounds = [local_day_bounds(local_date, local_tz) for local_date, local_tz in days]
+    t0 = ts.from_datetimes([start.astimezone(timezone.utc) for start, _ in bounds])
+    t1 = ts.from_datetimes([end.astimezone(timezone.utc) for _, end in bounds])
+
+    def moon_is_up(t, owners: np.ndarray) -> np.ndarray:
+        # Same test as almanac.risings_and_settings(), for one observer per time.
+        t._nutation_angles_radians = iau2000b_radians(t)
+        location = wgs84.latlon(latitude_degrees=lats[owners], longitude_degrees=lons[owners])
+        return (EARTH + location).at(t).observe(MOON).apparent().altaz()[0].degrees > MOON_HORIZON_DEG
+
+    events = find_discrete_many(ts, np.atleast_1d(t0.tt), np.atleast_1d(t1.tt), moon_is_up, step_days=RISE_SET_STEP_DAYS)
+    return [
+        rise_set_from_events(ts.tt_jd(jd), values, local_tz)
+        for (jd, values), (_, local_tz) in zip(events, days)
+    ]
+
+
+def sample_sun_altitudes(lats: np.ndarray, lons: np.ndarray, zones: list[ZoneInfo]) -> tuple[list[datetime], np.ndarray]:
+    sample_locals = [datetime.now(local_tz) for local_tz in zones]
+    t = ts.from_datetimes([sample.astimezone(timezone.utc) for sample in sample_locals])
+    location = wgs84.latlon(latitude_degrees=lats, longitude_degrees=lons)
+    alt, _, _ = (EARTH + location).at(t).observe(SUN).apparent().altaz()
+    return sample_locals, np.atleast_1d(alt.degrees)
+
+
+def sky_cache_stats() -> dict[str, object]:
+    half_cell = SKY_CACHE_GRID_DEG / 2
+    return {
+        **sky_cache.stats(),
+        "grid_deg": SKY_CACHE_GRID_DEG,
+        # Worst case at the equator; cells shrink in longitude towards the poles.
+        "max_snap_error_km": round(distance_km(0.0, 0.0, half_cell, half_cell), 3),
+    }
+
+
+def build_moon_payload(
+    observer,
+    location,
+    local_date: date_cls,
+    local_tz: ZoneInfo,
+    context: EphemerisContext | None = None,
+) -> dict:
+    t_noon = ts.from_datetime(local_noon(local_date, local_tz).astimezone(timezone.utc))
 
     phase_deg = float(almanac.moon_phase(eph, t_noon).degrees % 360.0)
     illumination = float(almanac.fraction_illuminated(eph, "moon", t_noon) * 100.0)
 
     rise_local, set_local = moon_rise_set_times(location=location, local_date=local_date, local_tz=local_tz)
-    altitude_hourly = moon_altitude_hourly(observer=observer, local_date=local_date, local_tz=local_tz)
+    altitude_hourly = moon_altitude_hourly(observer=observer, local_date=local_date, local_tz=local_tz, context=context)
 
+    return format_moon_payload(phase_deg, illumination, rise_local, set_local, altitude_hourly)
+
+
+def format_moon_payload(
+    phase_deg: float,
+    illumination: float,
+    rise_local: str | None,
+    set_local: str | None,
+    altitude_hourly: list[dict],
+) -> dict:
     return {
         "phase_deg": round(phase_deg, 1),
         "phase_name": phase_name(phase_deg),
@@ -451,9 +1818,17 @@ def build_moon_payload(observer, location, local_date: date_cls, local_tz: ZoneI
     }
 
 
-def moon_rise_set_times(location, local_date: date_cls, local_tz: ZoneInfo) -> tuple[str | None, str | None]:
+def local_noon(local_date: date_cls, local_tz: ZoneInfo) -> datetime:
+    return datetime.combine(local_date, time_cls(12, 0), tzinfo=local_tz)
+
+
+def local_day_bounds(local_date: date_cls, local_tz: ZoneInfo) -> tuple[datetime, datetime]:
     start_local = datetime.combine(local_date, time_cls(0, 0), tzinfo=local_tz)
-    end_local = start_local + timedelta(days=1)
+    return start_local, start_local + timedelta(days=1)
+
+
+def moon_rise_set_times(location, local_date: date_cls, local_tz: ZoneInfo) -> tuple[str | None, str | None]:
+    start_local, end_local = local_day_bounds(local_date, local_tz)
 
     t0 = ts.from_datetime(start_local.astimezone(timezone.utc))
     t1 = ts.from_datetime(end_local.astimezone(timezone.utc))
@@ -461,6 +1836,10 @@ def moon_rise_set_times(location, local_date: date_cls, local_tz: ZoneInfo) -> t
     f = almanac.risings_and_settings(eph, MOON, location)
     times, events = almanac.find_discrete(t0, t1, f)
 
+    return rise_set_from_events(times, events, local_tz)
+
+
+def rise_set_from_events(times, events, local_tz: ZoneInfo) -> tuple[str | None, str | None]:
     moonrise = None
     moonset = None
 
@@ -475,15 +1854,26 @@ def moon_rise_set_times(location, local_date: date_cls, local_tz: ZoneInfo) -> t
     return moonrise, moonset
 
 
-def moon_altitude_hourly(observer, local_date: date_cls, local_tz: ZoneInfo) -> list[dict]:
-    start_local = datetime.combine(local_date, time_cls(0, 0), tzinfo=local_tz)
-    local_times = [start_local + timedelta(hours=offset) for offset in range(24)]
-    utc_times = [dt.astimezone(timezone.utc) for dt in local_times]
-    t = ts.from_datetimes(utc_times)
+def moon_hourly_local_times(local_date: date_cls, local_tz: ZoneInfo) -> list[datetime]:
+    start_local, _ = local_day_bounds(local_date, local_tz)
+    return [start_local + timedelta(hours=offset) for offset in range(24)]
+
+
+def moon_altitude_hourly(
+    observer,
+    local_date: date_cls,
+    local_tz: ZoneInfo,
+    context: EphemerisContext | None = None,
+) -> list[dict]:
+    context = context or EphemerisContext(observer)
+    local_times = moon_hourly_local_times(local_date, local_tz)
+    t = ts.from_datetimes([dt.astimezone(timezone.utc) for dt in local_times])
+
+    alt, _, _ = context.apparent(MOON, t).altaz()
+    return format_altitude_hourly(local_times, np.asarray(alt.degrees))
 
-    alt, _, _ = observer.at(t).observe(MOON).apparent().altaz()
-    alt_deg = np.asarray(alt.degrees)
 
+def format_altitude_hourly(local_times: list[datetime], alt_deg: np.ndarray) -> list[dict]:
     return [
         {
             "local_time": local_times[idx].strftime("%H:%M"),
@@ -493,7 +1883,7 @@ def moon_altitude_hourly(observer, local_date: date_cls, local_tz: ZoneInfo) ->
     ]
 
 
-def build_planets_payload(observer, local_date: date_cls, local_tz: ZoneInfo) -> list[dict]:
+def planet_sample_local_times(local_date: date_cls, local_tz: ZoneInfo) -> list[datetime]:
     start_local = datetime.combine(local_date, time_cls(18, 0), tzinfo=local_tz)
     end_local = datetime.combine(local_date + timedelta(days=1), time_cls(3, 0), tzinfo=local_tz)
 
@@ -502,119 +1892,153 @@ def build_planets_payload(observer, local_date: date_cls, local_tz: ZoneInfo) ->
     while current <= end_local:
         local_times.append(current)
         current += timedelta(minutes=10)
+    return local_times
 
-    utc_times = [dt.astimezone(timezone.utc) for dt in local_times]
-    t = ts.from_datetimes(utc_times)
 
-    sun_apparent = observer.at(t).observe(SUN).apparent()
+def build_planets_payload(
+    observer,
+    local_date: date_cls,
+    local_tz: ZoneInfo,
+    context: EphemerisContext | None = None,
+) -> list[dict]:
+    context = context or EphemerisContext(observer)
+    local_times = planet_sample_local_times(local_date, local_tz)
+    t = ts.from_datetimes([dt.astimezone(timezone.utc) for dt in local_times])
+
+    sun_apparent = context.apparent(SUN, t)
     sun_alt, _, _ = sun_apparent.altaz()
     sun_alt_deg = np.asarray(sun_alt.degrees)
 
     visible = []
 
     for key, name, body in PLANETS:
-        planet_apparent = observer.at(t).observe(body).apparent()
+        planet_apparent = context.apparent(body, t)
         alt, az, _ = planet_apparent.altaz()
-        alt_deg = np.asarray(alt.degrees)
-        az_deg = np.asarray(az.degrees)
-        elongation_deg = np.asarray(planet_apparent.separation_from(sun_apparent).degrees)
+        entry = planet_visibility(
+            key=key,
+            name=name,
+            local_times=local_times,
+            alt_deg=np.asarray(alt.degrees),
+            az_deg=np.asarray(az.degrees),
+            elongation_deg=np.asarray(planet_apparent.separation_from(sun_apparent).degrees),
+            sun_alt_deg=sun_alt_deg,
+        )
+        if entry is not None:
+            visible.append(entry)
+
+    return best_visible_planets(visible)
+
+
+def planet_visibility(
+    key: str,
+    name: str,
+    local_times: list[datetime],
+    alt_deg: np.ndarray,
+    az_deg: np.ndarray,
+    elongation_deg: np.ndarray,
+    sun_alt_deg: np.ndarray,
+) -> dict | None:
+    dark_mask = (alt_deg >= 10.0) & (sun_alt_deg < -6.0)
+    fallback_mask = alt_deg >= 10.0
+    mask = dark_mask if np.any(dark_mask) else fallback_mask
+
+    if not np.any(mask):
+        return None
 
-        dark_mask = (alt_deg >= 10.0) & (sun_alt_deg < -6.0)
-        fallback_mask = alt_deg >= 10.0
-        mask = dark_mask if np.any(dark_mask) else fallback_mask
+    indices = np.where(mask)[0]
+    max_idx = int(indices[np.argmax(alt_deg[indices])])
+    segment = segment_containing_index(indices, max_idx)
 
-        if not np.any(mask):
-            continue
+    start_idx = int(segment[0])
+    end_idx = int(segment[-1])
 
-        indices = np.where(mask)[0]
-        max_idx = int(indices[np.argmax(alt_deg[indices])])
-        segment = segment_containing_index(indices, max_idx)
-
-        start_idx = int(segment[0])
-        end_idx = int(segment[-1])
-
-        alt_max = float(np.max(alt_deg[segment]))
-        az_at_best = float(az_deg[max_idx] % 360.0)
-        elongation_at_best = clamp_elongation_deg(float(elongation_deg[max_idx]))
-
-        visible.append(
-            {
-                "key": key,
-                "name": name,
-                "best_from": local_times[start_idx].strftime("%H:%M"),
-                "best_to": local_times[end_idx].strftime("%H:%M"),
-                "direction": az_to_direction(az_at_best),
-                "alt_max_deg": round(alt_max, 1),
-                "az_at_best_deg": round(az_at_best, 1),
-                "elongation_deg": round(elongation_at_best, 1),
-                "is_low": alt_max < 15.0,
-            }
-        )
+    alt_max = float(np.max(alt_deg[segment]))
+    az_at_best = float(az_deg[max_idx] % 360.0)
+    elongation_at_best = clamp_elongation_deg(float(elongation_deg[max_idx]))
 
+    return {
+        "key": key,
+        "name": name,
+        "best_from": local_times[start_idx].strftime("%H:%M"),
+        "best_to": local_times[end_idx].strftime("%H:%M"),
+        "direction": az_to_direction(az_at_best),
+        "alt_max_deg": round(alt_max, 1),
+        "az_at_best_deg": round(az_at_best, 1),
+        "elongation_deg": round(elongation_at_best, 1),
+        "is_low": alt_max < 15.0,
+    }
+
+
+def best_visible_planets(visible: list[dict]) -> list[dict]:
     visible.sort(key=lambda item: item["alt_max_deg"], reverse=True)
     return visible[:3]
 
 
 def ensure_iss_satellite() -> EarthSatellite | None:
+    # Stale-while-revalidate: whatever TLE is loaded is served immediately. A missing or
+    # expired one only triggers a background refresh, deduplicated and backed off by
+    # iss_refresher, so request handlers never wait on the remote feed.
     satellite = iss_state.get("satellite")
-    fetched_at = iss_state.get("fetched_at")
+    if not isinstance(satellite, EarthSatellite):
+        cached_payload = load_cached_iss_tle()
+        if cached_payload is not None:
+            set_iss_satellite(cached_payload, source="cache", error=iss_state.get("error"))
+            satellite = iss_state.get("satellite")
 
-    if isinstance(satellite, EarthSatellite):
-        if isinstance(fetched_at, str):
-            try:
-                fetched_dt = datetime.fromisoformat(fetched_at)
-            except ValueError:
-                fetched_dt = None
-            if fetched_dt is not None and datetime.now(timezone.utc) - fetched_dt < timedelta(hours=ISS_TLE_REFRESH_HOURS):
-                return satellite
-        else:
-            return satellite
+    if not isinstance(satellite, EarthSatellite) or iss_tle_is_stale():
+        iss_refresher.trigger()
 
-    refresh_iss_tle_cache()
-    satellite = iss_state.get("satellite")
     return satellite if isinstance(satellite, EarthSatellite) else None
 
 
+def iss_tle_is_stale() -> bool:
+    age = iss_tle_age_seconds()
+    return age is None or age >= ISS_TLE_REFRESH_HOURS * 3600
+
+
 def refresh_iss_tle_cache() -> None:
     cached_payload = load_cached_iss_tle()
 
     try:
-        remote_payload = fetch_remote_iss_tle()
-    except Exception as exc:  # pragma: no cover
-        logger.warning("ISS TLE refresh failed; falling back to cache if available.", exc_info=exc)
-        if cached_payload is not None:
+        remote_payload = fetch_remote_iss_tle(cached_payload)
+    except Exception as exc:
+        if iss_state.get("satellite") is None and cached_payload is not None:
             set_iss_satellite(cached_payload, source="cache", error=f"remote_fetch_failed:{exc}")
             logger.info("ISS TLE loaded from local cache.")
-            return
-
-        iss_state.update({
-            "satellite": None,
-            "source": None,
-            "fetched_at": None,
-            "error": f"remote_fetch_failed:{exc}",
-        })
-        return
+        else:
+            iss_state["error"] = f"remote_fetch_failed:{exc}"
+        raise
 
     save_cached_iss_tle(remote_payload)
     set_iss_satellite(remote_payload, source="remote", error=None)
     logger.info("ISS TLE refreshed from remote source.")
 
 
-def fetch_remote_iss_tle() -> dict[str, str]:
-    request = urllib_request.Request(
+def fetch_remote_iss_tle(cached_payload: dict[str, str] | None = None) -> dict[str, str]:
+    # Conditional GET with the validators saved next to the cached TLE; a 304 keeps the
+    # cached lines and only renews fetched_at.
+    validators = cached_payload or {}
+    response = conditional_get(
         ISS_TLE_URL,
-        headers={"User-Agent": "astrokomunita-sky/1.1"},
-        method="GET",
+        etag=validators.get("etag"),
+        last_modified=validators.get("last_modified"),
+        timeout=10,
     )
 
-    with urllib_request.urlopen(request, timeout=10) as response:
-        body = response.read().decode("utf-8", errors="replace")
-
-    payload = parse_iss_tle_payload(body)
-    if payload is None:
-        raise RuntimeError("ISS TLE entry not found in remote feed.")
-
-    payload["fetched_at"] = datetime.now(timezone.utc).isoformat()
+    if response.body is None:
+        if cached_payload is None:
+            raise RuntimeError("ISS TLE feed answered 304 without a cached copy.")
+        payload = dict(cached_payload)
+    else:
+        payload = parse_iss_tle_payload(response.body)
+        if payload is None:
+            raise RuntimeError("ISS TLE entry not found in remote feed.")
+
+    payload.update({
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "etag": response.etag or "",
+        "last_modified": response.last_modified or "",
+    })
     return payload
 
 
@@ -667,6 +2091,8 @@ def load_cached_iss_tle() -> dict[str, str] | None:
         "line1": line1,
         "line2": line2,
         "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+        "etag": str(payload.get("etag") or ""),
+        "last_modified": str(payload.get("last_modified") or ""),
     }
 
 
@@ -680,6 +2106,114 @@ def set_iss_satellite(payload: dict[str, str], source: str, error: str | None) -
     })
 
 
+def ensure_satellite_catalog() -> SatelliteCatalog | None:
+    # Same stale-while-revalidate scheme as ensure_iss_satellite(): the loaded catalog is
+    # served as is and a missing or expired one only triggers satellite_refresher.
+    catalog = satellite_state.get("catalog")
+    if not isinstance(catalog, SatelliteCatalog):
+        cached_payload = load_cached_satellite_catalog()
+        if cached_payload is not None:
+            set_satellite_catalog(cached_payload, source="cache", error=satellite_state.get("error"))
+            catalog = satellite_state.get("catalog")
+
+    if not isinstance(catalog, SatelliteCatalog) or satellite_catalog_is_stale():
+        satellite_refresher.trigger()
+
+    return catalog if isinstance(catalog, SatelliteCatalog) else None
+
+
+def satellite_catalog_is_stale() -> bool:
+    age = satellite_catalog_age_seconds()
+    return age is None or age >= SATELLITE_TLE_REFRESH_HOURS * 3600
+
+
+def refresh_satellite_catalog() -> None:
+    cached_payload = load_cached_satellite_catalog()
+
+    try:
+        remote_payload = fetch_remote_satellite_catalog(cached_payload)
+    except Exception as exc:
+        if satellite_state.get("catalog") is None and cached_payload is not None:
+            set_satellite_catalog(cached_payload, source="cache", error=f"remote_fetch_failed:{exc}")
+            logger.info("Satellite catalog loaded from local cache.")
+        else:
+            satellite_state["error"] = f"remote_fetch_failed:{exc}"
+        raise
+
+    save_cached_satellite_catalog(remote_payload)
+    set_satellite_catalog(remote_payload, source="remote", error=None)
+    logger.info("Satellite catalog refreshed from remote source.", extra={"satellites": len(satellite_state["catalog"])})
+
+
+def fetch_remote_satellite_catalog(cached_payload: dict[str, object] | None = None) -> dict[str, object]:
+    # One conditional GET per group with the validators cached for that group; a 304
+    # reuses the group's cached TLE text.
+    cached_feeds = (cached_payload or {}).get("feeds") or {}
+    feeds: dict[str, dict[str, str]] = {}
+    for group in SATELLITE_TLE_GROUPS:
+        cached_feed = cached_feeds.get(group) or {}
+        response = conditional_get(
+            SATELLITE_TLE_URL.format(group=group),
+            etag=cached_feed.get("etag"),
+            last_modified=cached_feed.get("last_modified"),
+            timeout=10,
+        )
+        if response.body is None:
+            if not cached_feed.get("tle"):
+                raise RuntimeError(f"Satellite feed {group} answered 304 without a cached copy.")
+            body = cached_feed["tle"]
+        else:
+            body = response.body
+        feeds[group] = {"tle": body, "etag": response.etag or "", "last_modified": response.last_modified or ""}
+
+    tle = "\n".join(feed["tle"] for feed in feeds.values())
+    if not parse_tle_catalog(tle):
+        raise RuntimeError("No TLE entries found in remote feeds.")
+
+    return {
+        "groups": list(SATELLITE_TLE_GROUPS),
+        "feeds": feeds,
+        "tle": tle,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def save_cached_satellite_catalog(payload: dict[str, object]) -> None:
+    SATELLITE_CATALOG_CACHE_PATH.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def load_cached_satellite_catalog() -> dict[str, object] | None:
+    if not SATELLITE_CATALOG_CACHE_PATH.exists():
+        return None
+
+    try:
+        payload = json.loads(SATELLITE_CATALOG_CACHE_PATH.read_text(encoding="utf-8"))
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Failed to read cached satellite catalog.", exc_info=exc)
+        return None
+
+    if not isinstance(payload, dict) or not str(payload.get("tle") or "").strip():
+        return None
+
+    feeds = payload.get("feeds")
+    return {
+        "groups": payload.get("groups") or [],
+        "feeds": feeds if isinstance(feeds, dict) else {},
+        "tle": str(payload["tle"]),
+        "fetched_at": str(payload.get("fetched_at") or "").strip() or datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def set_satellite_catalog(payload: dict[str, object], source: str, error: str | None) -> None:
+    catalog = SatelliteCatalog(parse_tle_catalog(str(payload["tle"])))
+    satellite_state.update({
+        "catalog": catalog,
+        "source": source,
+        "fetched_at": payload.get("fetched_at"),
+        "error": error,
+    })
+
+
 def build_iss_passes(
     satellite: EarthSatellite,
     observer,
@@ -688,55 +2222,48 @@ def build_iss_passes(
     event_codes,
     local_tz: ZoneInfo,
 ) -> list[dict[str, object]]:
-    passes: list[dict[str, object]] = []
-    current: dict[str, object] = {}
-
-    for event_time, event_code in zip(event_times, event_codes):
-        dt_utc = event_time.utc_datetime().replace(tzinfo=timezone.utc)
-        dt_local = dt_utc.astimezone(local_tz)
-
-        if int(event_code) == 0:
-            current = {"rise_at": dt_local, "rise_time": event_time}
-            continue
-
-        if int(event_code) == 1 and current:
-            current["culmination_at"] = dt_local
-            current["culmination_time"] = event_time
-            continue
-
-        if int(event_code) != 2 or not current:
-            continue
-
-        rise_at = current.get("rise_at")
-        culmination_at = current.get("culmination_at")
-        rise_time = current.get("rise_time")
-        culmination_time = current.get("culmination_time")
-        if not isinstance(rise_at, datetime) or not isinstance(culmination_at, datetime):
-            current = {}
-            continue
-        if rise_time is None or culmination_time is None:
-            current = {}
-            continue
-
-        set_at = dt_local
-        topocentric_rise = (satellite - location).at(rise_time)
-        topocentric_culm = (satellite - location).at(culmination_time)
-        topocentric_set = (satellite - location).at(event_time)
-        rise_alt, rise_az, _ = topocentric_rise.altaz()
-        culm_alt, _, _ = topocentric_culm.altaz()
-        _, set_az, _ = topocentric_set.altaz()
-        sun_alt, _, _ = observer.at(culmination_time).observe(SUN).apparent().altaz()
-        sunlit = bool(satellite.at(culmination_time).is_sunlit(eph))
+    # Pair up rise/culmination/set events first, then evaluate the satellite, the Sun and
+    # the shadow test once over all complete passes instead of per pass.
+    complete: list[tuple[int, int, int]] = []
+    rise_idx: int | None = None
+    culmination_idx: int | None = None
+
+    for index, event_code in enumerate(event_codes):
+        code = int(event_code)
+        if code == 0:
+            rise_idx, culmination_idx = index, None
+        elif code == 1 and rise_idx is not None:
+            culmination_idx = index
+        elif code == 2 and rise_idx is not None:
+            if culmination_idx is not None:
+                complete.append((rise_idx, culmination_idx, index))
+            rise_idx, culmination_idx = None, None
+
+    if not complete:
+        return []
+
+    rise_times = event_times[[item[0] for item in complete]]
+    culmination_times = event_times[[item[1] for item in complete]]
+    set_times = event_times[[item[2] for item in complete]]
+
+    topocentric = satellite - location
+    _, rise_az, _ = topocentric.at(rise_times).altaz()
+    culm_alt, _, _ = topocentric.at(culmination_times).altaz()
+    _, set_az, _ = topocentric.at(set_times).altaz()
+    sun_alt, _, _ = observer.at(culmination_times).observe(SUN).apparent().altaz()
+    sunlit = satellite.at(culmination_times).is_sunlit(eph)
 
+    passes: list[dict[str, object]] = []
+    for position, (rise_time, set_time) in enumerate(zip(rise_times.utc_datetime(), set_times.utc_datetime())):
+        max_altitude = float(culm_alt.degrees[position])
         passes.append({
-            "rise_at": rise_at,
-            "set_at": set_at,
-            "max_altitude_deg": float(culm_alt.degrees),
-            "direction_start": az_to_direction(float(rise_az.degrees)),
-            "direction_end": az_to_direction(float(set_az.degrees)),
-            "is_visible": sunlit and float(sun_alt.degrees) < -4.0 and float(culm_alt.degrees) >= 10.0,
+            "rise_at": rise_time.astimezone(local_tz),
+            "set_at": set_time.astimezone(local_tz),
+            "max_altitude_deg": max_altitude,
+            "direction_start": az_to_direction(float(rise_az.degrees[position])),
+            "direction_end": az_to_direction(float(set_az.degrees[position])),
+            "is_visible": bool(sunlit[position]) and float(sun_alt.degrees[position]) < -4.0 and max_altitude >= 10.0,
         })
-        current = {}
 
     return passes
 
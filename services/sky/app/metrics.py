@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from prometheus_client import CollectorRegistry, disable_created_metrics
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Finer at the low end than the client default: cache hits and tile lookups finish in well under 5 ms.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger("uvicorn.error")
+
+# The *_created series double the exposition size and nothing here alerts on them.
+disable_created_metrics()
+
+
+class CallbackCollector:
+    # Evaluated only at scrape time, so state that already lives in the module dicts
+    # (translator readiness, TLE age) costs nothing on the request path.
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...],
+        read: Callable[[], dict[tuple[str, ...], float | None]],
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.read = read
+        self.kind = kind
+
+    def collect(self):
+        family_type = CounterMetricFamily if self.kind == "counter" else GaugeMetricFamily
+        family = family_type(self.name, self.help_text, labels=self.labelnames)
+        try:
+            values = self.read()
+        except Exception:
+            logger.exception("Metric callback %s failed.", self.name)
+            return
+        for labels, value in sorted(values.items()):
+            if value is not None:
+                family.add_metric(list(labels), value)
+        yield family
+
+
+def gauge_callback(
+    registry: CollectorRegistry,
+    name: str,
+    help_text: str,
+    labelnames: tuple[str, ...],
+    read: Callable[[], dict[tuple[str, ...], float | None]],
+    kind: str = "gauge",
+) -> CallbackCollector:
+    collector = CallbackCollector(name, help_text, labelnames, read, kind)
+    registry.register(collector)
+    return collector
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
+from skyfield.framelib import itrs
+from skyfield.functions import mxm
+from skyfield.nutationlib import iau2000b_radians
+from skyfield.sgp4lib import TEME
+
+EARTH_RADIUS_KM = 6378.137
+EARTH_ROTATION_RAD_S = 7.2921159e-5
+# Slack for geodetic vs geocentric latitude and observer height in the screening cap.
+SCREEN_MARGIN_RAD = 0.01
+# Sub-step offsets searched for the culmination between the samples around the peak.
+PEAK_OFFSETS = np.linspace(-1.0, 1.0, 61)
+
+
+def parse_tle_catalog(raw_text: str) -> list[dict[str, str]]:
+    # Three-line (name, line 1, line 2) entries; later duplicates of a NORAD id win,
+    # so overlapping groups (stations + visual) collapse to one satellite.
+    lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
+    entries: dict[str, dict[str, str]] = {}
+
+    for index in range(len(lines) - 2):
+        name, line1, line2 = lines[index], lines[index + 1], lines[index + 2]
+        if name.startswith(("1 ", "2 ")) or not line1.startswith("1 ") or not line2.startswith("2 "):
+            continue
+        entries[line1[2:7].strip()] = {"name": name, "line1": line1, "line2": line2}
+
+    return list(entries.values())
+
+
+class SatelliteCatalog:
+    def __init__(self, entries: list[dict[str, str]]) -> None:
+        self.entries: list[dict[str, str]] = []
+        satrecs = []
+        for entry in entries:
+            try:
+                satrec = Satrec.twoline2rv(entry["line1"], entry["line2"])
+            except Exception:
+                continue
+            self.entries.append(entry)
+            satrecs.append(satrec)
+
+        self.satrecs = satrecs
+        self.norad_ids = [int(satrec.satnum) for satrec in satrecs]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def matching(self, name: str) -> "SatelliteCatalog":
+        needle = name.strip().upper()
+        return SatelliteCatalog([entry for entry in self.entries if needle in entry["name"].upper()])
+
+
+class PassGrid:
+    # Shared time grid for one search window: UTC Julian dates for sgp4, TEME->ITRS
+    # rotations and the Sun's geocentric direction, computed once for every satellite.
+
+    def __init__(self, ts, earth, sun, start: datetime, hours: float, fine_step_s: int, coarse_step_s: int) -> None:
+        self.start = start.astimezone(timezone.utc)
+        self.fine_step_s = int(fine_step_s)
+        self.ratio = max(1, int(coarse_step_s) // self.fine_step_s)
+        self.coarse_step_s = self.ratio * self.fine_step_s
+
+        self.offsets_s = np.arange(0, int(hours * 3600) + 1, self.fine_step_s, dtype=float)
+        s = self.start
+        jd0, fr0 = jday(s.year, s.month, s.day, s.hour, s.minute, s.second + s.microsecond / 1e6)
+        self.jd = np.full(len(self.offsets_s), jd0)
+        self.fr = fr0 + self.offsets_s / 86400.0
+
+        # Coarse screening samples; the last fine sample is always included so every
+        # fine sample is within half a coarse step of one of them.
+        coarse = np.arange(0, len(self.offsets_s), self.ratio)
+        if coarse[-1] != len(self.offsets_s) - 1:
+            coarse = np.append(coarse, len(self.offsets_s) - 1)
+        self.coarse_indices = coarse
+
+        self.t = ts.utc(s.year, s.month, s.day, s.hour, s.minute, s.second + s.microsecond / 1e6 + self.offsets_s)
+        # As in skyfield's almanac searches: IAU 2000B is within a milliarcsecond of 2000A
+        # and far cheaper over thousands of grid times.
+        self.t._nutation_angles_radians = iau2000b_radians(self.t)
+        self.teme_to_itrs = mxm(itrs.rotation_at(self.t), np.swapaxes(TEME.rotation_at(self.t), 0, 1))
+
+        sun_itrs = earth.at(self.t).observe(sun).apparent().frame_xyz(itrs).km
+        self.sun_unit = sun_itrs / np.linalg.norm(sun_itrs, axis=0)
+
+    def __len__(self) -> int:
+        return len(self.offsets_s)
+
+    def time_at(self, index: float) -> datetime:
+        return self.start + timedelta(seconds=float(index) * self.fine_step_s)
+
+
+class Observer:
+    def __init__(self, location) -> None:
+        lat = np.radians(location.latitude.degrees)
+        lon = np.radians(location.longitude.degrees)
+        self.itrs_km = np.asarray(location.itrs_xyz.km, dtype=float)
+        self.unit = self.itrs_km / np.linalg.norm(self.itrs_km)
+        self.up = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+        self.east = np.array([-np.sin(lon), np.cos(lon), 0.0])
+        self.north = np.array([-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)])
+
+
+def screen_candidates(
+    catalog: SatelliteCatalog,
+    grid: PassGrid,
+    observer: Observer,
+    min_altitude_deg: float,
+    chunk_size: int = 2000,
+) -> dict[int, np.ndarray]:
+    # Coarse pass over every satellite. A coarse sample is kept when the satellite's
+    # geocentric angle from the observer is inside the cap it can be seen from at
+    # min_altitude, widened by how far it can move in half a coarse step. Any visible
+    # instant lies within half a step of a kept sample, so no pass is missed.
+    coarse = grid.coarse_indices
+    jd = grid.jd[coarse]
+    fr = grid.fr[coarse]
+    rotation = grid.teme_to_itrs[:, :, coarse]
+    elevation = np.radians(min_altitude_deg)
+    half_step = grid.coarse_step_s / 2.0
+    candidates: dict[int, np.ndarray] = {}
+
+    for start in range(0, len(catalog), chunk_size):
+        chunk = SatrecArray(catalog.satrecs[start:start + chunk_size])
+        error, r, v = chunk.sgp4(jd, fr)
+        r_itrs = np.einsum("ijn,snj->sni", rotation, r)
+
+        radius = np.linalg.norm(r_itrs, axis=2)
+        angle = np.arccos(np.clip(r_itrs @ observer.unit / radius, -1.0, 1.0))
+        cap = np.arccos(np.clip(EARTH_RADIUS_KM * np.cos(elevation) / radius, -1.0, 1.0)) - elevation
+        rate = np.linalg.norm(v, axis=2) / radius + EARTH_ROTATION_RAD_S
+        keep = (angle < cap + rate * half_step + SCREEN_MARGIN_RAD) & (error == 0)
+
+        for offset in np.flatnonzero(keep.any(axis=1)):
+            candidates[start + int(offset)] = np.flatnonzero(keep[offset])
+
+    return candidates
+
+
+def find_passes(
+    catalog: SatelliteCatalog,
+    grid: PassGrid,
+    observer: Observer,
+    min_altitude_deg: float = 10.0,
+) -> list[dict[str, object]]:
+    # One dict per complete pass above min_altitude inside the grid window.
+    candidates = screen_candidates(catalog, grid, observer, min_altitude_deg)
+    half_window = grid.ratio // 2 + 1
+    window = np.arange(-half_window, half_window + 1)
+    found: list[dict[str, object]] = []
+
+    for satellite, coarse_indices in candidates.items():
+        fine = np.unique((grid.coarse_indices[coarse_indices][:, None] + window[None, :]).ravel())
+        fine = fine[(fine >= 0) & (fine < len(grid))]
+
+        error, r, _ = catalog.satrecs[satellite].sgp4_array(grid.jd[fine], grid.fr[fine])
+        r_itrs = np.einsum("ijn,nj->ni", grid.teme_to_itrs[:, :, fine], r)
+        for item in track_passes(fine, r_itrs, error == 0, observer, min_altitude_deg, (0, len(grid) - 1)):
+            item["satellite"] = satellite
+            found.append(item)
+
+    passes = describe_passes(grid, observer, found)
+    for item in passes:
+        satellite = item["satellite"]
+        item["name"] = catalog.entries[satellite]["name"]
+        item["norad_id"] = catalog.norad_ids[satellite]
+
+    passes.sort(key=lambda item: (item["rise_index"], item["norad_id"]))
+    return passes
+
+
+def propagate_track(satrec: Satrec, grid: PassGrid) -> tuple[np.ndarray, np.ndarray]:
+    # ITRS positions of one satellite over the whole grid, shared by every observer.
+    error, r, _ = satrec.sgp4_array(grid.jd, grid.fr)
+    return np.einsum("ijn,nj->ni", grid.teme_to_itrs, r), error == 0
+
+
+def track_passes(
+    fine: np.ndarray,
+    r_itrs: np.ndarray,
+    valid: np.ndarray,
+    observer: Observer,
+    min_altitude_deg: float,
+    bounds: tuple[int, int],
+) -> list[dict[str, object]]:
+    # Passes are runs of consecutive grid indices above the threshold. Passes already up
+    # at bounds[0] or still up at bounds[1] have no rise or set and are dropped. Rise and
+    # set are interpolated linearly to the threshold crossing and the culmination between
+    # the samples around the peak, whenever the neighbouring samples are on the track.
+    topocentric = r_itrs - observer.itrs_km
+    altitude = np.degrees(np.arcsin(topocentric @ observer.up / np.linalg.norm(topocentric, axis=1)))
+    above = (altitude >= min_altitude_deg) & valid
+    if not above.any():
+        return []
+
+    def adjacent(position: int, step: int) -> bool:
+        neighbour = position + step
+        return 0 <= neighbour < len(fine) and fine[neighbour] == fine[position] + step and bool(valid[neighbour])
+
+    positions = np.flatnonzero(above)
+    breaks = np.flatnonzero(np.diff(fine[positions]) != 1) + 1
+    passes = []
+
+    for run in np.split(positions, breaks):
+        first, last = int(run[0]), int(run[-1])
+        if fine[first] <= bounds[0] or fine[last] >= bounds[1]:
+            continue
+
+        rise = float(fine[first])
+        if adjacent(first, -1):
+            rise -= (altitude[first] - min_altitude_deg) / (altitude[first] - altitude[first - 1])
+
+        set_ = float(fine[last])
+        if adjacent(last, 1):
+            set_ += (altitude[last] - min_altitude_deg) / (altitude[last] - altitude[last + 1])
+
+        # The culmination is refined for all passes at once in describe_passes().
+        peak = int(run[np.argmax(altitude[run])])
+        refine = adjacent(peak, -1) and adjacent(peak, 1)
+        passes.append(
+            {
+                "rise_index": rise,
+                "set_index": set_,
+                "culmination_sample": int(fine[peak]),
+                "peak_vectors": topocentric[peak - 1:peak + 2] if refine else np.repeat(topocentric[peak][None, :], 3, axis=0),
+                "refine_peak": refine,
+                "rise_vector": topocentric[first],
+                "set_vector": topocentric[last],
+                "culmination_position": r_itrs[peak],
+            }
+        )
+
+    return passes
+
+
+def azimuth_deg(observer: Observer, topocentric: np.ndarray) -> np.ndarray:
+    return np.degrees(np.arctan2(topocentric @ observer.east, topocentric @ observer.north)) % 360.0
+
+
+def sunlit(positions_km: np.ndarray, sun_unit: np.ndarray) -> np.ndarray:
+    # Cylindrical Earth shadow: lit when on the Sun's side of the terminator plane or
+    # farther from the Earth-Sun axis than the Earth's radius.
+    along = np.einsum("ni,ni->n", positions_km, sun_unit)
+    off_axis = np.linalg.norm(positions_km - along[:, None] * sun_unit, axis=1)
+    return (along > 0) | (off_axis > EARTH_RADIUS_KM)
+
+
+def refine_culminations(observer: Observer, peak_vectors: np.ndarray, refine: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Near the zenith altitude changes too fast for a parabola through three samples, but
+    # the topocentric vector itself is smooth: interpolate it quadratically between the
+    # samples around each peak and take the highest point along the curve. Returns the
+    # offset from the peak sample in steps and the maximum altitude.
+    before, middle, after = peak_vectors[:, 0], peak_vectors[:, 1], peak_vectors[:, 2]
+    offsets = PEAK_OFFSETS[None, :, None]
+    curve = middle[:, None] + offsets * ((after - before) / 2.0)[:, None] + offsets**2 * ((after + before - 2.0 * middle) / 2.0)[:, None]
+    curve_sin = curve @ observer.up / np.linalg.norm(curve, axis=2)
+    best = np.argmax(curve_sin, axis=1)
+    offset = np.where(refine, PEAK_OFFSETS[best], 0.0)
+    peak_sin = np.where(refine, curve_sin[np.arange(len(best)), best], curve_sin[:, 0])
+    return offset, np.degrees(np.arcsin(np.clip(peak_sin, -1.0, 1.0)))
+
+
+def describe_passes(grid: PassGrid, observer: Observer, found: list[dict[str, object]]) -> list[dict[str, object]]:
+    # Pass-level geometry for all passes at once: culmination, azimuths, shadow test and
+    # Sun altitude.
+    if not found:
+        return []
+
+    samples = [item["culmination_sample"] for item in found]
+    offset, max_altitude = refine_culminations(
+        observer,
+        np.asarray([item["peak_vectors"] for item in found]),
+        np.asarray([item["refine_peak"] for item in found]),
+    )
+    sun_unit = grid.sun_unit[:, samples].T
+    rise_az = azimuth_deg(observer, np.asarray([item["rise_vector"] for item in found]))
+    set_az = azimuth_deg(observer, np.asarray([item["set_vector"] for item in found]))
+    lit = sunlit(np.asarray([item["culmination_position"] for item in found]), sun_unit)
+    sun_altitude = np.degrees(np.arcsin(sun_unit @ observer.up))
+
+    internal = {"peak_vectors", "refine_peak", "rise_vector", "set_vector", "culmination_position", "culmination_sample"}
+    passes = []
+    for position, item in enumerate(found):
+        culmination = samples[position] + float(offset[position])
+        described = {key: value for key, value in item.items() if key not in internal}
+        described.update(
+            {
+                "culmination_index": culmination,
+                "rise_at": grid.time_at(item["rise_index"]),
+                "culmination_at": grid.time_at(culmination),
+                "set_at": grid.time_at(item["set_index"]),
+                "max_altitude_deg": float(max_altitude[position]),
+                "rise_azimuth_deg": float(rise_az[position]),
+                "set_azimuth_deg": float(set_az[position]),
+                "sunlit": bool(lit[position]),
+                "sun_altitude_deg": float(sun_altitude[position]),
+            }
+        )
+        passes.append(described)
+
+    return passes
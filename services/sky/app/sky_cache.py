@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def snap_coordinate(value: float, grid_deg: float) -> float:
+    if grid_deg <= 0:
+        return float(value)
+    return round(round(float(value) / grid_deg) * grid_deg, 6)
+
+
+def snap_location(lat: float, lon: float, grid_deg: float) -> tuple[float, float]:
+    # Everyone inside one grid cell shares the payload computed for the cell centre.
+    snapped_lat = min(90.0, max(-90.0, snap_coordinate(lat, grid_deg)))
+    snapped_lon = snap_coordinate(lon, grid_deg)
+    if snapped_lon > 180.0:
+        snapped_lon -= 360.0
+    elif snapped_lon < -180.0:
+        snapped_lon += 360.0
+    return snapped_lat, snapped_lon
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class TTLCache:
+    # LRU bounded by entry count; entries older than ttl_seconds are treated as misses.
+    # max_entries <= 0 disables the cache entirely.
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self.enabled:
+            return None
+
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds and now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._expired += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_cls
+from datetime import datetime, time as time_cls, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+from zoneinfo import ZoneInfo
+
+from app.sky_cache import snap_location
+
+logger = logging.getLogger("uvicorn.error")
+
+TileKey = tuple[float, float, str, str]
+
+
+class TileLocation(NamedTuple):
+    name: str
+    lat: float
+    lon: float
+    tz: str
+    # Cities are wider than one grid cell; also warm this many rings of neighbours.
+    radius_cells: int = 1
+
+
+def load_tile_locations(path: Path) -> list[TileLocation]:
+    if not path.exists():
+        return []
+
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    locations = []
+    for item in raw.get("locations", []):
+        ZoneInfo(str(item["tz"]))
+        locations.append(
+            TileLocation(
+                name=str(item["name"]),
+                lat=float(item["lat"]),
+                lon=float(item["lon"]),
+                tz=str(item["tz"]),
+                radius_cells=max(0, int(item.get("radius_cells", 1))),
+            )
+        )
+    return locations
+
+
+class TileStore:
+    # Precomputed (moon, planets) payloads keyed like the sky-summary cache:
+    # (cell_lat, cell_lon, tz, date). Payloads are zlib-compressed JSON, so a day of
+    # tiles for a few dozen cells stays in the tens of kilobytes. Tile count and size are
+    # counted once at open and then kept up to date by put_many() and prune().
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tiles ("
+            "cell_lat REAL NOT NULL, cell_lon REAL NOT NULL, tz TEXT NOT NULL, date TEXT NOT NULL, "
+            "payload BLOB NOT NULL, computed_at REAL NOT NULL, "
+            "PRIMARY KEY (cell_lat, cell_lon, tz, date))"
+        )
+        self._db.commit()
+        self._tiles, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM tiles"
+        ).fetchone()
+
+    def get(self, key: TileKey) -> tuple[dict, list[dict]] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM tiles WHERE cell_lat = ? AND cell_lon = ? AND tz = ? AND date = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        moon_payload, planets_payload = json.loads(zlib.decompress(row[0]))
+        return moon_payload, planets_payload
+
+    def has(self, key: TileKey) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM tiles WHERE cell_lat = ? AND cell_lon = ? AND tz = ? AND date = ?",
+                key,
+            ).fetchone()
+        return row is not None
+
+    def put_many(self, items: list[tuple[TileKey, tuple[dict, list[dict]]]]) -> None:
+        now = time.time()
+        rows = [
+            (*key, zlib.compress(json.dumps(list(payloads), separators=(",", ":")).encode("utf-8")), now)
+            for key, payloads in items
+        ]
+        with self._lock:
+            for row in rows:
+                replaced = self._db.execute(
+                    "SELECT LENGTH(payload) FROM tiles WHERE cell_lat = ? AND cell_lon = ? AND tz = ? AND date = ?",
+                    row[:4],
+                ).fetchone()
+                if replaced is None:
+                    self._tiles += 1
+                else:
+                    self._bytes -= replaced[0]
+                self._bytes += len(row[4])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tiles (cell_lat, cell_lon, tz, date, payload, computed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
+
+    def prune(self, before: date_cls) -> int:
+        with self._lock:
+            deleted, deleted_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM tiles WHERE date < ?",
+                (before.isoformat(),),
+            ).fetchone()
+            self._db.execute("DELETE FROM tiles WHERE date < ?", (before.isoformat(),))
+            self._db.commit()
+            self._tiles -= deleted
+            self._bytes -= deleted_bytes
+        return deleted
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": str(self.path),
+                "tiles": self._tiles,
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class TileWarmer:
+    # Fills the store with today's and tomorrow's tiles for every configured location,
+    # then sleeps until shortly after the next local midnight among their timezones.
+    # Cells are computed in chunks through compute(), which takes
+    # (cell_lat, cell_lon, local_date, local_tz) tuples and returns payloads in order.
+
+    def __init__(
+        self,
+        store: TileStore,
+        locations: list[TileLocation],
+        compute: Callable[[list[tuple]], list[tuple[dict, list[dict]]]],
+        grid_deg: float,
+        workers: int = 2,
+        chunk_size: int = 16,
+        delay_seconds: float = 300.0,
+    ) -> None:
+        self.store = store
+        self.locations = locations
+        self.compute = compute
+        self.grid_deg = grid_deg
+        self.workers = max(1, int(workers))
+        self.chunk_size = max(1, int(chunk_size))
+        self.delay_seconds = max(0.0, float(delay_seconds))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._last_run: dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running or not self.locations:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sky-tile-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def warm_once(self) -> dict[str, Any]:
+        started_at = time.perf_counter()
+        run = {"started_at": datetime.now(timezone.utc).isoformat(), "error": None}
+        expected: dict[TileKey, tuple] = {}
+
+        for location in self.locations:
+            local_tz = ZoneInfo(location.tz)
+            today = datetime.now(local_tz).date()
+            for cell_lat, cell_lon in self.cells(location):
+                for local_date in (today, today + timedelta(days=1)):
+                    expected[(cell_lat, cell_lon, location.tz, local_date.isoformat())] = (cell_lat, cell_lon, local_date, local_tz)
+
+        pending = [(key, cell) for key, cell in expected.items() if not self.store.has(key)]
+        chunks = [pending[index:index + self.chunk_size] for index in range(0, len(pending), self.chunk_size)]
+        computed = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sky-tile") as pool:
+                for chunk, payloads in zip(chunks, pool.map(lambda part: self.compute([cell for _, cell in part]), chunks)):
+                    self.store.put_many([(key, payload) for (key, _), payload in zip(chunk, payloads)])
+                    computed += len(chunk)
+
+            oldest = min((cell[2] for cell in expected.values()), default=None)
+            if oldest is not None:
+                self.store.prune(oldest - timedelta(days=1))
+        except Exception as exc:  # pragma: no cover
+            logger.exception("Sky tile warm-up failed.")
+            run["error"] = str(exc)
+
+        stored = sum(1 for key in expected if self.store.has(key))
+        run.update(
+            {
+                "duration_ms": round((time.perf_counter() - started_at) * 1000, 2),
+                "tiles_expected": len(expected),
+                "tiles_computed": computed,
+                "tiles_reused": len(expected) - len(pending),
+                "coverage": round(stored / len(expected), 4) if expected else 0.0,
+            }
+        )
+        with self._lock:
+            self._last_run = run
+
+        logger.info(
+            "Sky tile warm-up finished.",
+            extra={key: run[key] for key in ("duration_ms", "tiles_expected", "tiles_computed", "coverage")},
+        )
+        return run
+
+    def cells(self, location: TileLocation) -> list[tuple[float, float]]:
+        radius = location.radius_cells if self.grid_deg > 0 else 0
+        cells = {
+            snap_location(location.lat + row * self.grid_deg, location.lon + column * self.grid_deg, self.grid_deg)
+            for row in range(-radius, radius + 1)
+            for column in range(-radius, radius + 1)
+        }
+        return sorted(cells)
+
+    def seconds_until_next_run(self) -> float:
+        now = datetime.now(timezone.utc)
+        upcoming = []
+        for tz in {location.tz for location in self.locations}:
+            local_tz = ZoneInfo(tz)
+            tomorrow = datetime.now(local_tz).date() + timedelta(days=1)
+            midnight = datetime.combine(tomorrow, time_cls(0, 0), tzinfo=local_tz)
+            upcoming.append((midnight - now).total_seconds() + self.delay_seconds)
+        return max(60.0, min(upcoming, default=86400.0))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            last_run = dict(self._last_run)
+        return {
+            "running": self.running,
+            "locations": len(self.locations),
+            "workers": self.workers,
+            "last_run": last_run or None,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.warm_once()
+            except Exception:  # pragma: no cover
+                logger.exception("Sky tile warm-up crashed.")
+            self._stop.wait(self.seconds_until_next_run())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from datetime import date as date_cls
+from zoneinfo import ZoneInfo
+
+from skyfield.api import wgs84
+
+from app import main
+from app.sky_cache import distance_km, snap_location
+
+# Measures how far snapped sky-summary payloads drift from the exact ones.
+#   python -m app.snap_error --grid 0.05 --samples 50
+
+DEFAULT_CENTERS = (
+    (48.1486, 17.1077, "Europe/Bratislava"),
+    (49.2231, 18.7394, "Europe/Bratislava"),
+    (48.7164, 21.2611, "Europe/Bratislava"),
+    (50.0755, 14.4378, "Europe/Prague"),
+)
+
+
+def exact_payloads(lat: float, lon: float, local_date: date_cls, local_tz: ZoneInfo) -> tuple[dict, list[dict]]:
+    location = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    observer = main.EARTH + location
+    moon = main.build_moon_payload(observer=observer, location=location, local_date=local_date, local_tz=local_tz)
+    planets = main.build_planets_payload(observer=observer, local_date=local_date, local_tz=local_tz)
+    return moon, planets
+
+
+def minutes_between(first: str | None, second: str | None) -> int | None:
+    if first is None or second is None:
+        return None if first == second else 24 * 60
+    h1, m1 = (int(part) for part in first.split(":"))
+    h2, m2 = (int(part) for part in second.split(":"))
+    delta = abs((h1 * 60 + m1) - (h2 * 60 + m2))
+    return min(delta, 24 * 60 - delta)
+
+
+def compare(exact: tuple[dict, list[dict]], snapped: tuple[dict, list[dict]]) -> dict[str, float]:
+    exact_moon, exact_planets = exact
+    snapped_moon, snapped_planets = snapped
+
+    altitude_deltas = [
+        abs(a["altitude_deg"] - b["altitude_deg"])
+        for a, b in zip(exact_moon["altitude_hourly"], snapped_moon["altitude_hourly"])
+    ]
+    rise_set = [
+        value
+        for value in (
+            minutes_between(exact_moon["rise_local"], snapped_moon["rise_local"]),
+            minutes_between(exact_moon["set_local"], snapped_moon["set_local"]),
+        )
+        if value is not None
+    ]
+
+    exact_by_key = {planet["key"]: planet for planet in exact_planets}
+    snapped_by_key = {planet["key"]: planet for planet in snapped_planets}
+    planet_alt = [
+        abs(exact_by_key[key]["alt_max_deg"] - snapped_by_key[key]["alt_max_deg"])
+        for key in exact_by_key.keys() & snapped_by_key.keys()
+    ]
+    window_minutes = [
+        max(
+            minutes_between(exact_by_key[key]["best_from"], snapped_by_key[key]["best_from"]) or 0,
+            minutes_between(exact_by_key[key]["best_to"], snapped_by_key[key]["best_to"]) or 0,
+        )
+        for key in exact_by_key.keys() & snapped_by_key.keys()
+    ]
+
+    return {
+        "moon_altitude_deg": max(altitude_deltas, default=0.0),
+        "moon_rise_set_minutes": max(rise_set, default=0),
+        "planet_alt_max_deg": max(planet_alt, default=0.0),
+        "planet_window_minutes": max(window_minutes, default=0),
+        "planet_set_changed": int(exact_by_key.keys() != snapped_by_key.keys()),
+    }
+
+
+def run(grid_deg: float, samples: int, local_date: date_cls, seed: int) -> dict[str, object]:
+    rng = random.Random(seed)
+    rows = []
+
+    for _ in range(samples):
+        center_lat, center_lon, tz = rng.choice(DEFAULT_CENTERS)
+        lat = center_lat + rng.uniform(-0.5, 0.5)
+        lon = center_lon + rng.uniform(-0.5, 0.5)
+        local_tz = ZoneInfo(tz)
+        cell_lat, cell_lon = snap_location(lat, lon, grid_deg)
+
+        row = compare(
+            exact_payloads(lat, lon, local_date, local_tz),
+            exact_payloads(cell_lat, cell_lon, local_date, local_tz),
+        )
+        row["snap_km"] = distance_km(lat, lon, cell_lat, cell_lon)
+        rows.append(row)
+
+    report: dict[str, object] = {"grid_deg": grid_deg, "samples": samples, "date": local_date.isoformat()}
+    for field in rows[0] if rows else ():
+        values = [row[field] for row in rows]
+        report[field] = {
+            "max": round(max(values), 3),
+            "mean": round(sum(values) / len(values), 3),
+        }
+    return report
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Measure the accuracy cost of sky-summary location snapping.")
+    parser.add_argument("--grid", type=float, default=main.SKY_CACHE_GRID_DEG)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--date", default=date_cls.today().isoformat())
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report = run(args.grid, max(1, args.samples), date_cls.fromisoformat(args.date), args.seed)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+# Lower value runs first; FIFO within a priority.
+PRIORITIES = {"interactive": 0, "background": 1}
+
+
+class TranslationQueueFull(Exception):
+    pass
+
+
+class TranslationQueueTimeout(Exception):
+    pass
+
+
+class TranslationJob:
+    def __init__(self, fn: Callable[[], Any], priority: str, enqueued_at: float) -> None:
+        self.fn = fn
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.started_at: float | None = None
+        self.future: Future = Future()
+
+
+class TranslationExecutor:
+    # Runs translation jobs on a fixed number of worker threads, so concurrent requests
+    # queue here instead of all entering CTranslate2 at once. The queue is bounded:
+    # submit() raises TranslationQueueFull once max_queue jobs are waiting, and run()
+    # withdraws a job that has not started within queue_timeout_seconds. A job that has
+    # started always runs to completion. Workers start on the first submit.
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        on_start: Callable[[str, float], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.queue_timeout_seconds = max(0.0, float(queue_timeout_seconds))
+        self.on_start = on_start
+        self.clock = clock
+        self._heap: list[tuple[int, int, TranslationJob]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._running = 0
+        self._submitted = dict.fromkeys(PRIORITIES, 0)
+        self._rejected = dict.fromkeys(PRIORITIES, 0)
+        self._timed_out = dict.fromkeys(PRIORITIES, 0)
+        self._cancelled = dict.fromkeys(PRIORITIES, 0)
+        self._completed = dict.fromkeys(PRIORITIES, 0)
+        self._wait_seconds = dict.fromkeys(PRIORITIES, 0.0)
+        self._max_wait_seconds = 0.0
+
+    def submit(self, fn: Callable[[], Any], priority: str = "interactive") -> TranslationJob:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown translation priority: {priority}")
+
+        with self._condition:
+            if len(self._heap) >= self.max_queue:
+                self._rejected[priority] += 1
+                raise TranslationQueueFull(f"Translation queue is full ({self.max_queue} waiting).")
+            job = TranslationJob(fn, priority, self.clock())
+            heapq.heappush(self._heap, (PRIORITIES[priority], next(self._sequence), job))
+            self._submitted[priority] += 1
+            self._ensure_workers()
+            self._condition.notify()
+        return job
+
+    async def run(self, fn: Callable[[], Any], priority: str = "interactive") -> Any:
+        job = self.submit(fn, priority)
+        result = asyncio.wrap_future(job.future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(result), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if self.withdraw(job):
+                raise TranslationQueueTimeout(
+                    f"Translation did not start within {self.queue_timeout_seconds:g}s."
+                ) from None
+        except asyncio.CancelledError:
+            # The caller went away (client disconnect, closed stream): a job that has not
+            # started yet must not occupy a worker for a result nobody reads.
+            self.withdraw(job, cancelled=True)
+            raise
+        return await result
+
+    def withdraw(self, job: TranslationJob, cancelled: bool = False) -> bool:
+        with self._condition:
+            for index, entry in enumerate(self._heap):
+                if entry[2] is job:
+                    self._heap.pop(index)
+                    heapq.heapify(self._heap)
+                    (self._cancelled if cancelled else self._timed_out)[job.priority] += 1
+                    job.future.cancel()
+                    return True
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            depth = dict.fromkeys(PRIORITIES, 0)
+            for _, _, job in self._heap:
+                depth[job.priority] += 1
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout_seconds,
+                "running": self._running,
+                "depth": depth,
+                "submitted": dict(self._submitted),
+                "rejected": dict(self._rejected),
+                "timed_out": dict(self._timed_out),
+                "cancelled": dict(self._cancelled),
+                "completed": dict(self._completed),
+                "wait_seconds_total": {key: round(value, 4) for key, value in self._wait_seconds.items()},
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+            }
+
+    def _ensure_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"translation-worker-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._heap)
+                job.started_at = self.clock()
+                wait_seconds = job.started_at - job.enqueued_at
+                self._wait_seconds[job.priority] += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+                self._running += 1
+
+            if self.on_start is not None:
+                self.on_start(job.priority, wait_seconds)
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    value = job.fn()
+                except BaseException as exc:
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(value)
+
+            with self._condition:
+                self._running -= 1
+                self._completed[job.priority] += 1
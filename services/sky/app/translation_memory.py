@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+# (model id, domain, source unit: a whole chunk or a normalized sentence)
+MemoryKey = tuple[str, str, str]
+
+
+def normalize_segment(text: str) -> str:
+    return " ".join(text.split())
+
+
+class TranslationMemory:
+    # Entries keep the milliseconds the translator spent on them, so every hit can report
+    # the time it saved. The in-memory LRU sits in front of an optional SQLite store that
+    # survives restarts; the store is keyed by a digest of the memory key and trimmed to
+    # max_disk_entries, oldest writes first. Its row count is tracked in _stored so stats()
+    # never scans the table.
+
+    def __init__(self, max_entries: int, path: Path | None = None, max_disk_entries: int = 200_000) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_disk_entries = max(1, int(max_disk_entries))
+        self.path = path
+        self._entries: OrderedDict[MemoryKey, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._saved_ms = 0.0
+        self._stored = 0
+        self._trimmed = 0
+        self._db: sqlite3.Connection | None = None
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                "digest TEXT PRIMARY KEY, translation TEXT NOT NULL, took_ms REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS memory_stored_at ON memory (stored_at)")
+            self._db.commit()
+            self._stored = int(self._db.execute("SELECT COUNT(*) FROM memory").fetchone()[0])
+            self._trim()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self._db is not None
+
+    def get(self, key: MemoryKey) -> tuple[str, float] | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT translation, took_ms FROM memory WHERE digest = ?",
+                    (self._digest(key),),
+                ).fetchone()
+                if row is not None:
+                    entry = (str(row[0]), float(row[1]))
+                    self._remember(key, entry)
+
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._saved_ms += entry[1]
+            return entry
+
+    def set_many(self, items: list[tuple[MemoryKey, str, float]]) -> None:
+        if not self.enabled or not items:
+            return
+
+        with self._lock:
+            for key, translation, took_ms in items:
+                self._remember(key, (translation, took_ms))
+            if self._db is not None:
+                now = time.time()
+                rows = {self._digest(key): (translation, took_ms) for key, translation, took_ms in items}
+                existing = self._count_stored(list(rows))
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO memory (digest, translation, took_ms, stored_at) VALUES (?, ?, ?, ?)",
+                    [(digest, translation, took_ms, now) for digest, (translation, took_ms) in rows.items()],
+                )
+                self._stored += len(rows) - existing
+                self._trim()
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+            self._saved_ms = 0.0
+            if self._db is not None:
+                self._db.execute("DELETE FROM memory")
+                self._db.commit()
+                self._stored = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "stored": self._stored if self._db is not None else None,
+                "max_stored": self.max_disk_entries if self._db is not None else None,
+                "trimmed": self._trimmed,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "saved_ms": round(self._saved_ms, 2),
+            }
+
+    def _remember(self, key: MemoryKey, entry: tuple[str, float]) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _count_stored(self, digests: list[str]) -> int:
+        # Slices stay under SQLite's bound-parameter limit.
+        count = 0
+        for start in range(0, len(digests), 500):
+            part = digests[start : start + 500]
+            query = f"SELECT COUNT(*) FROM memory WHERE digest IN ({','.join('?' * len(part))})"
+            count += int(self._db.execute(query, part).fetchone()[0])
+        return count
+
+    def _trim(self) -> None:
+        excess = self._stored - self.max_disk_entries
+        if self._db is None or excess <= 0:
+            return
+        self._db.execute(
+            "DELETE FROM memory WHERE digest IN (SELECT digest FROM memory ORDER BY stored_at, rowid LIMIT ?)",
+            (excess,),
+        )
+        self._stored -= excess
+        self._trimmed += excess
+
+    @staticmethod
+    def _digest(key: MemoryKey) -> str:
+        return hashlib.sha256("\x1f".join(key).encode("utf-8")).hexdigest()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date as date_cls
+from typing import Iterator
+from zoneinfo import ZoneInfo
+
+from jplephem.spk import Segment
+from skyfield.api import wgs84
+
+from app import main
+from app.ephemeris_context import EphemerisContext
+
+# Counts jplephem segment evaluations (one Chebyshev evaluation over a time array) per
+# sky-summary computation, with and without the per-request ephemeris context. Run from
+# services/sky:
+#   python -m tests.ephemeris_bench --repeat 20
+
+
+class UncachedContext:
+    # Baseline with the EphemerisContext interface that evaluates every call afresh.
+    def __init__(self, observer) -> None:
+        self.observer = observer
+
+    def at(self, t):
+        return self.observer.at(t)
+
+    def apparent(self, body, t):
+        return self.observer.at(t).observe(body).apparent()
+
+
+@contextmanager
+def count_segment_evaluations() -> Iterator[Counter]:
+    counts: Counter = Counter()
+    original_compute = Segment.compute
+    original_differentiate = Segment.compute_and_differentiate
+
+    def compute(self, tdb, tdb2=0.0):
+        counts[f"{self.center}->{self.target}"] += 1
+        return original_compute(self, tdb, tdb2)
+
+    def compute_and_differentiate(self, tdb, tdb2=0.0):
+        counts[f"{self.center}->{self.target}"] += 1
+        return original_differentiate(self, tdb, tdb2)
+
+    Segment.compute = compute
+    Segment.compute_and_differentiate = compute_and_differentiate
+    try:
+        yield counts
+    finally:
+        Segment.compute = original_compute
+        Segment.compute_and_differentiate = original_differentiate
+
+
+def sky_payloads(lat: float, lon: float, local_date: date_cls, local_tz: ZoneInfo, memoize: bool) -> None:
+    location = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    observer = main.EARTH + location
+    context = EphemerisContext(observer) if memoize else UncachedContext(observer)
+    main.build_moon_payload(observer=observer, location=location, local_date=local_date, local_tz=local_tz, context=context)
+    main.build_planets_payload(observer=observer, local_date=local_date, local_tz=local_tz, context=context)
+
+
+def measure(lat: float, lon: float, local_date: date_cls, local_tz: ZoneInfo, memoize: bool, repeat: int) -> dict[str, object]:
+    with count_segment_evaluations() as counts:
+        sky_payloads(lat, lon, local_date, local_tz, memoize)
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        sky_payloads(lat, lon, local_date, local_tz, memoize)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    timings.sort()
+
+    return {
+        "segment_evaluations": sum(counts.values()),
+        "by_segment": dict(sorted(counts.items())),
+        "p50_ms": round(timings[len(timings) // 2], 2),
+    }
+
+
+def measure_batch(lat: float, lon: float, local_date: date_cls, local_tz: ZoneInfo, locations: int) -> dict[str, object]:
+    # Neighbouring cells on the same date, as the batch endpoint sees them for one region.
+    cells = [(lat + 0.05 * (index % 20), lon + 0.05 * (index // 20), local_date, local_tz) for index in range(locations)]
+    with count_segment_evaluations() as counts:
+        started_at = time.perf_counter()
+        main.build_sky_payloads_many(cells)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    total = sum(counts.values())
+    return {
+        "locations": locations,
+        "segment_evaluations": total,
+        "per_location": round(total / locations, 2),
+        "ms": round(elapsed_ms, 2),
+    }
+
+
+def run(lat: float, lon: float, tz: str, local_date: date_cls, repeat: int, batch: int) -> dict[str, object]:
+    local_tz = ZoneInfo(tz)
+    sky_payloads(lat, lon, local_date, local_tz, memoize=True)
+
+    baseline = measure(lat, lon, local_date, local_tz, memoize=False, repeat=repeat)
+    shared = measure(lat, lon, local_date, local_tz, memoize=True, repeat=repeat)
+    saved = baseline["segment_evaluations"] - shared["segment_evaluations"]
+
+    report: dict[str, object] = {
+        "location": {"lat": lat, "lon": lon, "tz": tz, "date": local_date.isoformat()},
+        "without_context": baseline,
+        "with_context": shared,
+        "segment_evaluations_saved": saved,
+        "reduction": round(saved / baseline["segment_evaluations"], 3) if baseline["segment_evaluations"] else 0.0,
+    }
+    if batch > 0:
+        report["batched"] = measure_batch(lat, lon, local_date, local_tz, batch)
+    return report
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Count ephemeris segment evaluations per sky-summary request.")
+    parser.add_argument("--lat", type=float, default=48.1486)
+    parser.add_argument("--lon", type=float, default=17.1077)
+    parser.add_argument("--tz", default="Europe/Bratislava")
+    parser.add_argument("--date", default=date_cls.today().isoformat())
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=100, help="Also measure the batched path for this many locations (0 to skip).")
+    args = parser.parse_args()
+
+    report = run(args.lat, args.lon, args.tz, date_cls.fromisoformat(args.date), max(1, args.repeat), max(0, args.batch))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
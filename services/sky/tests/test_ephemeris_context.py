@@ -0,0 +1,58 @@
+import unittest
+
+from skyfield.api import wgs84
+
+from app import main
+from app.ephemeris_context import EphemerisContext
+
+
+class _CountingObserver:
+    def __init__(self, observer) -> None:
+        self.observer = observer
+        self.calls = 0
+
+    def at(self, t):
+        self.calls += 1
+        return self.observer.at(t)
+
+
+class EphemerisContextTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.observer = _CountingObserver(main.EARTH + wgs84.latlon(48.1486, 17.1077))
+        self.t = main.ts.utc(2026, 2, 27, [18, 19, 20])
+
+    def test_observer_state_is_computed_once_per_time_array(self) -> None:
+        context = EphemerisContext(self.observer)
+
+        sun = context.apparent(main.SUN, self.t)
+        for _, _, body in main.PLANETS:
+            context.apparent(body, self.t)
+
+        self.assertEqual(1, self.observer.calls)
+        self.assertIs(sun, context.apparent(main.SUN, self.t))
+
+    def test_memoized_positions_match_direct_evaluation(self) -> None:
+        context = EphemerisContext(self.observer)
+        direct = self.observer.at(self.t).observe(main.MOON).apparent().altaz()[0].degrees
+        shared = context.apparent(main.MOON, self.t).altaz()[0].degrees
+
+        self.assertEqual(direct.tolist(), shared.tolist())
+
+    def test_separately_built_times_over_the_same_instants_share_work(self) -> None:
+        context = EphemerisContext(self.observer)
+        first = context.apparent(main.SUN, self.t)
+        again = context.apparent(main.SUN, main.ts.utc(2026, 2, 27, [18, 19, 20]))
+        context.apparent(main.MOON, main.ts.utc(2026, 2, 27, [18, 19, 20]))
+
+        self.assertIs(first, again)
+        self.assertEqual(1, self.observer.calls)
+
+    def test_different_instants_are_not_shared(self) -> None:
+        context = EphemerisContext(self.observer)
+        context.apparent(main.SUN, self.t)
+        context.apparent(main.SUN, main.ts.utc(2026, 2, 27, [18, 19, 21]))
+
+        self.assertEqual(2, self.observer.calls)
+
+if __name__ == "__main__":
+    unittest.main()
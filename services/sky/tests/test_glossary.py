@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import main
+from app.glossary import Glossary, GlossaryEntry, GlossaryStore
+from translation_support import TranslationTestCase
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _glossary(*entries: GlossaryEntry) -> Glossary:
+    return Glossary(list(entries), version="test")
+
+
+class GlossaryTest(unittest.TestCase):
+    def test_longest_term_wins_in_one_pass(self) -> None:
+        glossary = _glossary(
+            GlossaryEntry("meteor", "meteor"),
+            GlossaryEntry("meteor shower", "meteorický roj"),
+            GlossaryEntry("space telescope", "vesmírny teleskop"),
+            GlossaryEntry("James Webb Space Telescope", "Vesmírny ďalekohľad Jamesa Webba"),
+        )
+
+        self.assertEqual(
+            "meteorický roj, meteor showers and the Vesmírny ďalekohľad Jamesa Webba.",
+            glossary.apply("meteor shower, meteor showers and the James Webb Space Telescope."),
+        )
+
+    def test_whole_words_only(self) -> None:
+        glossary = _glossary(GlossaryEntry("nebula", "hmlovina"))
+
+        self.assertEqual("nebulae and hmlovina", glossary.apply("nebulae and nebula"))
+
+    def test_case_follows_the_text(self) -> None:
+        glossary = _glossary(
+            GlossaryEntry("black hole", "čierna diera"),
+            GlossaryEntry("Curiosity", "Curiosity", case_sensitive=True),
+            GlossaryEntry("Milky Way", "Mliečna cesta"),
+        )
+
+        self.assertEqual("Čierna diera, čierna diera, ČIERNA DIERA", glossary.apply("Black hole, black hole, BLACK HOLE"))
+        self.assertEqual("Mliečna cesta / Mliečna cesta", glossary.apply("milky way / Milky Way"))
+        self.assertEqual("curiosity", glossary.apply("curiosity"))
+
+    def test_protect_and_restore(self) -> None:
+        glossary = _glossary(
+            GlossaryEntry("Perseverance", "Perseverance", case_sensitive=True, protect=True),
+            GlossaryEntry("M31", "M31", case_sensitive=True, protect=True),
+            GlossaryEntry("nebula", "hmlovina"),
+        )
+
+        protected, targets = glossary.protect("Perseverance imaged M31 and a nebula with perseverance.")
+
+        self.assertEqual("ZXQ0QXZ imaged ZXQ1QXZ and a nebula with perseverance.", protected)
+        self.assertEqual(["Perseverance", "M31"], targets)
+        self.assertEqual("Perseverance nasnímal M31.", glossary.restore("ZXQ 0 QXZ nasnímal zxq1qxz.", targets))
+        self.assertIsNone(glossary.restore("ZXQ0QXZ nasnímal galaxiu.", targets))
+        self.assertIsNone(glossary.restore("ZXQ0QXZ a ZXQ0QXZ a ZXQ1QXZ.", targets))
+
+    def test_shipped_glossary_loads(self) -> None:
+        stats = GlossaryStore(main.ASTRONOMY_GLOSSARY_PATH).stats()
+
+        self.assertIsNone(stats["error"])
+        self.assertGreater(stats["terms"], 100)
+        self.assertGreater(stats["protected_terms"], 0)
+
+
+class GlossaryStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "glossary.json"
+        self.clock = FakeClock()
+        self.write([{"source": "nebula", "target": "hmlovina"}])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write(self, terms: list[dict], stamp: int = 0) -> None:
+        self.path.write_text(json.dumps({"terms": terms}), encoding="utf-8")
+        os.utime(self.path, ns=(stamp, stamp))
+
+    def test_changes_are_picked_up_after_the_check_interval(self) -> None:
+        store = GlossaryStore(self.path, check_interval_seconds=5, clock=self.clock)
+        first = store.current()
+        self.write([{"source": "nebula", "target": "hmlovina"}, {"source": "comet", "target": "kométa"}], stamp=10**9)
+
+        self.assertIs(first, store.current())
+        self.clock.now += 5
+
+        reloaded = store.current()
+        self.assertEqual("kométa", reloaded.apply("comet"))
+        self.assertNotEqual(first.version, reloaded.version)
+        self.assertEqual(2, store.stats()["reloads"])
+
+    def test_broken_file_keeps_the_previous_glossary(self) -> None:
+        store = GlossaryStore(self.path, check_interval_seconds=0, clock=self.clock)
+        self.path.write_text("{not json", encoding="utf-8")
+        os.utime(self.path, ns=(10**9, 10**9))
+
+        self.assertEqual("hmlovina", store.current().apply("nebula"))
+        self.assertIsNotNone(store.stats()["error"])
+
+
+class _WordTranslator:
+    # Translates a couple of words the way Argos would, including the rover's name, and
+    # optionally drops placeholders like a model that does not copy them through.
+    def __init__(self, drop_placeholders: bool = False) -> None:
+        self.drop_placeholders = drop_placeholders
+        self.calls: list[str] = []
+
+    def translate(self, text: str) -> str:
+        self.calls.append(text)
+        translated = text.replace("Perseverance", "Vytrvalosť").replace("found", "našiel")
+        if self.drop_placeholders:
+            translated = translated.replace("ZXQ0QXZ", "rover")
+        return translated
+
+
+class GlossaryTranslationTest(TranslationTestCase):
+    def make_translator(self) -> _WordTranslator:
+        return _WordTranslator()
+
+    def translate(self, text: str, domain: str = "astronomy") -> str:
+        response = self.client.post(
+            "/translate",
+            json={"text": text, "domain": domain},
+            headers={"X-Internal-Token": "test-token"},
+        )
+        self.assertEqual(200, response.status_code)
+        return response.json()["translated"]
+
+    def test_protected_terms_survive_translation(self) -> None:
+        self.assertEqual("Perseverance našiel a hmlovina.", self.translate("Perseverance found a nebula."))
+        self.assertEqual(["ZXQ0QXZ found a nebula."], self.translator.calls)
+        self.assertEqual("Vytrvalosť našiel.", self.translate("Perseverance found.", domain="general"))
+
+    def test_mangled_placeholder_falls_back_to_plain_translation(self) -> None:
+        self.translator.drop_placeholders = True
+
+        self.assertEqual("Vytrvalosť našiel M31.", self.translate("Perseverance found M31."))
+        self.assertEqual(["ZXQ0QXZ found ZXQ1QXZ.", "Perseverance found M31."], self.translator.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
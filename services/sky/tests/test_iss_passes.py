@@ -0,0 +1,142 @@
+import unittest
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi.testclient import TestClient
+from skyfield.api import EarthSatellite
+
+from app import main
+from app.sky_cache import TTLCache
+
+ISS_LINE1 = "1 25544U 98067A   26290.50000000  .00016717  00000-0  10270-3 0  9999"
+ISS_LINE2 = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50103472123452"
+# Same orbit, next epoch.
+ISS_LINE1_NEXT = "1 25544U 98067A   26291.00000000  .00016717  00000-0  10270-3 0  9995"
+
+LOCATIONS = [
+    (48.1486, 17.1077, "Europe/Bratislava"),
+    (48.7164, 21.2611, "Europe/Bratislava"),
+    (40.7128, -74.006, "America/New_York"),
+    (-33.8688, 151.2093, "Australia/Sydney"),
+]
+HEADERS = {"X-Internal-Token": "test-token"}
+
+
+class IssPassesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_cache = main.iss_pass_cache
+        main.iss_pass_cache = TTLCache("iss_passes", max_entries=256, ttl_seconds=600)
+        self.satellite = EarthSatellite(ISS_LINE1, ISS_LINE2, "ISS (ZARYA)", main.ts)
+
+    def tearDown(self) -> None:
+        main.iss_pass_cache = self.original_cache
+
+    def test_shared_track_matches_find_events(self) -> None:
+        local_date = date(2026, 10, 18)
+        cells = [
+            (*main.snap_location(lat, lon, main.SKY_CACHE_GRID_DEG), local_date, ZoneInfo(tz))
+            for lat, lon, tz in LOCATIONS
+        ]
+
+        batched = main.build_iss_passes_many(self.satellite, cells)
+
+        compared = 0
+        for (lat, lon, tz), passes in zip(LOCATIONS, batched):
+            expected = main.cached_iss_passes(self.satellite, lat, lon, tz, local_date, ZoneInfo(tz))
+            self.assertEqual(len(expected), len(passes))
+            for reference, item in zip(expected, passes):
+                self.assertLessEqual(abs((reference["rise_at"] - item["rise_at"]).total_seconds()), 5)
+                self.assertLessEqual(abs((reference["set_at"] - item["set_at"]).total_seconds()), 5)
+                self.assertAlmostEqual(reference["max_altitude_deg"], item["max_altitude_deg"], delta=0.1)
+                self.assertEqual(reference["is_visible"], item["is_visible"])
+                self.assertEqual(str(reference["rise_at"].tzinfo), str(item["rise_at"].tzinfo))
+                compared += 1
+        self.assertGreater(compared, 5)
+
+    def test_passes_are_cached_per_cell_and_tle_epoch(self) -> None:
+        local_date = date(2026, 10, 18)
+        local_tz = ZoneInfo("Europe/Bratislava")
+
+        first = main.cached_iss_passes(self.satellite, 48.1486, 17.1077, "Europe/Bratislava", local_date, local_tz)
+        nearby = main.cached_iss_passes(self.satellite, 48.1490, 17.1080, "Europe/Bratislava", local_date, local_tz)
+
+        self.assertIs(first, nearby)
+        self.assertEqual(1, main.iss_pass_cache.stats()["hits"])
+
+        refreshed = EarthSatellite(ISS_LINE1_NEXT, ISS_LINE2, "ISS (ZARYA)", main.ts)
+        main.cached_iss_passes(refreshed, 48.1486, 17.1077, "Europe/Bratislava", local_date, local_tz)
+        self.assertEqual(2, main.iss_pass_cache.stats()["misses"])
+
+    def test_batch_reuses_cached_cells(self) -> None:
+        local_date = date(2026, 10, 18)
+        requests = [(lat, lon, tz, local_date, ZoneInfo(tz)) for lat, lon, tz in LOCATIONS]
+
+        first = main.cached_iss_passes_many(self.satellite, requests)
+        second = main.cached_iss_passes_many(self.satellite, requests)
+
+        self.assertEqual(len(LOCATIONS), main.iss_pass_cache.stats()["misses"])
+        self.assertTrue(all(a is b for a, b in zip(first, second)))
+
+    def test_engines_do_not_share_cache_entries(self) -> None:
+        local_date = date(2026, 10, 18)
+        lat, lon, tz = LOCATIONS[0]
+
+        single = main.cached_iss_passes(self.satellite, lat, lon, tz, local_date, ZoneInfo(tz))
+        [batched] = main.cached_iss_passes_many(self.satellite, [(lat, lon, tz, local_date, ZoneInfo(tz))])
+
+        self.assertIsNot(single, batched)
+        self.assertEqual(2, main.iss_pass_cache.stats()["misses"])
+        self.assertIs(single, main.cached_iss_passes(self.satellite, lat, lon, tz, local_date, ZoneInfo(tz)))
+
+
+class IssPreviewBatchEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        main.INTERNAL_TOKEN = "test-token"
+        self.original_cache = main.iss_pass_cache
+        self.original_state = dict(main.iss_state)
+        main.iss_pass_cache = TTLCache("iss_passes", max_entries=256, ttl_seconds=600)
+        main.iss_state.update({
+            "satellite": EarthSatellite(ISS_LINE1, ISS_LINE2, "ISS (ZARYA)", main.ts),
+            "source": "test",
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "error": None,
+        })
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.iss_pass_cache = self.original_cache
+        main.iss_state.update(self.original_state)
+
+    def test_results_follow_request_order(self) -> None:
+        locations = [{"lat": lat, "lon": lon, "tz": tz} for lat, lon, tz in LOCATIONS]
+        locations.insert(1, {"lat": 48.0, "lon": 17.0, "tz": "Mars/Olympus"})
+
+        response = self.client.post("/iss-preview/batch", json={"locations": locations}, headers=HEADERS)
+
+        self.assertEqual(200, response.status_code)
+        payload = response.json()
+        self.assertTrue(payload["available"])
+        self.assertIn("current_position", payload)
+        results = payload["results"]
+        self.assertEqual(len(locations), len(results))
+        self.assertEqual({"error": "Invalid timezone: Mars/Olympus"}, results[1])
+        for result in results[:1] + results[2:]:
+            self.assertIn("available", result)
+            if result["available"]:
+                self.assertIn(result["direction_start"], main.DIRECTIONS)
+
+    def test_batch_size_is_bounded(self) -> None:
+        locations = [{"lat": 48.0, "lon": 17.0, "tz": "UTC"}] * (main.ISS_BATCH_MAX_LOCATIONS + 1)
+
+        response = self.client.post("/iss-preview/batch", json={"locations": locations}, headers=HEADERS)
+
+        self.assertEqual(422, response.status_code)
+
+    def test_batch_requires_internal_token(self) -> None:
+        response = self.client.post("/iss-preview/batch", json={"locations": [{"lat": 48.0, "lon": 17.0, "tz": "UTC"}]})
+
+        self.assertEqual(401, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from skyfield.api import EarthSatellite, wgs84
+
+from app import main
+from app.sky_cache import TTLCache
+
+ISS_LINE1 = "1 25544U 98067A   26290.50000000  .00016717  00000-0  10270-3 0  9999"
+ISS_LINE2 = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50103472123452"
+
+
+class IssPositionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_state = dict(main.iss_state)
+        self.original_track_cache = main.iss_track_cache
+        self.satellite = EarthSatellite(ISS_LINE1, ISS_LINE2, "ISS (ZARYA)", main.ts)
+        main.iss_state.update({
+            "satellite": self.satellite,
+            "source": "test",
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "error": None,
+        })
+        main.iss_track_cache = TTLCache("iss_ground_track", max_entries=8, ttl_seconds=600)
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.iss_state.update(self.original_state)
+        main.iss_track_cache = self.original_track_cache
+
+    def test_positions_match_skyfield_subpoint(self) -> None:
+        moments = [datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc) + timedelta(minutes=7 * index) for index in range(10)]
+
+        positions = main.iss_positions(self.satellite, moments)
+
+        for moment, position in zip(moments, positions):
+            geocentric = self.satellite.at(main.ts.from_datetime(moment))
+            subpoint = wgs84.subpoint(geocentric)
+            self.assertAlmostEqual(subpoint.latitude.degrees, position["lat"], places=4)
+            self.assertAlmostEqual(subpoint.longitude.degrees, position["lon"], places=4)
+            self.assertAlmostEqual(subpoint.elevation.km, position["altitude_km"], delta=0.05)
+            self.assertAlmostEqual(7.66, position["velocity_kms"], delta=0.1)
+            self.assertEqual(moment.isoformat(), position["sample_at"])
+
+    def test_position_endpoint(self) -> None:
+        response = self.client.get("/iss-position")
+
+        self.assertEqual(200, response.status_code)
+        payload = response.json()
+        self.assertTrue(payload["available"])
+        self.assertNotIn("track", payload)
+        self.assertLessEqual(abs(payload["position"]["lat"]), 52.0)
+        self.assertTrue(300 < payload["position"]["altitude_km"] < 500)
+        self.assertTrue(payload["tle_epoch"].startswith("2026-10-17T12:00:00"))
+
+    def test_next_orbit_track_is_shared_within_a_step(self) -> None:
+        first = self.client.get("/iss-position", params={"track": "true", "track_step": 120}).json()["track"]
+        second = self.client.get("/iss-position", params={"track": "true", "track_step": 120}).json()["track"]
+
+        self.assertEqual(120, first["step_sec"])
+        self.assertAlmostEqual(92.9, first["period_min"], delta=0.5)
+        self.assertGreaterEqual((len(first["points"]) - 1) * 120, first["period_min"] * 60)
+        self.assertEqual(0, datetime.fromisoformat(first["points"][0]["sample_at"]).timestamp() % 120)
+        self.assertGreaterEqual(main.iss_track_cache.stats()["hits"], 1)
+        self.assertEqual(first["points"][0], second["points"][0])
+
+    def test_stream_emits_position_events(self) -> None:
+        with self.client.stream("GET", "/iss-position/stream", params={"interval": 0.5, "limit": 2}) as response:
+            self.assertEqual(200, response.status_code)
+            self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+            body = "".join(response.iter_text())
+
+        events = [block for block in body.split("\n\n") if block.strip()]
+        self.assertEqual(2, len(events))
+        for block in events:
+            event_line, data_line = block.splitlines()
+            self.assertEqual("event: position", event_line)
+            position = json.loads(data_line.removeprefix("data: "))
+            self.assertEqual({"lat", "lon", "altitude_km", "velocity_kms", "sample_at", "source"}, set(position))
+
+    def test_stream_ticks_run_off_the_event_loop(self) -> None:
+        on_loop = []
+        original = main.iss_position_now
+
+        def record() -> dict[str, object] | None:
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return original()
+
+        main.iss_position_now = record
+        try:
+            with self.client.stream("GET", "/iss-position/stream", params={"interval": 0.5, "limit": 2}) as response:
+                body = "".join(response.iter_text())
+        finally:
+            main.iss_position_now = original
+
+        self.assertEqual(2, body.count("event: position"))
+        self.assertEqual([False, False], on_loop)
+
+    def test_unavailable_without_tle(self) -> None:
+        main.iss_state["satellite"] = None
+        original_refresher = main.iss_refresher
+        original_path = main.ISS_TLE_CACHE_PATH
+        main.iss_refresher = main.BackgroundRefresher("iss_tle", lambda: None)
+        main.ISS_TLE_CACHE_PATH = main.DATA_DIR / "missing_iss_tle.json"
+        try:
+            self.assertEqual({"available": False}, self.client.get("/iss-position").json())
+        finally:
+            main.iss_refresher.wait(5)
+            main.iss_refresher = original_refresher
+            main.ISS_TLE_CACHE_PATH = original_path
+
+
+if __name__ == "__main__":
+    unittest.main()
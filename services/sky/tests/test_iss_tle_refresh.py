@@ -0,0 +1,278 @@
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from skyfield.api import EarthSatellite
+
+from app import main
+from app.feed_refresh import BackgroundRefresher
+
+ISS_LINE1 = "1 25544U 98067A   26290.50000000  .00016717  00000-0  10270-3 0  9999"
+ISS_LINE1_NEXT = "1 25544U 98067A   26291.00000000  .00016717  00000-0  10270-3 0  9995"
+ISS_LINE2 = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50103472123452"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StandInFeed:
+    # Local stand-in for the Celestrak stations feed: serves a fixed TLE with an ETag,
+    # honours If-None-Match, and can be told to fail or to answer slowly.
+
+    def __init__(self) -> None:
+        self.body = f"ISS (ZARYA)\n{ISS_LINE1_NEXT}\n{ISS_LINE2}\n"
+        self.etag = '"tle-v2"'
+        self.status = 200
+        self.delay_seconds = 0.0
+        self.requests: list[dict[str, str]] = []
+        feed = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                feed.requests.append({key: value for key, value in self.headers.items()})
+                time.sleep(feed.delay_seconds)
+                if feed.status != 200:
+                    self.send_response(feed.status)
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == feed.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", feed.etag)
+                    self.end_headers()
+                    return
+                payload = feed.body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("ETag", feed.etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/stations.txt"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class IssTleRefreshTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.feed = StandInFeed()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.original = {
+            "ISS_TLE_URL": main.ISS_TLE_URL,
+            "ISS_TLE_CACHE_PATH": main.ISS_TLE_CACHE_PATH,
+            "iss_refresher": main.iss_refresher,
+            "iss_state": dict(main.iss_state),
+        }
+        main.ISS_TLE_URL = self.feed.url
+        main.ISS_TLE_CACHE_PATH = Path(self.tmp.name) / "iss_tle.json"
+        main.iss_refresher = BackgroundRefresher(
+            "iss_tle",
+            main.refresh_iss_tle_cache,
+            min_backoff_seconds=60,
+            max_backoff_seconds=240,
+            clock=self.clock,
+        )
+        main.iss_state.update({"satellite": None, "source": None, "fetched_at": None, "error": None})
+
+    def tearDown(self) -> None:
+        main.iss_refresher.wait(5)
+        self.feed.close()
+        self.tmp.cleanup()
+        main.ISS_TLE_URL = self.original["ISS_TLE_URL"]
+        main.ISS_TLE_CACHE_PATH = self.original["ISS_TLE_CACHE_PATH"]
+        main.iss_refresher = self.original["iss_refresher"]
+        main.iss_state.update(self.original["iss_state"])
+
+    def load_stale_satellite(self) -> EarthSatellite:
+        stale = (datetime.now(timezone.utc) - timedelta(hours=main.ISS_TLE_REFRESH_HOURS + 1)).isoformat()
+        main.set_iss_satellite(
+            {"name": "ISS (ZARYA)", "line1": ISS_LINE1, "line2": ISS_LINE2, "fetched_at": stale},
+            source="cache",
+            error=None,
+        )
+        return main.iss_state["satellite"]
+
+    def test_stale_satellite_is_served_while_refreshing(self) -> None:
+        stale = self.load_stale_satellite()
+        self.feed.delay_seconds = 0.5
+
+        started_at = time.perf_counter()
+        served = main.ensure_iss_satellite()
+        elapsed = time.perf_counter() - started_at
+
+        self.assertIs(stale, served)
+        self.assertLess(elapsed, 0.25)
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertEqual("remote", main.iss_state["source"])
+        self.assertIsNot(stale, main.iss_state["satellite"])
+        self.assertEqual(ISS_LINE1_NEXT, main.load_cached_iss_tle()["line1"])
+        self.assertFalse(main.iss_tle_is_stale())
+
+    def test_concurrent_requests_share_one_fetch(self) -> None:
+        self.load_stale_satellite()
+        self.feed.delay_seconds = 0.3
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            served = list(pool.map(lambda _: main.ensure_iss_satellite(), range(32)))
+
+        self.assertTrue(all(item is not None for item in served))
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertEqual(1, len(self.feed.requests))
+
+    def test_refresh_sends_validators_and_keeps_tle_on_304(self) -> None:
+        main.refresh_iss_tle_cache()
+        first_fetch = main.iss_state["fetched_at"]
+        satellite = main.iss_state["satellite"]
+        self.assertNotIn("If-None-Match", self.feed.requests[0])
+
+        main.refresh_iss_tle_cache()
+
+        self.assertEqual(self.feed.etag, self.feed.requests[1]["If-None-Match"])
+        self.assertEqual(satellite.model.jdsatepochF, main.iss_state["satellite"].model.jdsatepochF)
+        self.assertGreaterEqual(main.iss_state["fetched_at"], first_fetch)
+        self.assertEqual(self.feed.etag, main.load_cached_iss_tle()["etag"])
+
+    def test_failures_back_off_exponentially(self) -> None:
+        stale = self.load_stale_satellite()
+        self.feed.status = 503
+
+        self.assertIs(stale, main.ensure_iss_satellite())
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertEqual(1, main.iss_refresher.failures)
+        self.assertIn("remote_fetch_failed", main.iss_state["error"])
+
+        self.assertFalse(main.iss_refresher.trigger())
+        self.clock.now += 61
+        self.assertTrue(main.iss_refresher.trigger())
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertEqual(2, main.iss_refresher.failures)
+
+        self.clock.now += 61
+        self.assertFalse(main.iss_refresher.trigger())
+        self.clock.now += 60
+        self.feed.status = 200
+        self.assertTrue(main.iss_refresher.trigger())
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertEqual(0, main.iss_refresher.failures)
+        self.assertIsNone(main.iss_state["error"])
+        self.assertEqual(3, len(self.feed.requests))
+
+    def test_first_request_without_tle_does_not_block(self) -> None:
+        self.feed.delay_seconds = 0.5
+
+        self.assertIsNone(main.ensure_iss_satellite())
+        self.assertTrue(main.iss_refresher.wait(5))
+        self.assertIsNotNone(main.ensure_iss_satellite())
+
+
+class SatelliteCatalogRefreshTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.feed = StandInFeed()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.original = {
+            "SATELLITE_TLE_URL": main.SATELLITE_TLE_URL,
+            "SATELLITE_TLE_GROUPS": main.SATELLITE_TLE_GROUPS,
+            "SATELLITE_CATALOG_CACHE_PATH": main.SATELLITE_CATALOG_CACHE_PATH,
+            "satellite_refresher": main.satellite_refresher,
+            "satellite_state": dict(main.satellite_state),
+        }
+        main.SATELLITE_TLE_URL = self.feed.url + "?group={group}"
+        main.SATELLITE_TLE_GROUPS = ["stations"]
+        main.SATELLITE_CATALOG_CACHE_PATH = Path(self.tmp.name) / "satellite_catalog.json"
+        main.satellite_refresher = BackgroundRefresher(
+            "satellite_catalog",
+            main.refresh_satellite_catalog,
+            min_backoff_seconds=60,
+            max_backoff_seconds=240,
+            clock=self.clock,
+        )
+        main.satellite_state.update({"catalog": None, "source": None, "fetched_at": None, "error": None})
+
+    def tearDown(self) -> None:
+        main.satellite_refresher.wait(5)
+        self.feed.close()
+        self.tmp.cleanup()
+        for name, value in self.original.items():
+            if name == "satellite_state":
+                main.satellite_state.update(value)
+            else:
+                setattr(main, name, value)
+
+    def load_stale_catalog(self):
+        stale = (datetime.now(timezone.utc) - timedelta(hours=main.SATELLITE_TLE_REFRESH_HOURS + 1)).isoformat()
+        main.set_satellite_catalog(
+            {"tle": f"ISS (ZARYA)\n{ISS_LINE1}\n{ISS_LINE2}\n", "fetched_at": stale},
+            source="cache",
+            error=None,
+        )
+        return main.satellite_state["catalog"]
+
+    def test_stale_catalog_is_served_while_one_refresh_runs(self) -> None:
+        stale = self.load_stale_catalog()
+        self.feed.delay_seconds = 0.3
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            served = list(pool.map(lambda _: main.ensure_satellite_catalog(), range(32)))
+        elapsed = time.perf_counter() - started_at
+
+        self.assertTrue(all(item is stale for item in served))
+        self.assertLess(elapsed, 0.25)
+        self.assertTrue(main.satellite_refresher.wait(5))
+        self.assertEqual(1, len(self.feed.requests))
+        self.assertEqual("remote", main.satellite_state["source"])
+        self.assertFalse(main.satellite_catalog_is_stale())
+
+    def test_refresh_sends_validators_and_keeps_catalog_on_304(self) -> None:
+        main.refresh_satellite_catalog()
+        self.assertNotIn("If-None-Match", self.feed.requests[0])
+
+        main.refresh_satellite_catalog()
+
+        self.assertEqual(self.feed.etag, self.feed.requests[1]["If-None-Match"])
+        self.assertEqual(1, len(main.satellite_state["catalog"]))
+        self.assertEqual(self.feed.etag, main.load_cached_satellite_catalog()["feeds"]["stations"]["etag"])
+
+    def test_failures_back_off(self) -> None:
+        stale = self.load_stale_catalog()
+        self.feed.status = 503
+
+        self.assertIs(stale, main.ensure_satellite_catalog())
+        self.assertTrue(main.satellite_refresher.wait(5))
+        self.assertEqual(1, main.satellite_refresher.failures)
+        self.assertIn("remote_fetch_failed", main.satellite_state["error"])
+        self.assertIs(stale, main.ensure_satellite_catalog())
+        self.assertEqual(1, len(self.feed.requests))
+
+    def test_first_request_without_catalog_does_not_block(self) -> None:
+        self.feed.delay_seconds = 0.5
+
+        self.assertIsNone(main.ensure_satellite_catalog())
+        self.assertTrue(main.satellite_refresher.wait(5))
+        self.assertIsNotNone(main.ensure_satellite_catalog())
+
+
+if __name__ == "__main__":
+    unittest.main()
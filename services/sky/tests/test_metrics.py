@@ -0,0 +1,32 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+class MetricsEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(main.app)
+
+    def test_metrics_report_routes_and_sky_stages(self) -> None:
+        response = self.client.get(
+            "/sky-summary",
+            params={"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"},
+        )
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        body = response.text
+        self.assertIn('sky_requests_total{method="GET",route="/sky-summary",status="200"}', body)
+        self.assertIn('sky_request_duration_seconds_count{route="/sky-summary"}', body)
+        self.assertIn('sky_stage_duration_seconds_count{stage="build_moon_payload"}', body)
+        self.assertIn('sky_stage_duration_seconds_count{stage="build_planets_payload"}', body)
+        self.assertIn("# TYPE sky_translator_ready gauge", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
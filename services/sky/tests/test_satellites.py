@@ -0,0 +1,130 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from skyfield.api import EarthSatellite, wgs84
+
+from app import main
+from app.satellites import Observer, PassGrid, SatelliteCatalog, find_passes, parse_tle_catalog
+
+CATALOG_TLE = """ISS (ZARYA)
+1 25544U 98067A   26290.50000000  .00016717  00000-0  10270-3 0  9999
+2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50103472123452
+HST
+1 20580U 90037B   26290.50000000  .00001264  00000-0  63590-4 0  9998
+2 20580  28.4700 112.3251 0002453  64.1021 296.1947 15.09299865123458
+CSS (TIANHE)
+1 48274U 21035A   26290.50000000  .00020105  00000-0  23108-3 0  9995
+2 48274  41.4680  30.1152 0006612  35.7423 324.4175 15.60731210123458
+"""
+
+START = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+LOCATION = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava"}
+
+
+class SatelliteCatalogTest(unittest.TestCase):
+    def test_parse_skips_noise_and_deduplicates_norad_ids(self) -> None:
+        duplicated = CATALOG_TLE + "\nnot a tle line\n" + CATALOG_TLE.replace("ISS (ZARYA)", "ISS")
+
+        entries = parse_tle_catalog(duplicated)
+
+        self.assertEqual(3, len(entries))
+        self.assertEqual("ISS", entries[0]["name"])
+        self.assertEqual([25544, 20580, 48274], SatelliteCatalog(entries).norad_ids)
+
+    def test_matching_filters_by_name(self) -> None:
+        catalog = SatelliteCatalog(parse_tle_catalog(CATALOG_TLE))
+
+        self.assertEqual(["CSS (TIANHE)"], [entry["name"] for entry in catalog.matching("tianhe").entries])
+
+
+class FindPassesTest(unittest.TestCase):
+    def test_passes_match_skyfield_events_within_one_step(self) -> None:
+        catalog = SatelliteCatalog(parse_tle_catalog(CATALOG_TLE))
+        location = wgs84.latlon(LOCATION["lat"], LOCATION["lon"])
+        grid = PassGrid(main.ts, main.EARTH, main.SUN, START, 24, fine_step_s=30, coarse_step_s=300)
+
+        passes = find_passes(catalog, grid, Observer(location), min_altitude_deg=10.0)
+
+        expected = []
+        t0 = main.ts.from_datetime(START)
+        t1 = main.ts.from_datetime(START + timedelta(hours=24))
+        for index, entry in enumerate(catalog.entries):
+            satellite = EarthSatellite(entry["line1"], entry["line2"], entry["name"], main.ts)
+            times, events = satellite.find_events(location, t0, t1, altitude_degrees=10.0)
+            rise = None
+            for event_time, event in zip(times, events):
+                if event == 0:
+                    rise = event_time
+                elif event == 2 and rise is not None:
+                    sunlit = bool(satellite.at(culmination).is_sunlit(main.eph))
+                    expected.append((index, rise.utc_datetime(), culmination.utc_datetime(), event_time.utc_datetime(), sunlit))
+                    rise = None
+                else:
+                    culmination = event_time
+
+        self.assertGreater(len(expected), 3)
+        self.assertEqual(len(expected), len(passes))
+        for index, rise, culmination, set_, sunlit in expected:
+            found = next(item for item in passes if item["satellite"] == index and abs((item["culmination_at"] - culmination).total_seconds()) <= 31)
+            self.assertLessEqual(abs((found["rise_at"] - rise).total_seconds()), 31)
+            self.assertLessEqual(abs((found["set_at"] - set_).total_seconds()), 31)
+            self.assertEqual(sunlit, found["sunlit"])
+
+    def test_no_passes_below_threshold(self) -> None:
+        catalog = SatelliteCatalog(parse_tle_catalog(CATALOG_TLE))
+        # HST's 28.5 deg orbit never rises above 10 deg as seen from the Arctic.
+        location = wgs84.latlon(78.22, 15.65)
+        grid = PassGrid(main.ts, main.EARTH, main.SUN, START, 12, fine_step_s=30, coarse_step_s=300)
+
+        passes = find_passes(catalog.matching("HST"), grid, Observer(location), min_altitude_deg=10.0)
+
+        self.assertEqual([], passes)
+
+
+class SatellitePassesEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_state = dict(main.satellite_state)
+        main.satellite_state.update({
+            "catalog": SatelliteCatalog(parse_tle_catalog(CATALOG_TLE)),
+            "source": "test",
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "error": None,
+        })
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.satellite_state.update(self.original_state)
+
+    def test_lists_passes_in_rise_order(self) -> None:
+        response = self.client.get("/satellite-passes", params={**LOCATION, "hours": 24, "visible_only": "false"})
+
+        self.assertEqual(200, response.status_code)
+        payload = response.json()
+        self.assertTrue(payload["available"])
+        self.assertEqual(3, payload["satellites"])
+        rises = [item["rise_at"] for item in payload["passes"]]
+        self.assertEqual(sorted(rises), rises)
+        for item in payload["passes"]:
+            self.assertGreaterEqual(item["max_altitude_deg"], 10.0)
+            self.assertIn(item["direction_start"], main.DIRECTIONS)
+
+    def test_name_filter_and_limit(self) -> None:
+        response = self.client.get(
+            "/satellite-passes",
+            params={**LOCATION, "hours": 24, "visible_only": "false", "name": "ISS", "limit": 1},
+        )
+
+        payload = response.json()
+        self.assertEqual(1, payload["satellites"])
+        self.assertLessEqual(len(payload["passes"]), 1)
+        self.assertTrue(all(item["norad_id"] == 25544 for item in payload["passes"]))
+
+    def test_window_is_bounded(self) -> None:
+        response = self.client.get("/satellite-passes", params={**LOCATION, "hours": main.SATELLITE_PASSES_MAX_HOURS + 1})
+
+        self.assertEqual(422, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.sky_cache import TTLCache, distance_km, snap_location
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = _Clock()
+        cache = TTLCache("test", max_entries=4, ttl_seconds=10, clock=clock)
+        cache.set("key", "value")
+
+        clock.now = 5
+        self.assertEqual("value", cache.get("key"))
+        clock.now = 11
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(1, cache.stats()["expired"])
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = TTLCache("test", max_entries=2, ttl_seconds=0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(1, cache.stats()["evictions"])
+
+    def test_snapping_stays_within_half_a_cell(self) -> None:
+        lat, lon = snap_location(48.1486, 17.1077, 0.05)
+
+        self.assertEqual((48.15, 17.1), (lat, lon))
+        self.assertLess(distance_km(48.1486, 17.1077, lat, lon), 3.9)
+        self.assertEqual((48.1486, 17.1077), snap_location(48.1486, 17.1077, 0.0))
+        self.assertEqual(90.0, snap_location(89.99, 0.0, 0.05)[0])
+
+
+class SkySummaryCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_cache = main.sky_cache
+        main.sky_cache = TTLCache("sky_summary", max_entries=16, ttl_seconds=60)
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.sky_cache = self.original_cache
+
+    def test_nearby_locations_share_cached_payloads(self) -> None:
+        params = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"}
+        first = self.client.get("/sky-summary", params=params)
+        second = self.client.get("/sky-summary", params={**params, "lat": 48.1501, "lon": 17.1012})
+
+        self.assertEqual(200, first.status_code)
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(first.json()["moon"], second.json()["moon"])
+        self.assertEqual(first.json()["planets"], second.json()["planets"])
+        self.assertIn("sun_altitude_deg", second.json())
+
+        stats = main.sky_cache.stats()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+
+    def test_different_dates_are_cached_separately(self) -> None:
+        params = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava"}
+        self.client.get("/sky-summary", params={**params, "date": "2026-02-27"})
+        self.client.get("/sky-summary", params={**params, "date": "2026-02-28"})
+
+        self.assertEqual(0, main.sky_cache.stats()["hits"])
+        self.assertEqual(2, main.sky_cache.stats()["entries"])
+
+
+if __name__ == "__main__":
+    unittest.main()
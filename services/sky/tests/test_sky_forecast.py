@@ -0,0 +1,57 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.sky_cache import TTLCache
+
+LOCATION = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava"}
+
+
+class SkyForecastEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_cache = main.sky_cache
+        main.sky_cache = TTLCache("sky_summary", max_entries=256, ttl_seconds=600)
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.sky_cache = self.original_cache
+
+    def forecast(self, start: str, days: int) -> list[dict]:
+        response = self.client.get("/sky-forecast", params={**LOCATION, "start": start, "days": days})
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_forecast_days_match_sky_summary(self) -> None:
+        days = self.forecast("2026-03-27", 4)
+
+        self.assertEqual(["2026-03-27", "2026-03-28", "2026-03-29", "2026-03-30"], [day["date"] for day in days])
+        main.sky_cache.clear()
+        for day in days:
+            single = self.client.get("/sky-summary", params={**LOCATION, "date": day["date"]}).json()
+            self.assertEqual(single["moon"], day["moon"])
+            self.assertEqual(single["planets"], day["planets"])
+
+    def test_sliding_window_reuses_computed_days(self) -> None:
+        self.forecast("2026-02-01", 7)
+        misses = main.sky_cache.stats()["misses"]
+
+        days = self.forecast("2026-02-02", 7)
+
+        self.assertEqual("2026-02-08", days[-1]["date"])
+        self.assertEqual(misses + 1, main.sky_cache.stats()["misses"])
+        self.assertEqual(6, main.sky_cache.stats()["hits"])
+
+    def test_forecast_length_is_bounded(self) -> None:
+        response = self.client.get(
+            "/sky-forecast",
+            params={**LOCATION, "start": "2026-02-01", "days": main.SKY_FORECAST_MAX_DAYS + 1},
+        )
+
+        self.assertEqual(422, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import main
+from app.batch_ephemeris import share_nutation
+from app.sky_cache import TTLCache
+
+HEADERS = {"X-Internal-Token": "test-token"}
+
+
+class SkySummaryBatchEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        main.INTERNAL_TOKEN = "test-token"
+        self.original_cache = main.sky_cache
+        main.sky_cache = TTLCache("sky_summary", max_entries=0, ttl_seconds=0)
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.sky_cache = self.original_cache
+
+    def test_batch_payloads_match_single_requests(self) -> None:
+        locations = [
+            {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"},
+            {"lat": 40.7128, "lon": -74.006, "tz": "America/New_York", "date": "2026-03-08"},
+            {"lat": -33.8688, "lon": 151.2093, "tz": "Australia/Sydney", "date": "2026-04-05"},
+            {"lat": 64.1466, "lon": -21.9426, "tz": "Atlantic/Reykjavik", "date": "2026-06-21"},
+        ]
+
+        response = self.client.post("/sky-summary/batch", json={"locations": locations}, headers=HEADERS)
+
+        self.assertEqual(200, response.status_code)
+        results = response.json()["results"]
+        self.assertEqual(len(locations), len(results))
+
+        for location, result in zip(locations, results):
+            single = self.client.get("/sky-summary", params=location).json()
+            self.assertEqual(single["moon"], result["moon"])
+            self.assertEqual(single["planets"], result["planets"])
+            self.assertIsInstance(result["sun_altitude_deg"], (int, float))
+            self.assertRegex(result["sample_at"], r"(Z|[+-]\d{2}:\d{2})$")
+
+    def test_invalid_timezone_only_fails_its_own_entry(self) -> None:
+        response = self.client.post(
+            "/sky-summary/batch",
+            json={
+                "locations": [
+                    {"lat": 48.1486, "lon": 17.1077, "tz": "Mars/Olympus_Mons", "date": "2026-02-27"},
+                    {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"},
+                ]
+            },
+            headers=HEADERS,
+        )
+
+        self.assertEqual(200, response.status_code)
+        results = response.json()["results"]
+        self.assertIn("error", results[0])
+        self.assertIn("moon", results[1])
+
+    def test_batch_size_is_bounded(self) -> None:
+        location = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"}
+        response = self.client.post(
+            "/sky-summary/batch",
+            json={"locations": [location] * (main.SKY_BATCH_MAX_LOCATIONS + 1)},
+            headers=HEADERS,
+        )
+
+        self.assertEqual(422, response.status_code)
+
+    def test_batch_requires_internal_token(self) -> None:
+        location = {"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"}
+
+        response = self.client.post("/sky-summary/batch", json={"locations": [location]})
+
+        self.assertEqual(401, response.status_code)
+
+
+class ShareNutationTest(unittest.TestCase):
+    # share_nutation() writes skyfield's private, lazily computed nutation angles. These
+    # tests fail if a skyfield upgrade renames the attribute or stops reading it.
+
+    def test_time_reads_assigned_nutation_angles(self) -> None:
+        tt = np.array([2461100.5, 2461100.75])
+        reference = main.ts.tt_jd(tt)
+        overridden = main.ts.tt_jd(tt)
+        overridden._nutation_angles_radians = (np.zeros(2), np.zeros(2))
+
+        self.assertFalse(np.allclose(reference.M, overridden.M))
+
+    def test_shared_angles_match_per_instant_evaluation(self) -> None:
+        tt = np.array([2461100.5, 2461100.75, 2461100.5, 2461100.75, 2461101.5])
+        shared = main.ts.tt_jd(tt)
+        share_nutation(shared)
+
+        self.assertIn("_nutation_angles_radians", vars(shared))
+        expected = main.ts.tt_jd(tt)._nutation_angles_radians
+        np.testing.assert_allclose(expected, shared._nutation_angles_radians)
+
+
+if __name__ == "__main__":
+    unittest.main()
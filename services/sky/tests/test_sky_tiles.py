@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from datetime import date as date_cls
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.sky_cache import TTLCache
+from app.sky_tiles import TileLocation, TileStore, TileWarmer
+
+BRATISLAVA = TileLocation(name="Bratislava", lat=48.1486, lon=17.1077, tz="Europe/Bratislava", radius_cells=0)
+
+
+class TileWarmerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TileStore(Path(self.directory.name) / "tiles.sqlite3")
+        self.computed: list[tuple] = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def compute(self, cells: list[tuple]) -> list[tuple[dict, list[dict]]]:
+        self.computed.extend(cells)
+        return [({"cell": [cell[0], cell[1]], "date": cell[2].isoformat()}, []) for cell in cells]
+
+    def test_warm_up_covers_today_and_tomorrow_and_reuses_stored_tiles(self) -> None:
+        warmer = TileWarmer(self.store, [BRATISLAVA], self.compute, grid_deg=0.05, workers=2, chunk_size=1)
+
+        first = warmer.warm_once()
+        second = warmer.warm_once()
+
+        self.assertEqual(2, first["tiles_expected"])
+        self.assertEqual(2, first["tiles_computed"])
+        self.assertEqual(1.0, first["coverage"])
+        self.assertEqual(0, second["tiles_computed"])
+        self.assertEqual(2, second["tiles_reused"])
+        self.assertEqual(2, len(self.computed))
+        self.assertGreaterEqual(first["duration_ms"], 0)
+
+    def test_stats_track_tiles_without_rescanning_the_store(self) -> None:
+        today = (48.15, 17.1, "Europe/Bratislava", "2026-10-18")
+        yesterday = (48.15, 17.1, "Europe/Bratislava", "2026-10-17")
+        self.store.put_many([(today, ({"a": 1}, [])), (yesterday, ({}, []))])
+        self.store.put_many([(today, ({"a": 1, "b": [1, 2, 3]}, []))])
+        self.store.prune(date_cls(2026, 10, 18))
+
+        stats = self.store.stats()
+        reopened = TileStore(self.store.path).stats()
+
+        self.assertEqual(1, stats["tiles"])
+        self.assertEqual((reopened["tiles"], reopened["bytes"]), (stats["tiles"], stats["bytes"]))
+
+    def test_radius_warms_neighbouring_cells(self) -> None:
+        location = BRATISLAVA._replace(radius_cells=1)
+        warmer = TileWarmer(self.store, [location], self.compute, grid_deg=0.05)
+
+        self.assertEqual(9, len(warmer.cells(location)))
+        self.assertEqual(18, warmer.warm_once()["tiles_expected"])
+
+    def test_next_run_is_after_local_midnight(self) -> None:
+        warmer = TileWarmer(self.store, [BRATISLAVA], self.compute, grid_deg=0.05, delay_seconds=300)
+
+        self.assertGreaterEqual(warmer.seconds_until_next_run(), 60)
+        self.assertLessEqual(warmer.seconds_until_next_run(), 25 * 3600 + 300)
+
+
+class TileServingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_cache = main.sky_cache
+        self.original_store = main.tile_store
+        main.sky_cache = TTLCache("sky_summary", max_entries=0, ttl_seconds=0)
+        main.tile_store = TileStore(Path(self.directory.name) / "tiles.sqlite3")
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.sky_cache = self.original_cache
+        main.tile_store = self.original_store
+        self.directory.cleanup()
+
+    def test_sky_summary_is_served_from_a_stored_tile(self) -> None:
+        key = (48.15, 17.1, "Europe/Bratislava", "2026-02-27")
+        moon = {"phase_deg": 1.0, "phase_name": "tile", "illumination": 0.0, "rise_local": None, "set_local": None, "altitude_hourly": []}
+        main.tile_store.put_many([(key, (moon, []))])
+
+        response = self.client.get(
+            "/sky-summary",
+            params={"lat": 48.1486, "lon": 17.1077, "tz": "Europe/Bratislava", "date": "2026-02-27"},
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("tile", response.json()["moon"]["phase_name"])
+        self.assertEqual(1, main.tile_store.stats()["hits"])
+
+    def test_store_is_opened_at_startup(self) -> None:
+        path = Path(self.directory.name) / "startup.sqlite3"
+        original = (main.SKY_TILES_PATH, main.SKY_TILE_LOCATIONS_PATH, main.tile_warmer)
+        main.tile_store = None
+        main.SKY_TILES_PATH = path
+        main.SKY_TILE_LOCATIONS_PATH = Path(self.directory.name) / "missing.json"
+        try:
+            main.start_tile_warmer()
+        finally:
+            if main.tile_warmer is not None:
+                main.tile_warmer.stop()
+            main.SKY_TILES_PATH, main.SKY_TILE_LOCATIONS_PATH, main.tile_warmer = original
+
+        self.assertIsNotNone(main.tile_store)
+        self.assertTrue(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
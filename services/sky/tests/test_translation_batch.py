@@ -0,0 +1,113 @@
+import unittest
+from types import SimpleNamespace
+
+from app import main
+from app.batch_translation import translate_sentences
+from translation_support import CountingTranslator, TranslationTestCase
+
+
+class _WordTokenizer:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+    def decode(self, tokens: list[str]) -> str:
+        return " " + " ".join(tokens)
+
+
+class _RecordingModel:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def translate_batch(self, tokenized, **options):
+        self.calls.append({"tokenized": tokenized, **options})
+        return [SimpleNamespace(hypotheses=[[token.upper() for token in tokens]]) for tokens in tokenized]
+
+
+def _package_translation(model: _RecordingModel, target_prefix: str = "") -> SimpleNamespace:
+    package = SimpleNamespace(tokenizer=_WordTokenizer(), target_prefix=target_prefix, from_code="en", to_code="sk")
+    packaged = SimpleNamespace(pkg=package, translator=model, translate=lambda text: "not batched")
+    return SimpleNamespace(underlying=packaged, translate=lambda text: "not batched")
+
+
+class TranslateBatchEndpointTest(TranslationTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.swap("TRANSLATION_UNIT", "sentence")
+
+    def post(self, payload: dict):
+        return self.client.post("/translate/batch", json=payload, headers={"X-Internal-Token": "test-token"})
+
+    def test_sentences_are_deduplicated_across_texts(self) -> None:
+        texts = [
+            "Clear skies tonight.\n\nJoin us!",
+            "  Join us!   Bring a telescope.\n",
+            "",
+            "Clear skies tonight.",
+        ]
+
+        response = self.post({"texts": texts, "from": "en", "to": "sk", "domain": "general"})
+
+        self.assertEqual(200, response.status_code)
+        payload = response.json()
+        self.assertEqual(
+            ["CLEAR SKIES TONIGHT.\n\nJOIN US!", "  JOIN US!   BRING A TELESCOPE.\n", "", "CLEAR SKIES TONIGHT."],
+            payload["translations"],
+        )
+        self.assertEqual(["Clear skies tonight.", "Join us!", "Bring a telescope."], self.translator.calls)
+        self.assertEqual(4, payload["meta"]["texts"])
+        self.assertEqual(3, payload["meta"]["unique_segments"])
+        self.assertEqual(5, payload["meta"]["memory"]["segments"])
+
+    def test_batch_reuses_translation_memory(self) -> None:
+        self.post({"texts": ["Look up."], "domain": "general"})
+
+        payload = self.post({"texts": ["Look up.", "Look down."], "domain": "general"}).json()
+
+        self.assertEqual(["LOOK UP.", "LOOK DOWN."], payload["translations"])
+        self.assertEqual(["Look up.", "Look down."], self.translator.calls)
+        self.assertEqual(1, payload["meta"]["memory"]["hits"])
+        self.assertEqual(1, payload["meta"]["translated_segments"])
+
+    def test_astronomy_terminology_is_applied_per_text(self) -> None:
+        main.translation_state["translator"] = SimpleNamespace(translate=lambda text: text)
+
+        payload = self.post({"texts": ["The Milky Way.", "A supernova."], "domain": "astronomy"}).json()
+
+        self.assertIn("Mliečna cesta", payload["translations"][0])
+
+    def test_argos_package_sentences_go_through_one_batch(self) -> None:
+        model = _RecordingModel()
+        main.translation_state["translator"] = _package_translation(model)
+
+        payload = self.post({"texts": ["Look up. Look up.", "Look   up. Go home."], "domain": "general"}).json()
+
+        self.assertEqual(["LOOK UP. LOOK UP.", "LOOK UP. GO HOME."], payload["translations"])
+        self.assertEqual(1, len(model.calls))
+        self.assertEqual([["Look", "up."], ["Go", "home."]], model.calls[0]["tokenized"])
+        self.assertEqual(main.TRANSLATION_BATCH_SIZE, model.calls[0]["max_batch_size"])
+        self.assertEqual(main.TRANSLATION_BEAM_SIZE, model.calls[0]["beam_size"])
+
+    def test_rejects_unsupported_pair_and_empty_batch(self) -> None:
+        self.assertEqual(422, self.post({"texts": ["Hello."], "from": "de", "to": "sk"}).status_code)
+        self.assertEqual(422, self.post({"texts": []}).status_code)
+
+
+class TranslateSentencesTest(unittest.TestCase):
+    def test_target_prefix_is_sent_and_stripped(self) -> None:
+        model = _RecordingModel()
+        translator = _package_translation(model, target_prefix="__sk__")
+        model.translate_batch = lambda tokenized, **options: [
+            SimpleNamespace(hypotheses=[["__sk__", *tokens]]) for tokens in tokenized
+        ]
+
+        self.assertEqual(["Hello there."], translate_sentences(translator, ["Hello there."], batch_size=8, beam_size=2))
+
+    def test_plain_translator_is_called_per_sentence(self) -> None:
+        translator = CountingTranslator()
+
+        self.assertEqual(["A.", "B."], translate_sentences(translator, ["a.", "b."], batch_size=8, beam_size=2))
+        self.assertEqual(["a.", "b."], translator.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app import main
+from app.translation_executor import TranslationExecutor, TranslationQueueFull, TranslationQueueTimeout
+from translation_support import TranslationTestCase
+
+
+class _EchoTranslator:
+    def translate(self, text: str) -> str:
+        return text
+
+
+def _block(executor: TranslationExecutor) -> threading.Event:
+    # Occupies the single worker until the returned event is set.
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold() -> None:
+        started.set()
+        release.wait(5)
+
+    executor.submit(hold)
+    started.wait(5)
+    return release
+
+
+class TranslationExecutorTest(unittest.TestCase):
+    def test_interactive_jobs_overtake_background_jobs(self) -> None:
+        executor = TranslationExecutor(workers=1, max_queue=8, queue_timeout_seconds=5)
+        release = _block(executor)
+        order: list[str] = []
+
+        jobs = [
+            executor.submit(lambda: order.append("background-1"), "background"),
+            executor.submit(lambda: order.append("background-2"), "background"),
+            executor.submit(lambda: order.append("interactive"), "interactive"),
+        ]
+        self.assertEqual({"interactive": 1, "background": 2}, executor.stats()["depth"])
+        release.set()
+        for job in jobs:
+            job.future.result(5)
+
+        self.assertEqual(["interactive", "background-1", "background-2"], order)
+        self.assertGreater(executor.stats()["wait_seconds_total"]["background"], 0.0)
+
+    def test_full_queue_rejects(self) -> None:
+        executor = TranslationExecutor(workers=1, max_queue=1, queue_timeout_seconds=5)
+        release = _block(executor)
+        executor.submit(lambda: None)
+
+        with self.assertRaises(TranslationQueueFull):
+            executor.submit(lambda: None, "background")
+        release.set()
+
+        self.assertEqual(1, executor.stats()["rejected"]["background"])
+
+    def test_job_not_started_in_time_is_withdrawn(self) -> None:
+        executor = TranslationExecutor(workers=1, max_queue=4, queue_timeout_seconds=0.1)
+        release = _block(executor)
+        ran: list[bool] = []
+
+        with self.assertRaises(TranslationQueueTimeout):
+            asyncio.run(executor.run(lambda: ran.append(True)))
+        release.set()
+        time.sleep(0.05)
+
+        self.assertEqual([], ran)
+        self.assertEqual(1, executor.stats()["timed_out"]["interactive"])
+        self.assertEqual(0, executor.stats()["depth"]["interactive"])
+
+    def test_cancelled_caller_withdraws_its_queued_job(self) -> None:
+        executor = TranslationExecutor(workers=1, max_queue=4, queue_timeout_seconds=5)
+        release = _block(executor)
+        ran: list[bool] = []
+
+        async def cancel_while_queued() -> None:
+            task = asyncio.ensure_future(executor.run(lambda: ran.append(True)))
+            await asyncio.sleep(0.05)
+            self.assertEqual(1, executor.stats()["depth"]["interactive"])
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_while_queued())
+        release.set()
+        time.sleep(0.05)
+
+        self.assertEqual([], ran)
+        self.assertEqual(1, executor.stats()["cancelled"]["interactive"])
+        self.assertEqual(0, executor.stats()["depth"]["interactive"])
+
+    def test_started_job_outlives_queue_timeout(self) -> None:
+        executor = TranslationExecutor(workers=1, max_queue=4, queue_timeout_seconds=0.05)
+
+        def slow() -> str:
+            time.sleep(0.2)
+            return "done"
+
+        self.assertEqual("done", asyncio.run(executor.run(slow)))
+
+    def test_job_errors_reach_the_caller(self) -> None:
+        executor = TranslationExecutor(workers=2, max_queue=4, queue_timeout_seconds=1)
+
+        def fail() -> None:
+            raise RuntimeError("model crashed")
+
+        with self.assertRaisesRegex(RuntimeError, "model crashed"):
+            asyncio.run(executor.run(fail))
+        self.assertEqual(1, executor.stats()["completed"]["interactive"])
+
+
+class TranslateQueueEndpointTest(TranslationTestCase):
+    memory_entries = 0
+
+    def make_translator(self) -> _EchoTranslator:
+        return _EchoTranslator()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.swap("translation_executor", TranslationExecutor(workers=1, max_queue=1, queue_timeout_seconds=5))
+
+    def post(self, text: str, priority: str = "interactive"):
+        return self.client.post(
+            "/translate",
+            json={"text": text, "domain": "general", "priority": priority},
+            headers={"X-Internal-Token": "test-token"},
+        )
+
+    def test_translation_runs_on_the_executor(self) -> None:
+        response = self.post("Clear skies.")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("Clear skies.", response.json()["translated"])
+        self.assertEqual(1, main.translation_executor.stats()["completed"]["interactive"])
+        self.assertIn('sky_translation_queue_depth{priority="background"} 0', self.client.get("/metrics").text)
+
+    def test_saturated_queue_answers_503(self) -> None:
+        release = _block(main.translation_executor)
+        main.translation_executor.submit(lambda: None, "background")
+        try:
+            response = self.post("Clear skies.")
+        finally:
+            release.set()
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual("5", response.headers["Retry-After"])
+
+    def test_unknown_priority_is_rejected(self) -> None:
+        self.assertEqual(422, self.post("Clear skies.", priority="urgent").status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
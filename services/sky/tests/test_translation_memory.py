@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import main
+from app.translation_memory import TranslationMemory
+from translation_support import CountingTranslator, TranslationTestCase
+
+
+class TranslationMemoryEndpointTest(TranslationTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.swap("TRANSLATION_UNIT", "sentence")
+
+    def translate(self, text: str, domain: str = "general") -> dict:
+        response = self.client.post(
+            "/translate",
+            json={"text": text, "from": "en", "to": "sk", "domain": domain},
+            headers={"X-Internal-Token": "test-token"},
+        )
+        self.assertEqual(200, response.status_code)
+        return response.json()
+
+    def test_only_unseen_sentences_reach_the_translator(self) -> None:
+        first = self.translate("Clear skies tonight. Join us at the observatory!")
+        second = self.translate("Clouds expected.  Join us at the observatory!\n\nClear skies tonight.")
+
+        self.assertEqual("CLEAR SKIES TONIGHT. JOIN US AT THE OBSERVATORY!", first["translated"])
+        self.assertEqual("CLOUDS EXPECTED.  JOIN US AT THE OBSERVATORY!\n\nCLEAR SKIES TONIGHT.", second["translated"])
+        self.assertEqual(
+            ["Clear skies tonight.", "Join us at the observatory!", "Clouds expected."],
+            self.translator.calls,
+        )
+        self.assertEqual({"segments": 3, "hits": 2, "hit_rate": 0.6667}, {key: second["meta"]["memory"][key] for key in ("segments", "hits", "hit_rate")})
+        self.assertGreaterEqual(second["meta"]["memory"]["saved_ms"], 0.0)
+        self.assertEqual(0, first["meta"]["memory"]["hits"])
+
+    def test_sentences_repeated_in_one_request_are_translated_once(self) -> None:
+        result = self.translate("Look up. Look up. Look   up.")
+
+        self.assertEqual("LOOK UP. LOOK UP. LOOK UP.", result["translated"])
+        self.assertEqual(["Look up."], self.translator.calls)
+        self.assertEqual(3, result["meta"]["memory"]["segments"])
+
+    def test_model_and_domain_are_part_of_the_key(self) -> None:
+        self.translate("A meteor shower peaks tonight.", domain="general")
+        self.translate("A meteor shower peaks tonight.", domain="astronomy")
+        main.translation_state["model_id"] = "argos:en->sk:1.1"
+        self.translate("A meteor shower peaks tonight.", domain="general")
+
+        self.assertEqual(3, len(self.translator.calls))
+
+
+class ChunkTranslationTest(TranslationTestCase):
+    # The default unit: each chunk reaches the translator whole, exactly as before the
+    # translation memory existed, and is memoized as a whole.
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.swap("MAX_TRANSLATE_CHARS", 60)
+
+    def test_multi_sentence_chunks_are_translated_unchanged(self) -> None:
+        text = "Clear skies tonight. Join us at the observatory!\n\nBring a blanket. The dome opens at nine.\n"
+        chunks = main.split_text_preserving_format(text, main.MAX_TRANSLATE_CHARS)
+        expected = "".join(chunk if chunk.isspace() else CountingTranslator().translate(chunk) for chunk in chunks)
+
+        response = self.client.post("/translate", json={"text": text}, headers={"X-Internal-Token": "test-token"})
+        again = self.client.post("/translate", json={"text": text}, headers={"X-Internal-Token": "test-token"})
+
+        self.assertEqual("chunk", main.TRANSLATION_UNIT)
+        self.assertEqual(expected, response.json()["translated"])
+        self.assertEqual([chunk for chunk in chunks if not chunk.isspace()], self.translator.calls)
+        self.assertEqual(expected, again.json()["translated"])
+        self.assertEqual(1.0, again.json()["meta"]["memory"]["hit_rate"])
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self) -> None:
+        memory = TranslationMemory(max_entries=2)
+        memory.set_many([(("m", "d", "a"), "A", 1.0), (("m", "d", "b"), "B", 1.0)])
+        memory.get(("m", "d", "a"))
+        memory.set_many([(("m", "d", "c"), "C", 1.0)])
+
+        self.assertIsNone(memory.get(("m", "d", "b")))
+        self.assertEqual(("A", 1.0), memory.get(("m", "d", "a")))
+        self.assertEqual(1, memory.stats()["evictions"])
+
+    def test_disk_store_survives_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "memory.sqlite3"
+            TranslationMemory(max_entries=8, path=path).set_many([(("m", "d", "Hello."), "Ahoj.", 42.0)])
+
+            reopened = TranslationMemory(max_entries=8, path=path)
+
+            self.assertEqual(("Ahoj.", 42.0), reopened.get(("m", "d", "Hello.")))
+            self.assertEqual(42.0, reopened.stats()["saved_ms"])
+            self.assertEqual(1, reopened.stats()["stored"])
+
+    def test_disk_store_is_trimmed_oldest_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "memory.sqlite3"
+            memory = TranslationMemory(max_entries=0, path=path, max_disk_entries=2)
+            for source in ("a", "b", "b", "c"):
+                memory.set_many([(("m", "d", source), source.upper(), 1.0)])
+
+            self.assertEqual(2, memory.stats()["stored"])
+            self.assertEqual(1, memory.stats()["trimmed"])
+            self.assertEqual(2, TranslationMemory(max_entries=0, path=path).stats()["stored"])
+            self.assertIsNone(memory.get(("m", "d", "a")))
+            self.assertEqual(("B", 1.0), memory.get(("m", "d", "b")))
+            self.assertEqual(("C", 1.0), memory.get(("m", "d", "c")))
+
+    def test_clear_empties_the_disk_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "memory.sqlite3"
+            memory = TranslationMemory(max_entries=8, path=path)
+            memory.set_many([(("m", "d", "Hello."), "Ahoj.", 42.0)])
+
+            memory.clear()
+
+            self.assertIsNone(memory.get(("m", "d", "Hello.")))
+            self.assertEqual(0, memory.stats()["stored"])
+            self.assertEqual(0, TranslationMemory(max_entries=8, path=path).stats()["stored"])
+
+    def test_disabled_memory_never_hits(self) -> None:
+        memory = TranslationMemory(max_entries=0)
+        memory.set_many([(("m", "d", "a"), "A", 1.0)])
+
+        self.assertIsNone(memory.get(("m", "d", "a")))
+
+
+if __name__ == "__main__":
+    unittest.main()
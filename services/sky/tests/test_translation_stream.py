@@ -0,0 +1,111 @@
+import json
+import unittest
+
+from app import main
+from translation_support import TranslationTestCase
+
+ARTICLE = (
+    "The Milky Way rises after dusk. A meteor shower peaks tonight.\n\n"
+    "Look east after midnight. Bring a blanket and patience.\n"
+    "The International Space Station passes at 21:04."
+)
+
+
+class _UpperTranslator:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.fail_on = fail_on
+
+    def translate(self, text: str) -> str:
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("model crashed")
+        return text.upper().replace("MILKY WAY", "Milky Way").replace("METEOR SHOWER", "meteor shower")
+
+
+class TranslateStreamTest(TranslationTestCase):
+    def make_translator(self) -> _UpperTranslator:
+        return _UpperTranslator()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.swap("MAX_TRANSLATE_CHARS", 40)
+
+    def stream(self, text: str, stream_format: str = "ndjson") -> tuple[str, str]:
+        with self.client.stream(
+            "POST",
+            "/translate/stream",
+            params={"format": stream_format},
+            json={"text": text, "from": "en", "to": "sk", "domain": "astronomy"},
+            headers={"X-Internal-Token": "test-token"},
+        ) as response:
+            self.assertEqual(200, response.status_code)
+            return response.headers["content-type"], "".join(response.iter_text())
+
+    def test_ndjson_chunks_arrive_in_order_and_match_translate(self) -> None:
+        content_type, body = self.stream(ARTICLE)
+        events = [json.loads(line) for line in body.splitlines()]
+
+        self.assertTrue(content_type.startswith("application/x-ndjson"))
+        chunks = [event for event in events if event["type"] == "chunk"]
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(list(range(len(chunks))), [event["index"] for event in chunks])
+        self.assertEqual("summary", events[-1]["type"])
+        self.assertEqual(len(chunks), events[-1]["chunks"])
+
+        expected = self.client.post(
+            "/translate",
+            json={"text": ARTICLE, "from": "en", "to": "sk", "domain": "astronomy"},
+            headers={"X-Internal-Token": "test-token"},
+        ).json()["translated"]
+        self.assertEqual(expected, "".join(event["translated"] for event in chunks))
+        self.assertIn("Mliečna cesta", chunks[0]["translated"])
+
+    def test_only_chunks_take_executor_jobs(self) -> None:
+        before = main.translation_executor.stats()["submitted"]["interactive"]
+
+        _, body = self.stream(ARTICLE)
+
+        chunks = [json.loads(line) for line in body.splitlines() if json.loads(line)["type"] == "chunk"]
+        translated = [chunk for chunk in main.split_text_preserving_format(ARTICLE, main.MAX_TRANSLATE_CHARS) if chunk.strip()]
+        self.assertEqual(len(translated), main.translation_executor.stats()["submitted"]["interactive"] - before)
+        self.assertGreaterEqual(len(chunks), len(translated))
+
+    def test_sse_format(self) -> None:
+        content_type, body = self.stream(ARTICLE, "sse")
+        blocks = [block.splitlines() for block in body.split("\n\n") if block.strip()]
+
+        self.assertTrue(content_type.startswith("text/event-stream"))
+        self.assertEqual("event: summary", blocks[-1][0])
+        self.assertTrue(all(block[0] == "event: chunk" for block in blocks[:-1]))
+        translated = "".join(json.loads(block[1].removeprefix("data: ")).get("translated", "") for block in blocks)
+        self.assertIn("meteorický roj", translated)
+
+    def test_failed_chunk_ends_the_stream_with_an_error_event(self) -> None:
+        main.translation_state["translator"] = _UpperTranslator(fail_on="blanket")
+
+        _, body = self.stream(ARTICLE)
+        events = [json.loads(line) for line in body.splitlines()]
+
+        self.assertEqual("error", events[-1]["type"])
+        self.assertEqual(500, events[-1]["status"])
+        self.assertTrue(all(event["type"] == "chunk" for event in events[:-1]))
+        self.assertEqual(events[-1]["index"], len(events) - 1)
+
+    def test_unavailable_model_is_an_http_error(self) -> None:
+        main.translation_state.update({"translator": None, "has_en_sk_pair": False, "error": "model missing"})
+        original_loader = main.translator_loader
+        main.translator_loader = main.BackgroundRefresher("translator", lambda: None)
+        try:
+            response = self.client.post(
+                "/translate/stream",
+                json={"text": ARTICLE},
+                headers={"X-Internal-Token": "test-token"},
+            )
+        finally:
+            main.translator_loader.wait(5)
+            main.translator_loader = original_loader
+
+        self.assertEqual(503, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
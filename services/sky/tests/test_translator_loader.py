@@ -0,0 +1,155 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.feed_refresh import BackgroundRefresher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Translation:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def translate(self, text: str) -> str:
+        self.calls.append(text)
+        return text
+
+
+class _Language:
+    def __init__(self, code: str, translation: _Translation) -> None:
+        self.code = code
+        self.translation = translation
+
+    def get_translation(self, to_lang: "_Language") -> _Translation:
+        return self.translation
+
+
+class _FakeArgos:
+    # Stands in for argostranslate.translate and counts the package scans.
+    def __init__(self, codes: list[str]) -> None:
+        self.codes = codes
+        self.translation = _Translation()
+        self.scans = 0
+
+    def get_installed_languages(self) -> list[_Language]:
+        self.scans += 1
+        return [_Language(code, self.translation) for code in self.codes]
+
+
+class TranslatorLoaderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        main.INTERNAL_TOKEN = "test-token"
+        self.clock = FakeClock()
+        self.original = {
+            "argos_translate": main.argos_translate,
+            "ARGOS_IMPORT_ERROR": main.ARGOS_IMPORT_ERROR,
+            "translator_loader": main.translator_loader,
+            "translation_state": dict(main.translation_state),
+        }
+        main.ARGOS_IMPORT_ERROR = None
+        main.translator_loader = BackgroundRefresher(
+            "translator",
+            main.load_translator,
+            min_backoff_seconds=30,
+            max_backoff_seconds=120,
+            clock=self.clock,
+        )
+        main.translation_state.update(
+            {
+                "error": None,
+                "installed_languages": [],
+                "has_en": False,
+                "has_sk": False,
+                "has_en_sk_pair": False,
+                "translator": None,
+                "model_id": None,
+                "loaded_at": None,
+                "load_ms": None,
+                "warmup_ms": None,
+                "cold_start_ms": None,
+            }
+        )
+        self.client = TestClient(main.app)
+
+    def tearDown(self) -> None:
+        main.translator_loader.wait(5)
+        main.argos_translate = self.original["argos_translate"]
+        main.ARGOS_IMPORT_ERROR = self.original["ARGOS_IMPORT_ERROR"]
+        main.translator_loader = self.original["translator_loader"]
+        main.translation_state.update(self.original["translation_state"])
+
+    def test_loader_warms_up_and_records_cold_start(self) -> None:
+        argos = _FakeArgos(["en", "sk"])
+        main.argos_translate = argos
+
+        self.assertTrue(main.translator_loader.trigger())
+        self.assertTrue(main.translator_loader.wait(5))
+
+        self.assertIs(argos.translation, main.translation_state["translator"])
+        self.assertEqual([main.TRANSLATOR_WARMUP_TEXT], argos.translation.calls)
+        self.assertGreater(main.translation_state["cold_start_ms"], 0.0)
+        self.assertIsNotNone(main.translation_state["loaded_at"])
+        self.assertIn("sky_translator_cold_start_seconds", self.client.get("/metrics").text)
+
+    def test_diagnostics_and_health_never_scan_packages(self) -> None:
+        argos = _FakeArgos(["en", "sk"])
+        main.argos_translate = argos
+        main.translator_loader.trigger()
+        main.translator_loader.wait(5)
+
+        for _ in range(5):
+            diagnostics = self.client.get("/diagnostics", headers={"X-Internal-Token": "test-token"}).json()
+            self.client.get("/health")
+
+        self.assertEqual(1, argos.scans)
+        self.assertTrue(diagnostics["has_en_sk_pair"])
+        self.assertEqual(main.translation_state["warmup_ms"], diagnostics["translator"]["warmup_ms"])
+
+    def test_missing_model_is_retried_in_the_background_with_backoff(self) -> None:
+        argos = _FakeArgos(["en"])
+        main.argos_translate = argos
+        main.translator_loader.trigger()
+        main.translator_loader.wait(5)
+
+        responses = [
+            self.client.post("/translate", json={"text": "Hello."}, headers={"X-Internal-Token": "test-token"})
+            for _ in range(3)
+        ]
+        main.translator_loader.wait(5)
+
+        self.assertEqual([503, 503, 503], [response.status_code for response in responses])
+        self.assertEqual("30", responses[0].headers["Retry-After"])
+        self.assertEqual(1, argos.scans)
+        self.assertEqual(1, main.translator_loader.failures)
+
+        argos.codes = ["en", "sk"]
+        self.clock.now += 31
+        self.client.post("/translate", json={"text": "Hello."}, headers={"X-Internal-Token": "test-token"})
+        main.translator_loader.wait(5)
+
+        self.assertEqual(2, argos.scans)
+        self.assertEqual(0, main.translator_loader.failures)
+        response = self.client.post("/translate", json={"text": "Hello."}, headers={"X-Internal-Token": "test-token"})
+        self.assertEqual(200, response.status_code)
+
+    def test_failed_scan_does_not_replace_a_working_translator(self) -> None:
+        working = _Translation()
+        main.translation_state.update({"translator": working, "has_en_sk_pair": True})
+        main.argos_translate = _FakeArgos(["en"])
+
+        with self.assertRaises(RuntimeError):
+            main.load_translator()
+
+        self.assertIs(working, main.translation_state["translator"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.translation_memory import TranslationMemory
+
+
+class CountingTranslator:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def translate(self, text: str) -> str:
+        self.calls.append(text)
+        return text.upper()
+
+
+class TranslationTestCase(unittest.TestCase):
+    # Installs a ready en->sk translator (make_translator()) and an empty translation
+    # memory for each test. Everything changed on app.main through swap() is put back
+    # when the test ends.
+    memory_entries = 128
+
+    def make_translator(self):
+        return CountingTranslator()
+
+    def setUp(self) -> None:
+        main.INTERNAL_TOKEN = "test-token"
+        self.translator = self.make_translator()
+        original_state = dict(main.translation_state)
+        self.addCleanup(main.translation_state.update, original_state)
+        main.translation_state.update(
+            {
+                "error": None,
+                "installed_languages": ["en", "sk"],
+                "has_en": True,
+                "has_sk": True,
+                "has_en_sk_pair": True,
+                "translator": self.translator,
+                "model_id": "argos:en->sk:1.0",
+            }
+        )
+        self.swap("translation_memory", TranslationMemory(max_entries=self.memory_entries))
+        self.client = TestClient(main.app)
+
+    def swap(self, name: str, value) -> None:
+        self.addCleanup(setattr, main, name, getattr(main, name))
+        setattr(main, name, value)